@@ -1,11 +1,18 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import List, Optional, Dict
-import json
+from typing import Callable, List, Optional, Dict
 from datetime import datetime
+import sys
 import os
-from glob import glob
+import time
+
+# Thêm thư mục gốc vào PYTHONPATH để import các module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.news_store import NewsSnapshot, NewsStore, collapse_clusters
+from api.pagination import paginate, parse_fields, project
+from api.response_cache import ResponseCache, choose_encoding, etag_matches, make_etag
+from pipeline.metrics import CONTENT_TYPE, counter, histogram, render_process
 
 app = FastAPI(
     title="News Summarizer API",
@@ -22,6 +29,44 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# endpoint là mẫu đường dẫn của route (không phải URL thật) để số chuỗi chỉ số không tăng theo truy vấn
+REQUEST_SECONDS = histogram("news_http_request_seconds", "Thời gian xử lý request theo endpoint", ("endpoint",))
+REQUESTS = counter("news_http_requests", "Số request theo endpoint và mã trạng thái", ("endpoint", "status"))
+
+class MetricsMiddleware:
+    """Middleware ASGI thuần ghi thời gian và mã trạng thái của mỗi request
+
+    Không dùng @app.middleware("http") (BaseHTTPMiddleware): lớp đó tạo thêm
+    task và bọc response cho mỗi request, đủ để giảm rõ rệt req/s của các
+    endpoint nhẹ như /categories.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Router ghi route khớp vào scope; không khớp route nào (404) thì là "other"
+            endpoint = getattr(scope.get("route"), "path", "other")
+            REQUEST_SECONDS.observe(time.perf_counter() - start, endpoint=endpoint)
+            REQUESTS.inc(endpoint=endpoint, status=status)
+
+app.add_middleware(MetricsMiddleware)
+
 class NewsItem(BaseModel):
     title: str
     link: str
@@ -30,6 +75,7 @@ class NewsItem(BaseModel):
     category: str
     source: str
     timestamp: str
+    cluster_id: Optional[str] = None
 
 class NewsResponse(BaseModel):
     status: str
@@ -38,88 +84,132 @@ class NewsResponse(BaseModel):
     categories: List[str]
     sources: List[str]
     news: List[NewsItem]
+    next_cursor: Optional[str] = None
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+
+# Dữ liệu được giữ trong bộ nhớ và chỉ nạp lại khi file thay đổi
+store = NewsStore()
+# Response đã mã hóa/nén sẵn theo phiên bản dữ liệu
+responses = ResponseCache()
 
 def get_available_categories() -> List[str]:
     """Lấy danh sách các category có sẵn"""
-    pattern = os.path.join("data", "raw_news_*.json")
-    files = glob(pattern)
-    categories = []
-    for file in files:
-        category = os.path.basename(file).replace("raw_news_", "").replace(".json", "").replace("_", " ")
-        categories.append(category)
-    return sorted(categories)
+    return store.snapshot().categories
 
 def get_available_sources() -> List[str]:
     """Lấy danh sách các nguồn tin có sẵn"""
+    return store.snapshot().sources
+
+def cached_response(request: Request, build: Callable[[NewsSnapshot], Dict]) -> Response:
+    """Trả response từ cache theo (đường dẫn, tham số) và phiên bản dữ liệu
+
+    304 nếu If-None-Match khớp ETag; ngược lại trả body đã mã hóa, nén bằng
+    brotli/gzip nếu client chấp nhận. ETag theo content-coding thực sự được
+    gửi: body nhỏ không được nén nên dùng ETag của bản không nén.
+    """
+    snapshot = store.snapshot()
+    key = (request.url.path, tuple(sorted(request.query_params.multi_items())))
+    entry = responses.get(snapshot.version, key, lambda: build(snapshot))
+    body, content_encoding = entry.encoded(choose_encoding(request.headers.get("accept-encoding")))
+    headers = {
+        "ETag": make_etag(snapshot.version, key, content_encoding),
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        responses.stats["not_modified"] += 1
+        return Response(status_code=304, headers=headers)
+
+    if content_encoding:
+        headers["Content-Encoding"] = content_encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def build_news(
+    snapshot: NewsSnapshot,
+    category: Optional[str],
+    source: Optional[str],
+    search: Optional[str],
+    limit: int,
+    cursor: Optional[str],
+    fields: Optional[str],
+    collapse: bool = False
+) -> Dict:
+    if category and not snapshot.has_category(category):
+        raise HTTPException(status_code=404, detail=f"Không tìm thấy category: {category}")
     try:
-        with open("data/raw_news.json", "r", encoding="utf-8") as f:
-            news_list = json.load(f)
-        return sorted(list(set(item["source"] for item in news_list)))
-    except:
-        return []
+        selected_fields = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if search:
+        # Tìm qua chỉ mục (không phân biệt dấu), xếp hạng theo BM25
+        news_list = snapshot.search(search, category, source)
+    else:
+        # Lọc theo category và nguồn từ các danh sách đã tính sẵn, mới nhất trước
+        news_list = snapshot.filter(category, source)
+    if collapse:
+        # Mỗi câu chuyện chỉ hiện một lần dù nhiều nguồn/category cùng đăng
+        news_list = collapse_clusters(news_list)
+
+    try:
+        page, next_cursor = paginate(news_list, limit, cursor, keyset=not search)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Dữ liệu đã đúng định dạng khi nạp, mã hóa thẳng thay vì kiểm tra lại
+    # từng tin qua NewsItem
+    return {
+        "status": "success",
+        "total": len(news_list),
+        "last_updated": snapshot.last_updated,
+        "categories": snapshot.categories,
+        "sources": snapshot.sources,
+        "news": project(page, selected_fields),
+        "next_cursor": next_cursor
+    }
 
 @app.get("/news", response_model=NewsResponse)
 def get_news(
+    request: Request,
     category: Optional[str] = Query(None, description="Lọc theo category"),
     source: Optional[str] = Query(None, description="Lọc theo nguồn tin"),
-    search: Optional[str] = Query(None, description="Tìm kiếm trong tiêu đề và mô tả")
+    search: Optional[str] = Query(None, description="Tìm kiếm trong tiêu đề và mô tả (có thể gõ không dấu)"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Số tin mỗi trang"),
+    cursor: Optional[str] = Query(None, description="next_cursor của trang trước"),
+    fields: Optional[str] = Query(None, description="Chỉ trả về các trường này, ví dụ: title,link,summary"),
+    collapse: bool = Query(False, description="Chỉ giữ tin mới nhất của mỗi cụm tin gần trùng (cluster_id)")
 ):
     try:
-        # Đọc tin tức từ file phù hợp
-        if category:
-            filename = f"data/raw_news_{category.replace(' ', '_')}.json"
-            if not os.path.exists(filename):
-                raise HTTPException(status_code=404, detail=f"Không tìm thấy category: {category}")
-            with open(filename, "r", encoding="utf-8") as f:
-                news_list = json.load(f)
-        else:
-            with open("data/processed_news.json", "r", encoding="utf-8") as f:
-                news_list = json.load(f)
-        
-        # Lọc theo nguồn nếu có
-        if source:
-            news_list = [news for news in news_list if news["source"].lower() == source.lower()]
-            
-        # Tìm kiếm nếu có
-        if search:
-            search = search.lower()
-            news_list = [
-                news for news in news_list 
-                if search in news["title"].lower() 
-                or (news.get("description", "") and search in news["description"].lower())
-            ]
-            
-        # Thêm timestamp nếu chưa có
-        for news in news_list:
-            if "timestamp" not in news:
-                news["timestamp"] = datetime.now().isoformat()
-            
-        return {
-            "status": "success",
-            "total": len(news_list),
-            "last_updated": datetime.now().isoformat(),
-            "categories": get_available_categories(),
-            "sources": get_available_sources(),
-            "news": news_list
-        }
-        
+        return cached_response(
+            request,
+            lambda snapshot: build_news(snapshot, category, source, search, limit, cursor, fields, collapse)
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/categories")
-def get_categories():
+def get_categories(request: Request):
     """Lấy danh sách tất cả các category có sẵn"""
-    return {"categories": get_available_categories()}
+    return cached_response(request, lambda snapshot: {"categories": snapshot.categories})
 
 @app.get("/sources")
-def get_sources():
+def get_sources(request: Request):
     """Lấy danh sách tất cả các nguồn tin có sẵn"""
-    return {"sources": get_available_sources()}
+    return cached_response(request, lambda snapshot: {"sources": snapshot.sources})
 
 @app.get("/health")
 def health_check():
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Chỉ số của API và của các process đã ghi chỉ số vào kho (scheduler, dịch vụ tóm tắt, ...)"""
+    return Response(render_process("api", store.storage), media_type=CONTENT_TYPE)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
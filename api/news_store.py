@@ -0,0 +1,150 @@
+"""Kho tin tức trong bộ nhớ cho API
+
+Dữ liệu được đọc một lần từ kho SQLite (data/storage.py) và giữ trong một
+NewsSnapshot bất biến cùng các danh sách đã tính sẵn (theo category, theo
+nguồn, danh sách category/nguồn), tất cả đều sắp theo sort_key() giảm dần.
+Mỗi lần truy cập (tối đa một lần mỗi check_interval giây) chỉ đọc phiên bản
+dữ liệu trong kho; khi phiên bản thay đổi, snapshot mới được dựng đầy đủ từ
+một transaction đọc rồi mới thay cho snapshot cũ, nên request đang chạy
+không bao giờ thấy dữ liệu dở dang.
+"""
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from api.search_index import SearchIndex
+from data.storage import NewsStorage, open_storage
+
+def sort_key(news: Dict) -> Tuple[str, str, str]:
+    """Khóa sắp xếp của tin: mới nhất trước; link và category phân biệt các tin cùng thời điểm"""
+    return (news["timestamp"], news["link"], news["category"])
+
+def collapse_clusters(news_list: List[Dict]) -> List[Dict]:
+    """Giữ tin đầu tiên (mới nhất) của mỗi cụm tin gần trùng, giữ nguyên thứ tự"""
+    seen = set()
+    collapsed = []
+    for news in news_list:
+        cluster = news.get("cluster_id") or news["link"]
+        if cluster not in seen:
+            seen.add(cluster)
+            collapsed.append(news)
+    return collapsed
+
+def category_key(category: str) -> str:
+    """Tên category dùng để tra cứu: "thời_sự" và "thời sự" là một"""
+    return category.replace("_", " ").strip().lower()
+
+@dataclass(frozen=True)
+class NewsSnapshot:
+    news: List[Dict] = field(default_factory=list)
+    by_category: Dict[str, List[Dict]] = field(default_factory=dict)
+    by_source: Dict[str, List[Dict]] = field(default_factory=dict)
+    categories: List[str] = field(default_factory=list)
+    sources: List[str] = field(default_factory=list)
+    by_link: Dict[str, List[Dict]] = field(default_factory=dict)
+    index: Optional[SearchIndex] = None
+    last_updated: str = ""
+    version: str = ""
+
+    def filter(self, category: Optional[str] = None, source: Optional[str] = None) -> List[Dict]:
+        """Tin theo category và/hoặc nguồn (không phân biệt hoa thường)"""
+        if category:
+            news_list = self.by_category.get(category_key(category), [])
+            if source:
+                source = source.lower()
+                news_list = [news for news in news_list if news["source"].lower() == source]
+            return news_list
+        if source:
+            return self.by_source.get(source.lower(), [])
+        return self.news
+
+    def search(self, query: str, category: Optional[str] = None, source: Optional[str] = None) -> List[Dict]:
+        """Tin khớp truy vấn theo thứ tự BM25, lọc thêm theo category và nguồn"""
+        if self.index is None:
+            return []
+        category = category_key(category) if category else None
+        source = source.lower() if source else None
+        results = []
+        for link, _ in self.index.search(query):
+            for news in self.by_link.get(link, ()):
+                if category and category_key(news["category"]) != category:
+                    continue
+                if source and news["source"].lower() != source:
+                    continue
+                results.append(news)
+        return results
+
+    def has_category(self, category: str) -> bool:
+        return category_key(category) in self.by_category
+
+class NewsStore:
+    """Giữ snapshot tin tức của kho dữ liệu và nạp lại khi kho thay đổi"""
+
+    def __init__(self, data_dir: Optional[str] = None, check_interval: float = 1.0):
+        self.data_dir = data_dir
+        self.check_interval = check_interval
+        self._storage: Optional[NewsStorage] = None
+        self._snapshot = NewsSnapshot()
+        # Chỉ mục tìm kiếm dùng chung giữa các snapshot, cập nhật tăng dần khi nạp lại
+        self.index = SearchIndex()
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    @property
+    def storage(self) -> NewsStorage:
+        # Mở kho khi cần lần đầu, không phải lúc import module
+        if self._storage is None:
+            self._storage = open_storage(self.data_dir)
+        return self._storage
+
+    def load(self) -> NewsSnapshot:
+        """Đọc dữ liệu và dựng snapshot mới"""
+        news_list, all_categories, version, last_updated = self.storage.load_news()
+        # Kho đã trả về đúng thứ tự; sắp lại (gần như miễn phí) để chắc chắn khớp sort_key
+        news_list.sort(key=sort_key, reverse=True)
+
+        by_category: Dict[str, List[Dict]] = {}
+        by_source: Dict[str, List[Dict]] = {}
+        by_link: Dict[str, List[Dict]] = {}
+        categories = set(all_categories)
+        sources = set()
+        for news in news_list:
+            by_category.setdefault(category_key(news["category"]), []).append(news)
+            by_source.setdefault(news["source"].lower(), []).append(news)
+            by_link.setdefault(news["link"], []).append(news)
+            sources.add(news["source"])
+        for category in categories:
+            by_category.setdefault(category_key(category), [])
+        added, removed = self.index.update(news_list)
+        print(f"Chỉ mục tìm kiếm: thêm {added}, xóa {removed}, tổng {len(self.index)} bài")
+
+        return NewsSnapshot(
+            news=news_list,
+            by_category=by_category,
+            by_source=by_source,
+            categories=sorted(categories),
+            sources=sorted(sources),
+            by_link=by_link,
+            index=self.index,
+            last_updated=last_updated,
+            version=version
+        )
+
+    def snapshot(self) -> NewsSnapshot:
+        """Snapshot hiện tại, nạp lại trước nếu dữ liệu trong kho đã thay đổi"""
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._snapshot
+        with self._lock:
+            if now - self._checked_at < self.check_interval:
+                return self._snapshot
+            try:
+                if self.storage.version() != self._snapshot.version:
+                    self._snapshot = self.load()
+            except (OSError, sqlite3.Error) as e:
+                # Kho tạm thời không đọc được: giữ snapshot cũ, thử lại lần sau
+                print(f"Không thể nạp lại tin tức: {str(e)}")
+            self._checked_at = time.monotonic()
+        return self._snapshot
@@ -0,0 +1,87 @@
+"""Phân trang và chọn trường cho /news
+
+Danh sách tin luôn được sắp theo (timestamp, link, category) giảm dần (xem
+NewsStore), nên cursor chỉ cần ghi khóa của tin cuối trang trước và trang
+tiếp theo bắt đầu ngay sau khóa đó (keyset), kể cả khi có tin mới được thêm
+vào giữa hai lần gọi. Kết quả tìm kiếm xếp theo điểm BM25 nên dùng cursor
+theo vị trí.
+"""
+import base64
+import json
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from api.news_store import sort_key
+
+NEWS_FIELDS = ("title", "link", "summary", "description", "category", "source", "timestamp", "cluster_id")
+
+def encode_cursor(state: Dict) -> str:
+    data = json.dumps(state, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Dict:
+    """Giải mã cursor; ValueError nếu cursor không hợp lệ"""
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        state = json.loads(data)
+    except (ValueError, TypeError):
+        raise ValueError("Cursor không hợp lệ")
+    valid_key = (
+        isinstance(state, dict) and isinstance(state.get("key"), list) and len(state["key"]) == 3
+        and all(isinstance(part, str) for part in state["key"])
+    )
+    valid_offset = isinstance(state, dict) and isinstance(state.get("offset"), int)
+    if not (valid_key or valid_offset):
+        raise ValueError("Cursor không hợp lệ")
+    return state
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """"title,link,summary" -> các trường được giữ lại; None là giữ tất cả"""
+    if not fields:
+        return None
+    selected = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in selected if name not in NEWS_FIELDS]
+    if unknown:
+        raise ValueError(f"Trường không hợp lệ: {', '.join(unknown)} (chọn trong {', '.join(NEWS_FIELDS)})")
+    return selected
+
+def project(news_list: Sequence[Dict], fields: Optional[Tuple[str, ...]]) -> List[Dict]:
+    if fields is None:
+        return list(news_list)
+    return [{name: news.get(name) for name in fields} for news in news_list]
+
+def _start_after(news_list: Sequence[Dict], key: Tuple) -> int:
+    """Vị trí tin đầu tiên có khóa nhỏ hơn key trong danh sách sắp giảm dần"""
+    lo, hi = 0, len(news_list)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if sort_key(news_list[mid]) < key:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+def paginate(
+    news_list: Sequence[Dict],
+    limit: int,
+    cursor: Optional[str] = None,
+    keyset: bool = True
+) -> Tuple[Sequence[Dict], Optional[str]]:
+    """Một trang tin và cursor của trang tiếp theo (None nếu đã hết)"""
+    start = 0
+    if cursor:
+        state = decode_cursor(cursor)
+        if keyset:
+            if "key" not in state:
+                raise ValueError("Cursor không hợp lệ")
+            start = _start_after(news_list, tuple(state["key"]))
+        else:
+            if "offset" not in state:
+                raise ValueError("Cursor không hợp lệ")
+            start = max(0, state["offset"])
+
+    page = news_list[start:start + limit]
+    if start + limit >= len(news_list):
+        return page, None
+    if keyset:
+        return page, encode_cursor({"key": list(sort_key(page[-1]))})
+    return page, encode_cursor({"offset": start + limit})
@@ -0,0 +1,126 @@
+"""Cache response đã mã hóa sẵn cho API
+
+Mỗi tổ hợp (đường dẫn, tham số truy vấn) được mã hóa JSON (orjson nếu có)
+một lần cho mỗi phiên bản dữ liệu, kèm ETag mạnh tính từ phiên bản dữ liệu,
+khóa truy vấn và content-coding (mỗi bản nén là một representation khác
+nhau nên cần ETag khác nhau). Bản nén gzip/brotli được tạo lần đầu có client yêu cầu
+và giữ lại cùng entry. Khi dữ liệu được nạp lại (phiên bản đổi), toàn bộ
+cache bị bỏ.
+"""
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Body nhỏ hơn ngưỡng này không đáng nén
+MIN_COMPRESS_SIZE = 1024
+
+def dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+# Hậu tố content-coding của ETag
+ENCODINGS = ("br", "gzip")
+
+def make_etag(version: str, key: Hashable, encoding: Optional[str] = None) -> str:
+    digest = hashlib.blake2b(repr(key).encode("utf-8"), digest_size=8).hexdigest()
+    suffix = f"-{encoding}" if encoding else ""
+    return f'"{version}-{digest}{suffix}"'
+
+def _strip_etag(tag: str) -> str:
+    """ETag bỏ tiền tố W/ và hậu tố content-coding: cùng dữ liệu ở mọi cách nén"""
+    tag = tag.removeprefix("W/")
+    for encoding in ENCODINGS:
+        if tag.endswith(f'-{encoding}"'):
+            return tag[:-len(encoding) - 2] + '"'
+    return tag
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match có chứa etag (hoặc "*") không, bất kể content-coding của bản client đang giữ"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    base = _strip_etag(etag)
+    return "*" in candidates or any(_strip_etag(tag) == base for tag in candidates)
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """"br" hoặc "gzip" theo Accept-Encoding của client, None nếu không nén"""
+    accepted = {}
+    for part in (accept_encoding or "").lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name] = q
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+class EncodedResponse:
+    """Body JSON đã mã hóa, ETag và các bản nén đã tạo"""
+
+    def __init__(self, body: bytes, etag: str):
+        self.body = body
+        self.etag = etag
+        self._encoded: Dict[str, bytes] = {}
+
+    def encoded(self, encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+        """(body, Content-Encoding) cho encoding mà client chấp nhận"""
+        if encoding is None or len(self.body) < MIN_COMPRESS_SIZE:
+            return self.body, None
+        if encoding not in self._encoded:
+            if encoding == "br":
+                self._encoded[encoding] = brotli.compress(self.body, quality=5)
+            else:
+                self._encoded[encoding] = gzip.compress(self.body, compresslevel=6)
+        return self._encoded[encoding], encoding
+
+class ResponseCache:
+    """LRU các EncodedResponse của một phiên bản dữ liệu"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.version: Optional[str] = None
+        self._entries: "OrderedDict[Hashable, EncodedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "not_modified": 0}
+
+    def get(self, version: str, key: Hashable, build: Callable[[], Dict]) -> EncodedResponse:
+        """Response đã mã hóa của key; build() chỉ được gọi khi chưa có trong cache"""
+        with self._lock:
+            if version != self.version:
+                self._entries.clear()
+                self.version = version
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry
+
+        entry = EncodedResponse(dumps(build()), make_etag(version, key))
+        with self._lock:
+            self.stats["misses"] += 1
+            if version == self.version:
+                self._entries[key] = entry
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return entry
@@ -0,0 +1,196 @@
+"""Chỉ mục đảo ngược cho tham số search của /news
+
+Tiêu đề và mô tả được chuẩn hóa NFKC, bỏ dấu và tách âm tiết (xem
+data/vietnamese.py), nên "thoi su" khớp "thời sự". Truy vấn nhiều từ là
+AND; từ cuối cùng khớp theo tiền tố để tìm được khi người dùng đang gõ.
+Kết quả xếp hạng bằng BM25, tiêu đề được tính trọng số cao hơn mô tả.
+
+Chỉ mục được cập nhật tăng dần: update() chỉ thêm/xóa các bài có link mới,
+đã mất hoặc đã đổi nội dung so với lần trước.
+"""
+import bisect
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from data.vietnamese import tokenize
+
+TITLE_WEIGHT = 2
+
+class SearchIndex:
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        # term -> {doc_id: tần suất}
+        self.postings: Dict[str, Dict[int, int]] = {}
+        # Danh sách term đã sắp xếp để tra tiền tố bằng bisect
+        self.terms: List[str] = []
+        self.doc_lengths: Dict[int, int] = {}
+        self.doc_links: Dict[int, str] = {}
+        self.doc_ids: Dict[str, int] = {}
+        self.doc_keys: Dict[int, Tuple[str, str]] = {}
+        self.total_length = 0
+        self._next_id = 0
+        # Bản numpy của postings kèm điểm BM25, dựng khi truy vấn và bỏ khi cập nhật
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._norms: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    @staticmethod
+    def document_terms(news: Dict) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for term in tokenize(news["title"]):
+            counts[term] = counts.get(term, 0) + TITLE_WEIGHT
+        for term in tokenize(news.get("description") or ""):
+            counts[term] = counts.get(term, 0) + 1
+        return counts
+
+    def _add(self, news: Dict) -> None:
+        doc_id = self._next_id
+        self._next_id += 1
+        counts = self.document_terms(news)
+        for term, tf in counts.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+                bisect.insort(self.terms, term)
+            postings[doc_id] = tf
+        length = sum(counts.values())
+        self.doc_lengths[doc_id] = length
+        self.total_length += length
+        self.doc_links[doc_id] = news["link"]
+        self.doc_ids[news["link"]] = doc_id
+        self.doc_keys[doc_id] = (news["title"], news.get("description") or "")
+
+    def _remove(self, link: str) -> None:
+        doc_id = self.doc_ids.pop(link)
+        title, description = self.doc_keys.pop(doc_id)
+        for term in self.document_terms({"title": title, "description": description}):
+            postings = self.postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self.postings[term]
+                del self.terms[bisect.bisect_left(self.terms, term)]
+        self.total_length -= self.doc_lengths.pop(doc_id)
+        del self.doc_links[doc_id]
+
+    def _reset(self) -> None:
+        self.postings, self.terms = {}, []
+        self.doc_lengths, self.doc_links, self.doc_ids, self.doc_keys = {}, {}, {}, {}
+        self.total_length = 0
+        self._next_id = 0
+
+    def update(self, news_list: List[Dict]) -> Tuple[int, int]:
+        """Đồng bộ chỉ mục với news_list, trả về (số bài thêm, số bài xóa)"""
+        latest = {news["link"]: news for news in news_list}
+        with self._lock:
+            removed = [
+                link for link, doc_id in self.doc_ids.items()
+                if link not in latest
+                or self.doc_keys[doc_id] != (latest[link]["title"], latest[link].get("description") or "")
+            ]
+            for link in removed:
+                self._remove(link)
+            added = [news for link, news in latest.items() if link not in self.doc_ids]
+            if self._next_id + len(added) > 2 * len(latest) + 1024:
+                # Quá nhiều doc_id đã bị xóa: đánh số lại từ đầu cho mảng gọn
+                self._reset()
+                for news in latest.values():
+                    self._add(news)
+            else:
+                for news in added:
+                    self._add(news)
+            # idf và độ dài trung bình đã đổi: tính lại điểm khi truy vấn
+            self._arrays, self._norms = {}, None
+        return len(added), len(removed)
+
+    def _expand(self, term: str, prefix: bool) -> List[str]:
+        if not prefix:
+            return [term] if term in self.postings else []
+        start = bisect.bisect_left(self.terms, term)
+        end = bisect.bisect_left(self.terms, term + "\U0010ffff")
+        return self.terms[start:end]
+
+    def _doc_norms(self) -> np.ndarray:
+        """k1 * (1 - b + b * độ dài / độ dài trung bình) của từng doc_id"""
+        if self._norms is None:
+            lengths = np.zeros(self._next_id)
+            lengths[np.fromiter(self.doc_lengths.keys(), dtype=np.int64, count=len(self.doc_lengths))] = \
+                np.fromiter(self.doc_lengths.values(), dtype=np.float64, count=len(self.doc_lengths))
+            avg_length = self.total_length / len(self.doc_lengths)
+            self._norms = self.k1 * (1 - self.b + self.b * lengths / avg_length)
+        return self._norms
+
+    def _term_arrays(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(doc_id tăng dần, điểm BM25 của term trong từng bài)"""
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            postings = self.postings[term]
+            # doc_id được cấp tăng dần nên thứ tự chèn của dict đã được sắp xếp
+            ids = np.fromiter(postings.keys(), dtype=np.int64, count=len(postings))
+            tfs = np.fromiter(postings.values(), dtype=np.float64, count=len(postings))
+            n = len(self.doc_lengths)
+            idf = math.log(1 + (n - len(ids) + 0.5) / (len(ids) + 0.5))
+            weights = idf * tfs * (self.k1 + 1) / (tfs + self._doc_norms()[ids])
+            arrays = self._arrays[term] = (ids, weights)
+        return arrays
+
+    def _group_arrays(self, group: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Gộp các term khớp cùng một từ truy vấn (khi khớp tiền tố) theo doc_id"""
+        if len(group) == 1:
+            return self._term_arrays(group[0])
+        arrays = [self._term_arrays(term) for term in group]
+        if sum(len(a[0]) for a in arrays) > self._next_id // 16:
+            # Tiền tố phổ biến: cộng dồn vào mảng đặc theo doc_id
+            dense = np.zeros(self._next_id)
+            for term_ids, term_weights in arrays:
+                dense[term_ids] += term_weights
+            ids = np.flatnonzero(dense)
+            return ids, dense[ids]
+        ids, inverse = np.unique(np.concatenate([a[0] for a in arrays]), return_inverse=True)
+        weights = np.bincount(inverse, weights=np.concatenate([a[1] for a in arrays]))
+        return ids, weights
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Các link khớp mọi từ trong truy vấn, xếp theo điểm BM25 giảm dần"""
+        query_terms = list(dict.fromkeys(tokenize(query)))
+        if not query_terms:
+            return []
+        with self._lock:
+            if not self.doc_lengths:
+                return []
+            # Mỗi từ trong truy vấn -> các term trong chỉ mục khớp với nó
+            groups = [
+                self._expand(term, prefix=(i == len(query_terms) - 1))
+                for i, term in enumerate(query_terms)
+            ]
+            if not all(groups):
+                return []
+
+            # AND: bắt đầu từ nhóm ít bài nhất, giữ lại các ứng viên có trong
+            # từng nhóm tiếp theo (tra từng term bằng searchsorted)
+            groups.sort(key=lambda group: sum(len(self.postings[term]) for term in group))
+            ids, scores = self._group_arrays(groups[0])
+            for group in groups[1:]:
+                found = np.zeros(len(ids), dtype=bool)
+                scores = scores.copy()
+                for term in group:
+                    term_ids, term_weights = self._term_arrays(term)
+                    positions = np.searchsorted(term_ids, ids).clip(max=len(term_ids) - 1)
+                    hit = term_ids[positions] == ids
+                    scores[hit] += term_weights[positions[hit]]
+                    found |= hit
+                ids, scores = ids[found], scores[found]
+                if not len(ids):
+                    return []
+
+            if limit is not None and limit < len(ids):
+                top = np.argpartition(-scores, limit)[:limit]
+                ids, scores = ids[top], scores[top]
+            order = np.argsort(-scores, kind="stable")
+            return [(self.doc_links[doc_id], score) for doc_id, score in zip(ids[order].tolist(), scores[order].tolist())]
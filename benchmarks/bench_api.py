@@ -0,0 +1,123 @@
+"""Load test API FastAPI trên dữ liệu tổng hợp
+
+Chạy api.api trong uvicorn (thread nền) với thư mục dữ liệu tạm chứa
+--news tin, rồi gửi --requests request cho mỗi endpoint với --concurrency
+kết nối đồng thời; báo cáo req/s, độ trễ p50/p95/p99 và số byte trên
+đường truyền (client chấp nhận nén như trình duyệt).
+
+    python benchmarks/bench_api.py --news 2000 --requests 500 --concurrency 16
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+import aiohttp
+import uvicorn
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.fixtures import make_news_items, write_news_storage
+
+ENDPOINTS = {
+    "news": "/news",
+    "news_revalidate": "/news",
+    "news_page_fields": "/news?limit=20&fields=title,link,summary",
+    "news_all": "/news?limit=1000",
+    "news_source": "/news?source=VnExpress",
+    "news_category": "/news?category=thời sự",
+    "news_search": "/news?search=giá vàng",
+    "categories": "/categories",
+    "sources": "/sources",
+}
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_server(app, port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+# Các endpoint gửi kèm If-None-Match lấy từ response trước (client poll lại)
+REVALIDATE = {"news_revalidate"}
+
+def _percentile(samples: List[float], q: float) -> float:
+    return sorted(samples)[min(len(samples) - 1, int(q * len(samples)))]
+
+async def load(url: str, requests: int, concurrency: int, revalidate: bool = False) -> Dict:
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    sizes: List[int] = []
+    queue = iter(range(requests))
+
+    async def worker(session: aiohttp.ClientSession):
+        for _ in queue:
+            start = time.perf_counter()
+            async with session.get(url, headers=headers) as response:
+                body = await response.read()
+                # Số byte trên đường truyền (trước khi giải nén)
+                sizes.append(response.content_length if response.content_length is not None else len(body))
+                statuses[response.status] = statuses.get(response.status, 0) + 1
+            latencies.append(time.perf_counter() - start)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        # Một request làm nóng (nạp dữ liệu lần đầu)
+        async with session.get(url) as response:
+            await response.read()
+            headers = {"If-None-Match": response.headers["ETag"]} if revalidate else {}
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(session) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "requests_per_sec": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": _percentile(latencies, 0.95) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "bytes": statistics.median(sizes),
+        "statuses": statuses,
+    }
+
+def run(news: int = 2000, requests: int = 500, concurrency: int = 16, endpoints=tuple(ENDPOINTS)) -> Dict:
+    workdir = tempfile.mkdtemp(prefix="bench_api_")
+    write_news_storage(os.path.join(workdir, "data"), make_news_items(news))
+    # API (và web app) đọc kho trong NEWS_DATA_DIR thay vì data/ của dự án
+    os.environ["NEWS_DATA_DIR"] = os.path.join(workdir, "data")
+
+    from api.api import app
+
+    port = _free_port()
+    server = start_server(app, port)
+    results = {"news": news, "requests": requests, "concurrency": concurrency}
+    try:
+        for name in endpoints:
+            url = f"http://127.0.0.1:{port}{ENDPOINTS[name]}"
+            results[name] = asyncio.run(load(url, requests, concurrency, name in REVALIDATE))
+    finally:
+        server.should_exit = True
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--news", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS))
+    args = parser.parse_args()
+    results = run(args.news, args.requests, args.concurrency, args.endpoints.split(","))
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Benchmark các backend suy luận CPU: torch fp32, torch int8, ONNX Runtime
+
+Mỗi backend chạy trong một process riêng để đo bộ nhớ độc lập. Báo cáo thời
+gian tải, độ trễ từng bài, throughput theo batch, RSS và độ lệch ROUGE của
+bản tóm tắt so với baseline fp32 trên cùng một tập bài cố định.
+
+    python benchmarks/bench_backends.py --articles 32
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.bench_summarize import make_articles
+from benchmarks.tiny_model import build_tiny_model
+from models.backends import BACKENDS
+
+def rss_mb() -> float:
+    """RSS hiện tại của process (MB)"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _lcs(a: List[str], b: List[str]) -> int:
+    previous = [0] * (len(b) + 1)
+    for x in a:
+        current = [0]
+        for j, y in enumerate(b):
+            current.append(previous[j] + 1 if x == y else max(previous[j + 1], current[j]))
+        previous = current
+    return previous[-1]
+
+def _f1(overlap: int, candidate: int, reference: int) -> float:
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / candidate, overlap / reference
+    return 2 * precision * recall / (precision + recall)
+
+def rouge(candidate: str, reference: str) -> Dict[str, float]:
+    """ROUGE-1 và ROUGE-L F1 theo âm tiết"""
+    c, r = candidate.lower().split(), reference.lower().split()
+    if not c or not r:
+        return {"rouge1": float(c == r), "rougeL": float(c == r)}
+    counts: Dict[str, int] = {}
+    for token in r:
+        counts[token] = counts.get(token, 0) + 1
+    overlap = 0
+    for token in c:
+        if counts.get(token, 0) > 0:
+            counts[token] -= 1
+            overlap += 1
+    return {"rouge1": _f1(overlap, len(c), len(r)), "rougeL": _f1(_lcs(c, r), len(c), len(r))}
+
+def run_backend(backend: str, model: str, texts: List[str], batch_size: int, latency_samples: int) -> Dict:
+    """Chạy trong process con: tải backend, đo độ trễ, throughput và bộ nhớ"""
+    from models.summarizer import NewsSummarizer
+    from models.summary_cache import SummaryCache
+
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    summarizer = NewsSummarizer(cache=SummaryCache(":memory:"), model_name=model, backend=backend)
+    load_seconds = time.perf_counter() - start
+    if summarizer.summarizer is None:
+        return {"error": "Không tải được backend"}
+    rss_loaded = rss_mb()
+
+    latencies = []
+    for text in texts[:latency_samples]:
+        prepared = summarizer.preprocess_text(text)
+        start = time.perf_counter()
+        summarizer.summarizer(prepared, truncation=True, **summarizer.generation_kwargs)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    summaries = summarizer.process_batch(texts, batch_size=batch_size)
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        "load_seconds": load_seconds,
+        "latency_ms_p50": statistics.median(latencies) * 1000,
+        "latency_ms_max": max(latencies) * 1000,
+        "articles_per_sec": len(texts) / batch_seconds,
+        "rss_model_mb": rss_loaded - rss_before,
+        "rss_peak_mb": rss_mb(),
+        "summaries": summaries,
+    }
+
+def run(
+    articles: int = 32,
+    batch_size: int = 8,
+    latency_samples: int = 8,
+    model: Optional[str] = None,
+    backends=BACKENDS
+) -> Dict:
+    model = model or build_tiny_model()
+    texts = make_articles(articles, seed=1)
+    ctx = multiprocessing.get_context("spawn")
+
+    results = {"model": model, "articles": articles, "batch_size": batch_size}
+    for backend in backends:
+        with ctx.Pool(1) as pool:
+            results[backend] = pool.apply(run_backend, (backend, model, texts, batch_size, latency_samples))
+
+    baseline = results.get("torch", {}).get("summaries")
+    for backend in backends:
+        summaries = results[backend].pop("summaries", None)
+        if baseline and summaries:
+            scores = [rouge(candidate, reference) for candidate, reference in zip(summaries, baseline)]
+            results[backend]["rouge1_vs_fp32"] = statistics.mean(s["rouge1"] for s in scores)
+            results[backend]["rougeL_vs_fp32"] = statistics.mean(s["rougeL"] for s in scores)
+            results[backend]["identical_to_fp32"] = sum(a == b for a, b in zip(summaries, baseline)) / len(baseline)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=32)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--latency-samples", type=int, default=8)
+    parser.add_argument("--model", default=None, help="Tên hoặc thư mục mô hình (mặc định: mô hình tí hon)")
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    args = parser.parse_args()
+    results = run(args.articles, args.batch_size, args.latency_samples, args.model, args.backends.split(","))
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark crawl: vòng lặp tuần tự cũ so với crawl engine bất đồng bộ
+
+Mỗi nguồn được phục vụ bởi một stub server riêng trên localhost với độ trễ
+cố định, nên thời gian lý tưởng của engine bất đồng bộ xấp xỉ độ trễ của
+host chậm nhất thay vì tổng độ trễ của 42 trang. Lần chạy "cached" đo chu
+kỳ thứ hai khi mọi trang đều trả về 304.
+
+    python benchmarks/bench_crawl.py --latency 0.2
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from typing import Dict, List
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.fixtures import render_page
+from benchmarks.stub_server import StubServer, rewrite_urls
+from data.http_cache import ResponseCache
+from data.news_crawler import NewsCrawler, crawl_all_news_async, get_crawlers
+
+def _page_renderer(crawler_name: str):
+    cache = {}
+
+    def render(path: str) -> bytes:
+        if path not in cache:
+            cache[path] = render_page(crawler_name, seed=len(cache)).encode("utf-8")
+        return cache[path]
+
+    return render
+
+def _point_to_stub(crawler: NewsCrawler, base_url: str) -> NewsCrawler:
+    urls = rewrite_urls(crawler.get_category_urls(), base_url)
+    crawler.get_category_urls = lambda: urls
+    return crawler
+
+def crawl_serial(crawlers: List[NewsCrawler]) -> int:
+    """Cách crawl cũ: từng nguồn, từng category với requests.get"""
+    total = 0
+    for crawler in crawlers:
+        for category, url in crawler.get_category_urls().items():
+            response = requests.get(url, headers=crawler.headers)
+            response.raise_for_status()
+            total += len(crawler.extract_news(response.text, category))
+    return total
+
+def run(latency: float = 0.1) -> Dict:
+    with ExitStack() as stack:
+        crawlers = []
+        for crawler in get_crawlers():
+            server = stack.enter_context(
+                StubServer(_page_renderer(crawler.__class__.__name__), latency=latency)
+            )
+            crawlers.append(_point_to_stub(crawler, server.base_url))
+        pages = sum(len(c.get_category_urls()) for c in crawlers)
+
+        start = time.perf_counter()
+        serial_items = crawl_serial(crawlers)
+        serial_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        async_items = len(asyncio.run(crawl_all_news_async(crawlers)))
+        async_time = time.perf_counter() - start
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResponseCache(os.path.join(tmp, "http_cache.sqlite"))
+            asyncio.run(crawl_all_news_async(crawlers, cache))
+            start = time.perf_counter()
+            cached_items = len(asyncio.run(crawl_all_news_async(crawlers, cache)))
+            cached_time = time.perf_counter() - start
+            cache_stats = dict(cache.stats)
+            cache.close()
+
+    return {
+        "pages": pages,
+        "latency_s": latency,
+        "serial": {"seconds": serial_time, "items": serial_items, "pages_per_sec": pages / serial_time},
+        "async": {"seconds": async_time, "items": async_items, "pages_per_sec": pages / async_time},
+        "cached": {"seconds": cached_time, "items": cached_items, "cache": cache_stats},
+        "speedup": serial_time / async_time,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.1, help="Độ trễ mỗi trang (giây)")
+    args = parser.parse_args()
+    print(json.dumps(run(args.latency), ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Benchmark gom cụm tin gần trùng (MinHash + LSH) trong NewsStorage
+
+Sinh --stories câu chuyện, mỗi câu chuyện được 1-4 nguồn đăng lại với
+tiêu đề và mô tả viết lại (bỏ, thay và đảo một phần từ), ghi vào kho theo
+từng đợt như crawler. Báo cáo:
+
+- số bài phải tóm tắt (số lần gọi mô hình) khi có và không có gom cụm;
+- precision/recall theo cặp bài của việc gom cụm so với câu chuyện thật;
+- thời gian ghi mỗi 1000 bài khi kho lớn dần (--sizes), để thấy chi phí
+  gom cụm gần như không đổi theo kích thước kho nhờ tra cứu theo dải LSH.
+
+Với --real, gom cụm thêm các tin trong một file processed_news.json thật và
+in các cụm nhiều nguồn để kiểm tra bằng mắt.
+
+    python benchmarks/bench_dedup.py --stories 1000 --sizes 1000,10000
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.fixtures import CATEGORIES, SOURCES, WORDS, news_sentence
+from data.storage import NewsStorage, normalize_link
+
+def rewrite(words: List[str], rng: random.Random, drop: float = 0.08, replace: float = 0.08) -> List[str]:
+    """Một nguồn khác viết lại câu: bỏ, thay một số từ và đảo hai nửa câu"""
+    result = []
+    for word in words:
+        roll = rng.random()
+        if roll < drop:
+            continue
+        result.append(rng.choice(WORDS) if roll < drop + replace else word)
+    if len(result) > 6 and rng.random() < 0.5:
+        middle = len(result) // 2
+        result = result[middle:] + result[:middle]
+    return result
+
+def make_corpus(stories: int, seed: int = 0) -> List[Dict]:
+    """Các bài của stories câu chuyện, mỗi bài ghi kèm "story" (nhãn thật)"""
+    rng = random.Random(seed)
+    articles = []
+    for story in range(stories):
+        title = news_sentence(rng, 10, 16).rstrip(".").split()
+        description = " ".join(news_sentence(rng) for _ in range(2)).split()
+        category = rng.choice(CATEGORIES)
+        for source in rng.sample(SOURCES, rng.choice((1, 1, 2, 3, 4))):
+            articles.append({
+                "title": " ".join(rewrite(title, rng)),
+                "link": f"https://{source.lower().replace(' ', '')}.example.vn/{story}-{len(articles)}.html",
+                "description": " ".join(rewrite(description, rng)),
+                "category": category,
+                "source": source,
+                "story": story,
+            })
+    # Các nguồn đăng cùng câu chuyện vào những lúc khác nhau
+    rng.shuffle(articles)
+    return articles
+
+def upsert_batches(storage: NewsStorage, articles: List[Dict], batch_size: int = 200) -> float:
+    start = time.perf_counter()
+    for i in range(0, len(articles), batch_size):
+        storage.upsert_articles(articles[i:i + batch_size])
+    return time.perf_counter() - start
+
+def pair_scores(articles: List[Dict], clusters: Dict[str, str]) -> Dict:
+    """Precision/recall theo cặp bài: cặp cùng cụm so với cặp cùng câu chuyện"""
+    def pairs(label) -> set:
+        groups: Dict = {}
+        for article in articles:
+            groups.setdefault(label(article), []).append(normalize_link(article["link"]))
+        return {pair for group in groups.values() for pair in itertools.combinations(sorted(group), 2)}
+
+    truth = pairs(lambda article: article["story"])
+    predicted = pairs(lambda article: clusters[normalize_link(article["link"])])
+    correct = len(truth & predicted)
+    return {
+        "true_pairs": len(truth),
+        "predicted_pairs": len(predicted),
+        "precision": correct / len(predicted) if predicted else 1.0,
+        "recall": correct / len(truth) if truth else 1.0,
+    }
+
+def run(stories: int = 1000, sizes: Tuple[int, ...] = (1000, 10000), seed: int = 0) -> Dict:
+    workdir = tempfile.mkdtemp(prefix="bench_dedup_")
+    articles = make_corpus(stories, seed)
+    storage = NewsStorage(os.path.join(workdir, "quality.sqlite"))
+    upsert_batches(storage, articles)
+    with storage.snapshot() as conn:
+        clusters = dict(conn.execute("SELECT link, cluster_id FROM articles"))
+    results = {
+        "stories": stories,
+        "articles": len(articles),
+        "summaries_without_dedup": len(articles),
+        "summaries_with_dedup": len(storage.pending_summaries()),
+        "clusters": len(set(clusters.values())),
+        **pair_scores(articles, clusters),
+    }
+    storage.close()
+
+    # Chi phí ghi theo kích thước kho: đo 1000 bài cuối cùng của mỗi kích thước
+    scaling = {}
+    for size in sizes:
+        corpus = make_corpus(size, seed + 1)[:size]
+        storage = NewsStorage(os.path.join(workdir, f"scale_{size}.sqlite"))
+        upsert_batches(storage, corpus[:-1000])
+        scaling[f"upsert_ms_per_1000_at_{size}"] = upsert_batches(storage, corpus[-1000:]) * 1000
+        storage.close()
+    results["scaling"] = scaling
+    return results
+
+def inspect_real(path: str, show: int = 10) -> Dict:
+    """Gom cụm tin thật và in các cụm có từ hai nguồn trở lên"""
+    with open(path, "r", encoding="utf-8") as f:
+        news_list = json.load(f)
+    storage = NewsStorage(os.path.join(tempfile.mkdtemp(prefix="bench_dedup_real_"), "news.sqlite"))
+    upsert_batches(storage, news_list)
+    with storage.snapshot() as conn:
+        rows = conn.execute("SELECT cluster_id, source, title FROM articles ORDER BY cluster_id").fetchall()
+    storage.close()
+    groups: Dict[str, List[Tuple[str, str]]] = {}
+    for cluster_id, source, title in rows:
+        groups.setdefault(cluster_id, []).append((source, title))
+    multi = [group for group in groups.values() if len({source for source, _ in group}) > 1]
+    for group in multi[:show]:
+        print("---")
+        for source, title in group:
+            print(f"  [{source}] {title}")
+    return {"articles": len(rows), "clusters": len(groups), "multi_source_clusters": len(multi)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stories", type=int, default=1000)
+    parser.add_argument("--sizes", default="1000,10000", help="Kích thước kho khi đo thời gian ghi")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--real", default=None, help="Đường dẫn processed_news.json để kiểm tra trên tin thật")
+    args = parser.parse_args()
+    results = run(args.stories, tuple(int(size) for size in args.sizes.split(",")), args.seed)
+    if args.real:
+        results["real"] = inspect_real(args.real)
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark tóm tắt trích xuất: TF-IDF từng bài so với batch dùng chung từ điển
+
+Kiểm tra trước rằng với từng bài riêng lẻ, kết quả của bản batch giống hệt
+cách làm cũ, rồi đo thời gian trên toàn bộ tập bài.
+
+    python benchmarks/bench_extractive.py --articles 10000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Dict, List
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.fixtures import random_sentence
+from data.vietnamese import split_sentences
+from models.extractive import extract_key_sentences, extract_key_sentences_batch
+
+def legacy_extract_key_sentences(text: str, num_sentences: int = 2) -> str:
+    """Cách làm cũ: fit một TfidfVectorizer cho mỗi bài, chấm điểm từng câu"""
+    sentences = split_sentences(text)
+    if len(sentences) <= num_sentences:
+        return text
+
+    words = text.split()
+    if len(words) > 500:
+        text = ' '.join(words[:500])
+        sentences = split_sentences(text)
+
+    vectorizer = TfidfVectorizer(max_features=500, stop_words=None)
+    tfidf_matrix = vectorizer.fit_transform(sentences)
+
+    sentence_scores = []
+    for i, sentence in enumerate(sentences):
+        score = np.sum(tfidf_matrix[i].toarray())
+        sentence_scores.append((score, i, sentence))
+
+    sentence_scores.sort(reverse=True)
+    selected_indices = [x[1] for x in sentence_scores[:num_sentences]]
+    selected_indices.sort()
+    return ' '.join(sentences[i] for i in selected_indices)
+
+def make_articles(count: int, seed: int = 0) -> List[str]:
+    """Bài tổng hợp 1-40 câu, có câu lặp lại để kiểm tra trường hợp cùng điểm"""
+    rng = random.Random(seed)
+    articles = []
+    for _ in range(count):
+        sentences = [random_sentence(rng) for _ in range(rng.randint(1, 40))]
+        if len(sentences) > 3 and rng.random() < 0.2:
+            sentences.append(rng.choice(sentences))
+        articles.append(" ".join(sentences))
+    return articles
+
+def run(articles: int = 10000, batch_size: int = 1000, check: int = 1000) -> Dict:
+    texts = make_articles(articles)
+
+    mismatches = sum(
+        extract_key_sentences(text) != legacy_extract_key_sentences(text)
+        for text in texts[:check]
+    )
+
+    start = time.perf_counter()
+    for text in texts:
+        legacy_extract_key_sentences(text)
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        extract_key_sentences_batch(texts[i:i + batch_size])
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        "articles": articles,
+        "batch_size": batch_size,
+        "single_article_mismatches": f"{mismatches}/{min(check, articles)}",
+        "legacy_articles_per_sec": articles / legacy_seconds,
+        "batch_articles_per_sec": articles / batch_seconds,
+        "speedup": legacy_seconds / batch_seconds,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=10000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--check", type=int, default=1000, help="Số bài kiểm tra kết quả giống cách làm cũ")
+    args = parser.parse_args()
+    print(json.dumps(run(args.articles, args.batch_size, args.check), ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
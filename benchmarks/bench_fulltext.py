@@ -0,0 +1,169 @@
+"""Benchmark chế độ toàn văn: tải trang bài viết và tóm tắt map-reduce
+
+Mỗi nguồn được phục vụ bởi một stub server trên localhost (trang bài viết
+theo cấu trúc thẻ của từng báo, độ trễ --latency). Đo:
+
+- tải nội dung --articles bài: tuần tự bằng requests so với
+  fetch_article_bodies() (đồng thời, tối đa 2 request mỗi host);
+- tóm tắt bằng mô hình BART tí hon (benchmarks/tiny_model.py): chỉ tiêu đề +
+  mô tả, toàn văn cắt ở 500 từ như cách cũ, và toàn văn chia đoạn
+  map-reduce; kèm tỉ lệ nội dung bài thực sự được đưa vào mô hình;
+- StreamingPipeline với ngân sách toàn văn --budget giây: thời gian dành
+  cho toàn văn phải dừng quanh ngân sách, các bài còn lại chỉ dùng tiêu đề
+  và mô tả.
+
+    python benchmarks/bench_fulltext.py --articles 48 --latency 0.05 --budget 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import zlib
+from contextlib import ExitStack
+from typing import Dict, List, Optional
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.fixtures import random_sentence, render_article
+from benchmarks.stub_server import StubServer
+from benchmarks.tiny_model import build_tiny_model
+from data.fetcher import AsyncFetcher
+from data.news_crawler import NewsCrawler, fetch_article_bodies, get_crawlers
+from data.storage import NewsStorage
+from models.summarizer import NewsSummarizer, build_text
+from models.summary_cache import SummaryCache
+from pipeline.streaming import StreamingPipeline
+
+def _article_renderer(crawler_name: str):
+    def render(path: str) -> bytes:
+        return render_article(crawler_name, seed=zlib.crc32(path.encode("utf-8"))).encode("utf-8")
+
+    return render
+
+def make_news(crawlers: List[NewsCrawler], base_urls: List[str], count: int, seed: int = 0) -> List[Dict]:
+    """Tin (tiêu đề + mô tả) trỏ tới trang bài viết trên stub server của nguồn"""
+    rng = random.Random(seed)
+    news_list = []
+    for i in range(count):
+        crawler, base_url = crawlers[i % len(crawlers)], base_urls[i % len(crawlers)]
+        news_list.append({
+            "title": random_sentence(rng, 8, 16).rstrip("."),
+            "link": f"{base_url}/bai-viet-{seed}-{i}.html",
+            "description": random_sentence(rng),
+            "category": "thời sự",
+            "source": crawler.source,
+        })
+    return news_list
+
+def fetch_serial(crawlers: List[NewsCrawler], news_list: List[Dict]) -> int:
+    by_source = {crawler.source: crawler for crawler in crawlers}
+    fetched = 0
+    for news in news_list:
+        response = requests.get(news["link"])
+        response.raise_for_status()
+        fetched += bool(by_source[news["source"]].extract_body(response.text))
+    return fetched
+
+async def _fetch_concurrent(crawlers: List[NewsCrawler], news_list: List[Dict]) -> int:
+    async with AsyncFetcher(max_per_host=2) as fetcher:
+        return await fetch_article_bodies(news_list, fetcher, crawlers)
+
+def fresh_summarizer(model: str) -> NewsSummarizer:
+    # Cache trong bộ nhớ, rỗng, để mọi văn bản đều qua mô hình
+    return NewsSummarizer(cache=SummaryCache(":memory:"), model_name=model)
+
+def measure_summaries(model: str, news_list: List[Dict]) -> Dict:
+    body_words = sum(len(news["body"].split()) for news in news_list)
+    teasers = [build_text({**news, "body": ""}) for news in news_list]
+    texts = [build_text(news) for news in news_list]
+    # Cách cũ: preprocess_text() cắt toàn văn ở 500 từ
+    truncated = [" ".join(text.split()[:500]) for text in texts]
+    teaser_words = sum(len(text.split()) for text in teasers)
+    results = {}
+    for name, inputs in (("teaser", teasers), ("truncated_500_words", truncated), ("map_reduce", texts)):
+        summarizer = fresh_summarizer(model)
+        start = time.perf_counter()
+        summarizer.process_batch(inputs)
+        elapsed = time.perf_counter() - start
+        input_words = sum(len(text.split()) for text in inputs)
+        results[name] = {
+            "seconds": elapsed,
+            "articles_per_sec": len(inputs) / elapsed,
+            # Tỉ lệ nội dung bài (ngoài tiêu đề + mô tả) được mô hình đọc
+            "body_coverage": max(0.0, input_words - teaser_words) / body_words,
+        }
+    summarizer = fresh_summarizer(model)
+    results["map_reduce"]["chunks_per_article"] = sum(
+        len(summarizer.chunk_text(summarizer.preprocess_text(text))) for text in texts
+    ) / len(texts)
+    return results
+
+async def _run_pipeline(storage: NewsStorage, summarizer, news_list: List[Dict], budget: float) -> Dict:
+    pipeline = StreamingPipeline(storage, summarizer, batch_size=8, full_article=True, budget=budget)
+    pipeline.start()
+    for i in range(0, len(news_list), 8):
+        await pipeline.sink(news_list[i:i + 8])
+    return await pipeline.finish()
+
+def run(articles: int = 48, latency: float = 0.05, budget: float = 5.0, model: Optional[str] = None) -> Dict:
+    model = model or build_tiny_model()
+    with ExitStack() as stack:
+        crawlers = get_crawlers()
+        base_urls = [
+            stack.enter_context(StubServer(_article_renderer(type(crawler).__name__), latency=latency)).base_url
+            for crawler in crawlers
+        ]
+        news_list = make_news(crawlers, base_urls, articles)
+
+        start = time.perf_counter()
+        serial = fetch_serial(crawlers, news_list)
+        serial_time = time.perf_counter() - start
+        start = time.perf_counter()
+        concurrent = asyncio.run(_fetch_concurrent(crawlers, news_list))
+        concurrent_time = time.perf_counter() - start
+
+        summaries = measure_summaries(model, news_list)
+
+        # Ngân sách: gấp đôi số bài để chắc chắn vượt ngân sách
+        workdir = tempfile.mkdtemp(prefix="bench_fulltext_")
+        storage = NewsStorage(os.path.join(workdir, "news.sqlite"))
+        stats = asyncio.run(_run_pipeline(
+            storage, fresh_summarizer(model), make_news(crawlers, base_urls, articles * 2, seed=1), budget
+        ))
+        storage.close()
+
+    return {
+        "articles": articles,
+        "latency_s": latency,
+        "fetch": {
+            "serial": {"seconds": serial_time, "bodies": serial},
+            "concurrent_2_per_host": {"seconds": concurrent_time, "bodies": concurrent},
+            "speedup": serial_time / concurrent_time,
+        },
+        "summarize": summaries,
+        "budget": {
+            "budget_s": budget,
+            "articles": articles * 2,
+            "full_article_seconds": stats["full_article_seconds"],
+            "bodies": stats["bodies"],
+            "summarized": stats["summarized"],
+            "seconds": stats["seconds"],
+        },
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=48)
+    parser.add_argument("--latency", type=float, default=0.05, help="Độ trễ mỗi trang bài viết (giây)")
+    parser.add_argument("--budget", type=float, default=5.0, help="Ngân sách toàn văn của pipeline (giây)")
+    parser.add_argument("--model", default=None, help="Mô hình thật thay cho mô hình tí hon")
+    args = parser.parse_args()
+    print(json.dumps(run(args.articles, args.latency, args.budget, args.model), ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark parse: throughput của extract_news() trên fixture của sáu nguồn
+
+Baseline "html.parser (full tree)" tương đương cách làm cũ: dựng cây
+BeautifulSoup của cả trang rồi mới tìm các khối bài viết. Phần "pool" đo
+pages/sec của bước parse trong ProcessPoolExecutor với 1, 2, 4 và N worker.
+
+Fixture là trang tổng hợp do benchmarks/fixtures.py sinh theo selector của
+crawler, không phải trang tải từ báo thật: kết quả so sánh tốc độ các
+backend, không chứng minh selector còn khớp với trang thật.
+
+    python benchmarks/bench_parse.py --repeat 20 --backend html.parser
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.fixtures import load_fixture
+from data.news_crawler import get_crawlers, parse_page_worker
+from data.parsers import ParserBackend, SoupBackend, create_parser, get_parser
+
+def available_backends() -> List[ParserBackend]:
+    backends = [SoupBackend('html.parser', strain=False), SoupBackend('html.parser')]
+    for name in ("lxml", "selectolax"):
+        try:
+            backend = create_parser(name)
+            backend.iter_articles("<html></html>", "div", "a", "p")
+            backends.append(backend)
+        except Exception:
+            pass
+    return backends
+
+def run(repeat: int = 20) -> Dict:
+    results = {}
+    for crawler in get_crawlers():
+        name = crawler.__class__.__name__
+        html = load_fixture(name)
+        site = {"bytes": len(html.encode("utf-8"))}
+        for backend in available_backends():
+            crawler.parser = backend
+            items = len(crawler.extract_news(html, "thời sự"))
+            start = time.perf_counter()
+            for _ in range(repeat):
+                crawler.extract_news(html, "thời sự")
+            elapsed = time.perf_counter() - start
+            site[backend.name] = {
+                "items": items,
+                "ms_per_page": elapsed / repeat * 1000,
+                "pages_per_sec": repeat / elapsed,
+                "mb_per_sec": site["bytes"] * repeat / elapsed / 1e6,
+            }
+        results[name] = site
+    return results
+
+def worker_counts() -> List[int]:
+    return sorted({1, 2, 4, os.cpu_count() or 1})
+
+def run_pool(backend: Optional[str] = None, copies: int = 8) -> Dict:
+    """pages/sec của bước parse trong process pool theo số worker"""
+    parser = create_parser(backend) if backend else get_parser()
+    pages = []
+    for crawler in get_crawlers():
+        body = load_fixture(crawler.__class__.__name__).encode("utf-8")
+        pages.extend([(type(crawler), parser, body, "utf-8", "thời sự")] * copies)
+
+    results = {"backend": parser.name, "pages": len(pages)}
+    for workers in worker_counts():
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Khởi động worker trước khi đo
+            list(pool.map(parse_page_worker, *zip(*pages[:workers])))
+            start = time.perf_counter()
+            items = sum(len(r) for r in pool.map(parse_page_worker, *zip(*pages)))
+            elapsed = time.perf_counter() - start
+        results[str(workers)] = {
+            "items": items,
+            "seconds": elapsed,
+            "pages_per_sec": len(pages) / elapsed,
+        }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="Số lần parse mỗi trang")
+    parser.add_argument("--backend", default=None, help="Backend dùng cho phần đo process pool")
+    args = parser.parse_args()
+    results = {"backends": run(args.repeat), "pool": run_pool(args.backend)}
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
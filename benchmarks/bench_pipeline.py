@@ -0,0 +1,115 @@
+"""Benchmark pipeline: crawl rồi mới tóm tắt (theo pha) so với streaming
+
+Mỗi nguồn được phục vụ bởi một stub server với độ trễ khác nhau (nguồn
+chậm nhất chậm gấp 6 lần nguồn nhanh nhất); mô hình tóm tắt được thay bằng
+SimulatedSummarizer có chi phí cố định mỗi batch cộng chi phí mỗi bài, để
+đo cấu trúc pipeline chứ không phải tốc độ mô hình. Đo thời gian tới bản
+tóm tắt đầu tiên được ghi vào kho, thời gian cả chu kỳ và kích thước hàng
+đợi lớn nhất.
+
+    python benchmarks/bench_pipeline.py --latency 0.2 --per-article 0.002
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from typing import Dict, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.bench_crawl import _page_renderer, _point_to_stub
+from benchmarks.stub_server import StubServer
+from data.news_crawler import NewsCrawler, crawl_all_news_async, get_crawlers
+from data.storage import NewsStorage
+from models.summarizer import build_text
+from pipeline.streaming import StreamingPipeline
+
+class SimulatedSummarizer:
+    """Thay cho mô hình: mỗi batch tốn per_batch + per_article * len(texts) giây"""
+
+    def __init__(self, per_batch: float, per_article: float):
+        self.per_batch = per_batch
+        self.per_article = per_article
+
+    def process_batch(self, texts: List[str]) -> List[str]:
+        time.sleep(self.per_batch + self.per_article * len(texts))
+        return [text[:100] for text in texts]
+
+def run_phased(crawlers: List[NewsCrawler], storage: NewsStorage, summarizer, batch_size: int) -> Dict:
+    """Cách cũ: crawl hết mọi nguồn, ghi kho, rồi mới tóm tắt"""
+    start = time.perf_counter()
+    all_news = asyncio.run(crawl_all_news_async(crawlers, parse_workers=0))
+    storage.upsert_articles(all_news)
+    pending = storage.pending_summaries()
+    first = None
+    for i in range(0, len(pending), batch_size):
+        chunk = pending[i:i + batch_size]
+        storage.save_summaries(list(zip(chunk, summarizer.process_batch([build_text(n) for n in chunk]))))
+        if first is None:
+            first = time.perf_counter() - start
+    return {
+        "first_summary_seconds": first,
+        "seconds": time.perf_counter() - start,
+        "crawled": len(all_news),
+        "summarized": len(pending),
+        "max_queue": len(all_news),
+    }
+
+def run_streaming(
+    crawlers: List[NewsCrawler],
+    storage: NewsStorage,
+    summarizer,
+    batch_size: int,
+    queue_size: int
+) -> Dict:
+    pipeline = StreamingPipeline(storage, summarizer, queue_size=queue_size, batch_size=batch_size)
+    return dict(asyncio.run(pipeline.run_async(crawlers, parse_workers=0)))
+
+def run(
+    latency: float = 0.2,
+    per_batch: float = 0.05,
+    per_article: float = 0.002,
+    batch_size: int = 32,
+    queue_size: int = 256
+) -> Dict:
+    summarizer = SimulatedSummarizer(per_batch, per_article)
+    results = {"latency_s": latency, "per_batch_s": per_batch, "per_article_s": per_article}
+    with ExitStack() as stack, tempfile.TemporaryDirectory() as tmp:
+        crawlers = []
+        for i, crawler in enumerate(get_crawlers()):
+            server = stack.enter_context(
+                StubServer(_page_renderer(crawler.__class__.__name__), latency=latency * (1 + i))
+            )
+            crawlers.append(_point_to_stub(crawler, server.base_url))
+
+        for name in ("phased", "streaming"):
+            storage = NewsStorage(os.path.join(tmp, f"{name}.sqlite"))
+            try:
+                if name == "phased":
+                    results[name] = run_phased(crawlers, storage, summarizer, batch_size)
+                else:
+                    results[name] = run_streaming(crawlers, storage, summarizer, batch_size, queue_size)
+            finally:
+                storage.close()
+
+    phased, streaming = results["phased"], results["streaming"]
+    results["first_summary_speedup"] = phased["first_summary_seconds"] / streaming["first_summary_seconds"]
+    results["cycle_speedup"] = phased["seconds"] / streaming["seconds"]
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.2, help="Độ trễ mỗi trang của nguồn nhanh nhất (giây)")
+    parser.add_argument("--per-batch", type=float, default=0.05, help="Chi phí cố định mỗi batch tóm tắt (giây)")
+    parser.add_argument("--per-article", type=float, default=0.002, help="Chi phí tóm tắt mỗi bài (giây)")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--queue-size", type=int, default=256)
+    args = parser.parse_args()
+    results = run(args.latency, args.per_batch, args.per_article, args.batch_size, args.queue_size)
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
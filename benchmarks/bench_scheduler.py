@@ -0,0 +1,130 @@
+"""Benchmark lịch crawl: vòng lặp cố định 30 phút so với scheduler tự điều chỉnh
+
+Mô phỏng theo thời gian ảo (không có mạng) một ngày ra tin của 42 feed:
+mỗi category có tốc độ ra tin riêng (tiến trình Poisson), trang category
+chỉ hiện page_size tin mới nhất. Chính sách cố định tải mọi feed mỗi 30
+phút; chính sách thích ứng dùng FeedScheduler.observe() để chọn lịch.
+Đo tổng số request, độ trễ từ lúc tin ra đến lúc được tải (độ tươi) theo
+category và số tin bị trôi khỏi trang trước khi kịp tải.
+
+    python benchmarks/bench_scheduler.py --hours 24
+"""
+import argparse
+import bisect
+import json
+import os
+import random
+import statistics
+import sys
+from typing import Dict, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data.news_crawler import get_crawlers
+from pipeline.scheduler import Feed, FeedScheduler
+
+# Số tin mới mỗi giờ của một category ở một nguồn
+RATES_PER_HOUR = {
+    "thời sự": 20.0,
+    "thế giới": 10.0,
+    "kinh doanh": 6.0,
+    "thể thao": 6.0,
+    "giải trí": 4.0,
+    "giáo dục": 1.0,
+    "khoa học": 0.5,
+}
+HOT_CATEGORIES = ("thời sự", "thế giới")
+
+def publish_times(rate_per_hour: float, seconds: float, rng: random.Random) -> List[float]:
+    times, t = [], 0.0
+    while True:
+        t += rng.expovariate(rate_per_hour / 3600)
+        if t > seconds:
+            return times
+        times.append(t)
+
+class SimulatedFeed:
+    """Trang category ảo: page_size link mới nhất tại thời điểm t"""
+
+    def __init__(self, feed: Feed, times: List[float], page_size: int):
+        self.feed = feed
+        self.times = times
+        self.page_size = page_size
+        self.picked: Dict[int, float] = {}
+        self.last_poll = 0.0
+
+    def page(self, now: float) -> List[str]:
+        self.last_poll = now
+        end = bisect.bisect_right(self.times, now)
+        visible = range(max(0, end - self.page_size), end)
+        for i in visible:
+            self.picked.setdefault(i, now)
+        return [f"https://sim.example.vn/{self.feed.key}/{i}" for i in visible]
+
+    def delays(self) -> List[float]:
+        return [self.picked[i] - self.times[i] for i in self.picked]
+
+    def missed(self) -> int:
+        """Tin đã trôi khỏi trang trước lần tải kế tiếp (không tính tin ra sau lần tải cuối)"""
+        return bisect.bisect_right(self.times, self.last_poll) - len(self.picked)
+
+def simulate(adaptive: bool, hours: float, page_size: int, seed: int) -> Dict:
+    seconds = hours * 3600
+    scheduler = FeedScheduler(seed=seed)
+    rng = random.Random(seed)
+    feeds = [
+        SimulatedFeed(feed, publish_times(RATES_PER_HOUR[feed.category], seconds, rng), page_size)
+        for feed in scheduler.feeds
+    ]
+    # Mọi feed tải lần đầu lệch nhau trong vài giây như khi khởi động thật
+    for sim in feeds:
+        sim.feed.next_due = rng.uniform(0, 60)
+
+    requests = 0
+    while True:
+        sim = min(feeds, key=lambda s: s.feed.next_due)
+        now = sim.feed.next_due
+        if now > seconds:
+            break
+        requests += 1
+        links = sim.page(now)
+        if adaptive:
+            scheduler.observe(sim.feed, links, now)
+        else:
+            sim.feed.next_due = now + scheduler.initial_interval
+
+    by_category: Dict[str, List[float]] = {}
+    for sim in feeds:
+        by_category.setdefault(sim.feed.category, []).extend(sim.delays())
+    hot = [delay for category in HOT_CATEGORIES for delay in by_category[category]]
+    return {
+        "requests": requests,
+        "missed": sum(sim.missed() for sim in feeds),
+        "hot_mean_delay_min": statistics.mean(hot) / 60,
+        "hot_p90_delay_min": sorted(hot)[int(0.9 * (len(hot) - 1))] / 60,
+        "mean_delay_min": {
+            category: statistics.mean(delays) / 60 for category, delays in by_category.items() if delays
+        },
+    }
+
+def run(hours: float = 24, page_size: int = 40, seed: int = 0) -> Dict:
+    fixed = simulate(False, hours, page_size, seed)
+    adaptive = simulate(True, hours, page_size, seed)
+    return {
+        "hours": hours,
+        "feeds": sum(len(crawler.get_category_urls()) for crawler in get_crawlers()),
+        "fixed_30min": fixed,
+        "adaptive": adaptive,
+        "request_reduction": 1 - adaptive["requests"] / fixed["requests"],
+        "hot_freshness_speedup": fixed["hot_mean_delay_min"] / adaptive["hot_mean_delay_min"],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, default=24)
+    parser.add_argument("--page-size", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.hours, args.page_size, args.seed), ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
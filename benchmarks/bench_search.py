@@ -0,0 +1,92 @@
+"""Benchmark tìm kiếm: chỉ mục đảo ngược (BM25) so với quét chuỗi con tuyến tính
+
+Với mỗi kích thước tập tin, đo thời gian dựng chỉ mục, độ trễ truy vấn
+p50/p99 trên một tập truy vấn (có dấu, không dấu, nhiều từ, tiền tố), thời
+gian cập nhật tăng dần khi thêm một đợt tin mới, và độ trễ của cách quét cũ.
+
+    python benchmarks/bench_search.py --sizes 1000,10000,100000
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.search_index import SearchIndex
+from benchmarks.fixtures import make_news_items
+
+QUERIES = [
+    "bão lũ miền Trung",
+    "bao lu mien trung",
+    "điểm chuẩn đại học",
+    "diem chuan dai hoc",
+    "giá vàng",
+    "ngân hàng lãi suất",
+    "đường sắt cao tốc",
+    "đội tuyển bóng đ",
+    "hội nghị thỏa thuận châu Âu",
+    "ca si",
+]
+
+def linear_search(news_list: List[Dict], query: str) -> List[Dict]:
+    """Cách tìm cũ của /news: chuỗi con không phân biệt hoa thường"""
+    query = query.lower()
+    return [
+        news for news in news_list
+        if query in news["title"].lower()
+        or (news.get("description", "") and query in news["description"].lower())
+    ]
+
+def _latencies(search, repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        for query in QUERIES:
+            start = time.perf_counter()
+            search(query)
+            samples.append(time.perf_counter() - start)
+    return sorted(samples)
+
+def run_size(size: int, repeat: int = 5, batch: int = 200) -> Dict:
+    news_list = make_news_items(size)
+    index = SearchIndex()
+    start = time.perf_counter()
+    index.update(news_list)
+    build_seconds = time.perf_counter() - start
+
+    indexed = _latencies(index.search, repeat)
+    top = _latencies(lambda q: index.search(q, limit=20), repeat)
+    linear = _latencies(lambda q: linear_search(news_list, q), 1)
+
+    # Một chu kỳ mới: thêm batch tin và bỏ batch tin cũ nhất
+    new_items = make_news_items(size + batch)[size:]
+    start = time.perf_counter()
+    added, removed = index.update(news_list[batch:] + new_items)
+    update_seconds = time.perf_counter() - start
+
+    return {
+        "build_seconds": build_seconds,
+        "query_p50_ms": statistics.median(indexed) * 1000,
+        "query_p99_ms": indexed[int(0.99 * (len(indexed) - 1))] * 1000,
+        "query_top20_p50_ms": statistics.median(top) * 1000,
+        "linear_p50_ms": statistics.median(linear) * 1000,
+        "incremental_update_ms": update_seconds * 1000,
+        "incremental_added_removed": [added, removed],
+        "hits": {query: len(index.search(query)) for query in QUERIES[:4]},
+    }
+
+def run(sizes=(1000, 10000, 100000), repeat: int = 5) -> Dict:
+    return {str(size): run_size(size, repeat) for size in sizes}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+    print(json.dumps(run(sizes, args.repeat), ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
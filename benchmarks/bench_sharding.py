@@ -0,0 +1,110 @@
+"""Benchmark tóm tắt nhiều process: tìm cách chia workers x threads tốt nhất
+
+Với --cores nhân, đo process_batch() (articles/sec) của NewsSummarizer một
+process dùng tất cả các nhân (cách chạy cũ) và của ShardedSummarizer với mọi
+cách chia workers x threads = cores, kèm bộ nhớ riêng (không dùng chung với
+process chính) của mỗi worker. Mỗi cấu hình chạy trong một process mới vì
+không fork được sau khi OpenMP đã tạo nhóm luồng.
+
+Mặc định dùng mô hình BART tí hon (benchmarks/tiny_model.py); truyền --model
+để đo với mô hình thật.
+
+    python benchmarks/bench_sharding.py --cores 32 --articles 512
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.bench_summarize import make_articles
+from benchmarks.tiny_model import build_tiny_model
+
+def splits(cores: int) -> List[tuple]:
+    """Các cách chia (workers, threads) dùng đúng cores nhân"""
+    return [(workers, cores // workers) for workers in range(1, cores + 1) if cores % workers == 0]
+
+def private_mb(pid: int) -> Optional[float]:
+    """Bộ nhớ riêng (MB) của một process theo /proc (chỉ có trên Linux)"""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+    kb = sum(int(line.split()[1]) for line in lines if line.startswith(("Private_Clean:", "Private_Dirty:")))
+    return kb / 1024
+
+def _measure(model: str, workers: int, threads: int, articles: int, batch_size: int, results) -> None:
+    """Chạy trong process mới: workers = 0 là NewsSummarizer một process"""
+    import torch
+
+    from models.sharded_summarizer import ShardedSummarizer
+    from models.summarizer import NewsSummarizer
+    from models.summary_cache import SummaryCache
+
+    texts = make_articles(articles)
+    if workers:
+        summarizer = ShardedSummarizer(workers, threads, cache=SummaryCache(":memory:"), model_name=model)
+    else:
+        torch.set_num_threads(threads)
+        summarizer = NewsSummarizer(cache=SummaryCache(":memory:"), model_name=model)
+    # Làm nóng với văn bản khác để không trúng cache
+    summarizer.process_batch(make_articles(batch_size, seed=1), batch_size=batch_size)
+
+    start = time.perf_counter()
+    summarizer.process_batch(texts, batch_size=batch_size)
+    elapsed = time.perf_counter() - start
+    result = {"workers": max(workers, 1), "threads": threads, "seconds": elapsed, "articles_per_sec": articles / elapsed}
+    if workers:
+        memory = [private_mb(process.pid) for process in summarizer.processes]
+        if None not in memory:
+            result["worker_private_mb"] = sum(memory) / len(memory)
+        summarizer.close()
+    results.put(result)
+
+def measure(model: str, workers: int, threads: int, articles: int, batch_size: int, timeout: float = 1800) -> Dict:
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_measure, args=(model, workers, threads, articles, batch_size, results))
+    process.start()
+    try:
+        return results.get(timeout=timeout)
+    finally:
+        process.join(timeout=10)
+        if process.is_alive():
+            process.terminate()
+
+def run(articles: int = 256, cores: Optional[int] = None, batch_size: int = 8, model: Optional[str] = None) -> Dict:
+    model = model or build_tiny_model()
+    cores = cores or os.cpu_count() or 1
+
+    single = measure(model, 0, cores, articles, batch_size)
+    results = {f"{workers}x{threads}": measure(model, workers, threads, articles, batch_size)
+               for workers, threads in splits(cores)}
+    best = max(results, key=lambda name: results[name]["articles_per_sec"])
+    return {
+        "model": model,
+        "articles": articles,
+        "cores": cores,
+        "batch_size": batch_size,
+        "single_process": single,
+        "sharded": results,
+        "best": best,
+        "best_articles_per_sec": results[best]["articles_per_sec"],
+        "speedup": results[best]["articles_per_sec"] / single["articles_per_sec"],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=256)
+    parser.add_argument("--cores", type=int, default=None, help="Số nhân dùng (mặc định: tất cả)")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--model", default=None, help="Tên hoặc thư mục mô hình (mặc định: mô hình tí hon)")
+    args = parser.parse_args()
+    print(json.dumps(run(args.articles, args.cores, args.batch_size, args.model), ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark khởi động: thời gian import và RSS của các entry point
+
+Mỗi module được import trong một process Python mới (cold start), lặp lại
+vài lần và lấy trung vị; RSS đo ngay sau khi import xong.
+
+    python benchmarks/bench_startup.py --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = {
+    "api": "api.api",
+    "web": "web.app",
+    "crawler": "data.news_crawler",
+    "summarizer": "models.summarizer",
+}
+
+PROBE = """
+import importlib, json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+importlib.import_module({module!r})
+elapsed = time.perf_counter() - start
+rss = 0.0
+with open("/proc/self/status") as f:
+    for line in f:
+        if line.startswith("VmRSS:"):
+            rss = int(line.split()[1]) / 1024
+heavy = [name for name in ("torch", "transformers", "sklearn", "nltk") if name in sys.modules]
+print(json.dumps({{"import_seconds": elapsed, "rss_mb": rss, "heavy_modules": heavy}}))
+"""
+
+def measure(module: str) -> Dict:
+    """Import module trong process mới, trả về thời gian, RSS và các thư viện nặng đã nạp"""
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(root=ROOT_DIR, module=module)],
+        cwd=ROOT_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def run(repeat: int = 5) -> Dict:
+    results = {}
+    for name, module in ENTRY_POINTS.items():
+        samples = [measure(module) for _ in range(repeat)]
+        results[name] = {
+            "module": module,
+            "import_seconds": statistics.median(s["import_seconds"] for s in samples),
+            "rss_mb": statistics.median(s["rss_mb"] for s in samples),
+            "heavy_modules": samples[-1]["heavy_modules"],
+        }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.repeat), ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark tóm tắt trên CPU: vòng lặp từng văn bản so với batch theo độ dài
+
+Mặc định dùng mô hình BART tí hon dựng bởi benchmarks/tiny_model.py nên
+không cần tải gì; truyền --model để đo với mô hình thật.
+
+    python benchmarks/bench_summarize.py --articles 64 --batch-size 8
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.fixtures import random_sentence
+from benchmarks.tiny_model import build_tiny_model
+from models.summarizer import NewsSummarizer
+from models.summary_cache import SummaryCache
+
+def make_articles(count: int, seed: int = 0) -> List[str]:
+    """Tiêu đề + mô tả tổng hợp với độ dài khác nhau như tin thật"""
+    rng = random.Random(seed)
+    articles = []
+    for _ in range(count):
+        title = random_sentence(rng, 8, 16)
+        description = " ".join(random_sentence(rng) for _ in range(rng.randint(1, 6)))
+        articles.append(f"{title} {description}")
+    return articles
+
+def fresh_summarizer(model: str) -> NewsSummarizer:
+    # Cache trong bộ nhớ, rỗng, để mọi văn bản đều qua mô hình
+    return NewsSummarizer(cache=SummaryCache(":memory:"), model_name=model)
+
+def _measure(summarizer: NewsSummarizer, texts: List[str], run) -> Dict:
+    prepared = [summarizer.preprocess_text(text) for text in texts]
+    input_tokens = sum(summarizer.token_lengths(prepared))
+    start = time.perf_counter()
+    summaries = run(texts)
+    elapsed = time.perf_counter() - start
+    output_tokens = sum(summarizer.token_lengths(summaries))
+    return {
+        "seconds": elapsed,
+        "articles_per_sec": len(texts) / elapsed,
+        "input_tokens_per_sec": input_tokens / elapsed,
+        "output_tokens_per_sec": output_tokens / elapsed,
+    }
+
+def run(articles: int = 64, batch_size: int = 8, model: Optional[str] = None) -> Dict:
+    model = model or build_tiny_model()
+    texts = make_articles(articles)
+
+    summarizer = fresh_summarizer(model)
+    per_text = _measure(summarizer, texts, lambda t: [summarizer.process_single_text(x) for x in t])
+
+    summarizer = fresh_summarizer(model)
+    batched = _measure(summarizer, texts, lambda t: summarizer.process_batch(t, batch_size=batch_size))
+
+    return {
+        "model": model,
+        "articles": articles,
+        "batch_size": batch_size,
+        "per_text": per_text,
+        "batched": batched,
+        "speedup": per_text["seconds"] / batched["seconds"],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--model", default=None, help="Tên hoặc thư mục mô hình (mặc định: mô hình tí hon)")
+    args = parser.parse_args()
+    print(json.dumps(run(args.articles, args.batch_size, args.model), ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
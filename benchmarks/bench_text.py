@@ -0,0 +1,146 @@
+"""Benchmark làm sạch văn bản và tách câu tiếng Việt
+
+Trên --descriptions mô tả tin tổng hợp (make_news_items(), thêm từ viết tắt,
+số, lời trích dẫn và một phần văn bản ở dạng Unicode tổ hợp như tin crawl
+thật), đo:
+
+- clean_text() cũ (NFKC + hai lượt regex) so với clean_text()/clean_texts()
+  của data/vietnamese.py, kèm kiểm tra kết quả giống hệt nhau;
+- tách câu: sent_tokenize() của nltk (punkt, nếu có dữ liệu), tách theo dấu
+  câu bằng regex (cách chia đoạn cũ của summarizer) và split_sentences();
+  kèm độ chính xác trên các câu mẫu có đáp án.
+
+    python benchmarks/bench_text.py --descriptions 100000
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+import unicodedata
+from typing import Callable, Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.fixtures import make_news_items
+from data.vietnamese import clean_text, clean_texts, split_sentences
+
+# Câu mẫu và cách tách đúng
+CASES = [
+    ("Sáng 5/3, TP. HCM ghi nhận 1.200 ca mắc. Số ca tăng 3.5% so với tuần trước.",
+     ["Sáng 5/3, TP. HCM ghi nhận 1.200 ca mắc.", "Số ca tăng 3.5% so với tuần trước."]),
+    ('PGS.TS. Nguyễn Văn An cho biết: "Tình hình ổn định. Chúng tôi sẽ theo dõi." Sau đó ông rời đi.',
+     ['PGS.TS. Nguyễn Văn An cho biết: "Tình hình ổn định. Chúng tôi sẽ theo dõi."', "Sau đó ông rời đi."]),
+    ("Giá vàng tăng mạnh... nhưng vẫn thấp hơn năm ngoái. Thị trường chờ tin mới!",
+     ["Giá vàng tăng mạnh... nhưng vẫn thấp hơn năm ngoái.", "Thị trường chờ tin mới!"]),
+    ("Ông nói: “Tôi sẽ về. Anh chờ nhé.” Chị gật đầu.",
+     ["Ông nói: “Tôi sẽ về. Anh chờ nhé.”", "Chị gật đầu."]),
+    ("Năm 2020 có nhiều biến động. 2021 khá hơn.",
+     ["Năm 2020 có nhiều biến động.", "2021 khá hơn."]),
+    ("Trụ sở đặt tại Q. 1, TP.HCM. Thông tin chi tiết có tại vnexpress.net. Hồ sơ nộp trước 30/6.",
+     ["Trụ sở đặt tại Q. 1, TP.HCM.", "Thông tin chi tiết có tại vnexpress.net.", "Hồ sơ nộp trước 30/6."]),
+    ("Vì sao giá xăng tăng? Bộ Công Thương giải thích (xem thêm tại đây). \"Giá sẽ giảm\", ông nói.",
+     ["Vì sao giá xăng tăng?", "Bộ Công Thương giải thích (xem thêm tại đây).", "\"Giá sẽ giảm\", ông nói."]),
+    ("ThS. BS. Trần Minh cho biết bệnh nhân đã ổn định. Bệnh viện tiếp tục theo dõi.",
+     ["ThS. BS. Trần Minh cho biết bệnh nhân đã ổn định.", "Bệnh viện tiếp tục theo dõi."]),
+    ("Đội tuyển thắng 2-1. HLV Kim Sang-sik hài lòng.",
+     ["Đội tuyển thắng 2-1.", "HLV Kim Sang-sik hài lòng."]),
+    ("Mưa lớn kéo dài… Nhiều tuyến phố ngập sâu.",
+     ["Mưa lớn kéo dài…", "Nhiều tuyến phố ngập sâu."]),
+    ("Lãi suất giảm 0.5 điểm phần trăm. Ngân hàng Nhà nước cho biết sẽ tiếp tục điều hành linh hoạt.",
+     ["Lãi suất giảm 0.5 điểm phần trăm.", "Ngân hàng Nhà nước cho biết sẽ tiếp tục điều hành linh hoạt."]),
+    ("Theo GS. Lê Hùng, cần thêm thời gian. Kết quả sẽ công bố vào tháng 9.",
+     ["Theo GS. Lê Hùng, cần thêm thời gian.", "Kết quả sẽ công bố vào tháng 9."]),
+]
+
+DECORATIONS = [
+    "TP. HCM ghi nhận {n}.{m:03d} ca.",
+    "PGS.TS. Nguyễn Văn An cho biết: “Tình hình ổn định. Chúng tôi sẽ theo dõi.”",
+    "Giá tăng {n},{m}% (theo số liệu sơ bộ)...",
+    "\"Chúng tôi sẽ làm rõ\", ông nói.",
+    "Q. {n}, TP.HCM có {m} điểm ngập.",
+]
+
+_LEGACY_CLEAN_RE = re.compile(r'[^\w\s\đĐơƠưƯăĂâÂêÊôÔơƠưƯáàảãạéèẻẽẹíìỉĩịóòỏõọúùủũụýỳỷỹỵÁÀẢÃẠÉÈẺẼẸÍÌỈĨỊÓÒỎÕỌÚÙỦŨỤÝỲỶỸỴ\.,!?-]')
+_LEGACY_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+
+def legacy_clean_text(text: str) -> str:
+    """clean_text() cũ của models/summarizer.py"""
+    text = unicodedata.normalize('NFKC', text)
+    text = _LEGACY_CLEAN_RE.sub(' ', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+def regex_split(text: str) -> List[str]:
+    """Tách câu cũ của NewsSummarizer.chunk_text(): sau mọi dấu . ! ? có khoảng trắng"""
+    return [sentence for sentence in _LEGACY_SENTENCE_END_RE.split(text) if sentence]
+
+def punkt_splitter() -> Optional[Callable[[str], List[str]]]:
+    """sent_tokenize của nltk nếu có sẵn dữ liệu punkt (benchmark chạy offline, không tải về)"""
+    try:
+        import nltk
+        from nltk.tokenize import sent_tokenize
+
+        nltk.data.find("tokenizers/punkt_tab")
+        return sent_tokenize
+    except (ImportError, LookupError):
+        return None
+
+def make_descriptions(count: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    descriptions = []
+    for news in make_news_items(count, seed):
+        description = news["description"]
+        if rng.random() < 0.5:
+            decoration = rng.choice(DECORATIONS).format(n=rng.randint(1, 12), m=rng.randint(0, 999))
+            description = f"{decoration} {description}"
+        if rng.random() < 0.05:
+            # Một số trang trả về chữ có dấu ở dạng tổ hợp (NFD)
+            description = unicodedata.normalize("NFD", description)
+        descriptions.append(description)
+    return descriptions
+
+def throughput(function: Callable, texts: List[str]) -> Dict:
+    start = time.perf_counter()
+    function(texts)
+    elapsed = time.perf_counter() - start
+    return {"seconds": elapsed, "texts_per_sec": len(texts) / elapsed}
+
+def run(descriptions: int = 100000, seed: int = 0) -> Dict:
+    texts = make_descriptions(descriptions, seed)
+
+    legacy = [legacy_clean_text(text) for text in texts]
+    mismatches = sum(new != old for new, old in zip(clean_texts(texts), legacy))
+    cleaning = {
+        "legacy_clean_text": throughput(lambda batch: [legacy_clean_text(text) for text in batch], texts),
+        "clean_text": throughput(lambda batch: [clean_text(text) for text in batch], texts),
+        "clean_texts": throughput(clean_texts, texts),
+        "mismatches": mismatches,
+    }
+    cleaning["speedup"] = cleaning["legacy_clean_text"]["seconds"] / cleaning["clean_texts"]["seconds"]
+
+    splitters = {"regex": regex_split, "split_sentences": split_sentences}
+    punkt = punkt_splitter()
+    if punkt is not None:
+        splitters["nltk_punkt"] = punkt
+    splitting: Dict = {}
+    for name, splitter in splitters.items():
+        result = throughput(lambda batch: [splitter(text) for text in batch], texts)
+        result["case_accuracy"] = sum(splitter(text) == expected for text, expected in CASES) / len(CASES)
+        splitting[name] = result
+    if punkt is None:
+        splitting["nltk_punkt"] = "không có dữ liệu punkt"
+    else:
+        splitting["speedup_vs_punkt"] = splitting["nltk_punkt"]["seconds"] / splitting["split_sentences"]["seconds"]
+
+    return {"descriptions": descriptions, "cleaning": cleaning, "splitting": splitting}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--descriptions", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.descriptions, args.seed), ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
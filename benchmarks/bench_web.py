@@ -0,0 +1,123 @@
+"""Benchmark trang chủ web app: ba request tuần tự cũ so với ApiClient (pool + cache ETag)
+
+Chạy api.api trong uvicorn với dữ liệu tổng hợp, thêm độ trễ nhân tạo cho
+mỗi request API (--latencies), rồi render trang chủ --pages lần từ
+--concurrency thread qua Flask test client. TTL của cache để rất ngắn
+(--ttl) để phép đo luôn bao gồm các lần revalidate với API. Báo cáo độ
+trễ trang p50/p99 và số request API trên mỗi lượt xem trang.
+
+    python benchmarks/bench_web.py --latencies 0,0.05,0.2 --pages 400
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.bench_api import _free_port, _percentile, start_server
+from benchmarks.fixtures import make_news_items, write_news_storage
+
+class SlowApi:
+    """Bọc ứng dụng ASGI: chờ delay giây trước mỗi request HTTP và đếm số request"""
+
+    def __init__(self, app):
+        self.app = app
+        self.delay = 0.0
+        self.requests = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            self.requests += 1
+            await asyncio.sleep(self.delay)
+        await self.app(scope, receive, send)
+
+def legacy_home(base_url: str) -> Callable[[], str]:
+    """Cách cũ: ba requests.get tuần tự, mỗi lần một kết nối mới, render lại mỗi lần"""
+    from flask import render_template
+
+    def home() -> str:
+        categories = requests.get(f"{base_url}/categories").json()["categories"]
+        sources = requests.get(f"{base_url}/sources").json()["sources"]
+        data = requests.get(f"{base_url}/news", params={"limit": 1000}).json()
+        last_update = datetime.fromisoformat(data["last_updated"]) if data.get("last_updated") else None
+        return render_template(
+            "index.html", news_list=data["news"], categories=categories, sources=sources, last_update=last_update
+        )
+
+    return home
+
+def measure(app, render: Callable[[], str], api: SlowApi, pages: int, concurrency: int) -> Dict:
+    def view(_) -> float:
+        start = time.perf_counter()
+        with app.test_request_context("/"):
+            render()
+        return time.perf_counter() - start
+
+    # Một lượt làm nóng (cache rỗng)
+    view(None)
+    before = api.requests
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(view, range(pages)))
+    return {
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "api_requests_per_page": (api.requests - before) / pages,
+    }
+
+def run(
+    latencies: List[float],
+    news: int = 1000,
+    pages: int = 400,
+    concurrency: int = 8,
+    ttl: float = 0.1
+) -> Dict:
+    workdir = tempfile.mkdtemp(prefix="bench_web_")
+    write_news_storage(os.path.join(workdir, "data"), make_news_items(news))
+    # API (và web app) đọc kho trong NEWS_DATA_DIR thay vì data/ của dự án
+    os.environ["NEWS_DATA_DIR"] = os.path.join(workdir, "data")
+
+    from api.api import app as api_app
+    import web.app as web_app
+    from web.api_client import ApiClient
+
+    api = SlowApi(api_app)
+    port = _free_port()
+    server = start_server(api, port)
+    base_url = f"http://127.0.0.1:{port}"
+    results = {"news": news, "pages": pages, "concurrency": concurrency, "ttl_s": ttl}
+    try:
+        for delay in latencies:
+            api.delay = delay
+            web_app.api = ApiClient(base_url, ttl=ttl)
+            web_app._rendered_home.clear()
+            results[f"api_latency_{int(delay * 1000)}ms"] = {
+                "legacy": measure(web_app.app, legacy_home(base_url), api, pages, concurrency),
+                "pooled_cached": measure(web_app.app, web_app.render_home, api, pages, concurrency),
+            }
+            web_app.api.close()
+    finally:
+        server.should_exit = True
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latencies", default="0,0.05,0.2", help="Độ trễ thêm cho mỗi request API (giây)")
+    parser.add_argument("--news", type=int, default=1000)
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--ttl", type=float, default=0.1, help="TTL cache của ApiClient (ngắn để luôn có revalidate)")
+    args = parser.parse_args()
+    latencies = [float(value) for value in args.latencies.split(",")]
+    print(json.dumps(run(latencies, args.news, args.pages, args.concurrency, args.ttl), ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""Sinh trang HTML giả lập cấu trúc của từng trang báo để chạy benchmark offline
+
+Cấu trúc thẻ được dựng từ selector trong data/news_crawler.py, không phải
+ghi lại từ trang thật, nên luôn khớp với selector hiện tại kể cả khi trang
+thật đã đổi giao diện.
+
+Các trang đã sinh được lưu trong benchmarks/fixtures/ để mọi lần benchmark
+parse trên cùng một dữ liệu; chạy lại file này để sinh lại:
+
+    python benchmarks/fixtures.py
+"""
+import itertools
+import os
+import random
+import unicodedata
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+WORDS = (
+    "chính phủ thành phố người dân kinh tế thị trường giá vàng học sinh giáo viên "
+    "bóng đá đội tuyển trận đấu khoa học công nghệ nghiên cứu bệnh viện bác sĩ "
+    "du lịch mùa hè dự án hạ tầng giao thông đường sắt cao tốc xuất khẩu nông sản "
+    "doanh nghiệp ngân hàng lãi suất tăng trưởng quốc hội đại biểu chính sách "
+    "thời tiết mưa lớn bão lũ miền Trung Hà Nội TP HCM Đà Nẵng Cần Thơ Việt Nam "
+    "thế giới Mỹ Trung Quốc Nhật Bản châu Âu hội nghị thỏa thuận điện ảnh ca sĩ "
+    "nghệ sĩ khán giả chương trình tuyển sinh đại học kỳ thi điểm chuẩn"
+).split()
+
+# Cấu trúc thẻ của từng trang, bám theo selector trong data/news_crawler.py
+SITE_TEMPLATES: Dict[str, Dict[str, str]] = {
+    "VnExpressCrawler": {
+        "base": "https://vnexpress.net",
+        "item": (
+            '<article class="item-news item-news-common">'
+            '<h3 class="title-news"><a href="https://vnexpress.net/{slug}-{id}.html" title="{title}">{title}</a></h3>'
+            '<p class="description"><a href="https://vnexpress.net/{slug}-{id}.html">{description}</a></p>'
+            '</article>'
+        ),
+        # Trang bài viết: khung nội dung và một đoạn, bám theo body_selector
+        "body": '<article class="fck_detail">{paragraphs}</article>',
+        "paragraph": '<p class="Normal">{text}</p>',
+    },
+    "TuoiTreCrawler": {
+        "base": "https://tuoitre.vn",
+        "item": (
+            '<div class="news-item box-category-item">'
+            '<a class="box-category-link-with-avatar" href="/{slug}-{id}.htm"><img src="/img/{id}.jpg"></a>'
+            '<h3 class="title-news"><a href="/{slug}-{id}.htm">{title}</a></h3>'
+            '<div class="description">{description}</div>'
+            '</div>'
+        ),
+        # Trang bài viết: khung nội dung và một đoạn, bám theo body_selector
+        "body": '<div class="detail-content afcbc-body">{paragraphs}</div>',
+        "paragraph": '<p>{text}</p>',
+    },
+    "ThanhNienCrawler": {
+        "base": "https://thanhnien.vn",
+        "item": (
+            '<article class="story">'
+            '<h2 class="story__title"><a href="/{slug}-{id}.htm">{title}</a></h2>'
+            '<div class="story__description">{description}</div>'
+            '</article>'
+        ),
+        # Trang bài viết: khung nội dung và một đoạn, bám theo body_selector
+        "body": '<div class="detail-cmain">{paragraphs}</div>',
+        "paragraph": '<p>{text}</p>',
+    },
+    "DanTriCrawler": {
+        "base": "https://dantri.com.vn",
+        "item": (
+            '<article class="article-item">'
+            '<div class="article-thumb"><a href="/{slug}-{id}.htm"><img src="/img/{id}.jpg"></a></div>'
+            '<h3 class="article-title"><a href="/{slug}-{id}.htm">{title}</a></h3>'
+            '<div class="article-excerpt">{description}</div>'
+            '</article>'
+        ),
+        # Trang bài viết: khung nội dung và một đoạn, bám theo body_selector
+        "body": '<div class="singular-content">{paragraphs}</div>',
+        "paragraph": '<p>{text}</p>',
+    },
+    "ZingNewsCrawler": {
+        "base": "https://zingnews.vn",
+        "item": (
+            '<article class="article-item">'
+            '<header class="article-header"><p class="article-title"><a href="/{slug}-post{id}.html">{title}</a></p></header>'
+            '<p class="article-summary">{description}</p>'
+            '</article>'
+        ),
+        # Trang bài viết: khung nội dung và một đoạn, bám theo body_selector
+        "body": '<div class="the-article-body">{paragraphs}</div>',
+        "paragraph": '<p>{text}</p>',
+    },
+    "VTVNewsCrawler": {
+        "base": "https://vtv.vn",
+        "item": (
+            '<div class="item-news">'
+            '<h3 class="title"><a href="/{slug}-{id}.htm">{title}</a></h3>'
+            '<div class="sapo">{description}</div>'
+            '</div>'
+        ),
+        # Trang bài viết: khung nội dung và một đoạn, bám theo body_selector
+        "body": '<div id="entry-body" class="ta-justify">{paragraphs}</div>',
+        "paragraph": '<p>{text}</p>',
+    },
+}
+
+def _syllables() -> List[str]:
+    """Các âm tiết tiếng Việt tổng hợp (phụ âm đầu + vần + thanh điệu)"""
+    onsets = "_ b c ch d đ g gi h k kh l m n ng nh ph qu r s t th tr v x".split()
+    rhymes = (
+        "a ai an ang anh ao at au ay ăn ăng âm ân ât âu e em en et ê ên êt i in inh it iêt iên "
+        "o oa oai oan ong ô ôi ông ơ ơi ơn u ua ui un ung uôi uông ươi ương ưa ưng y"
+    ).split()
+    tones = ["", "\u0300", "\u0301", "\u0309", "\u0303", "\u0323"]
+    vowels = set("aăâeêioôơuưy")
+    syllables = []
+    for onset in onsets:
+        for rhyme in rhymes:
+            for tone in tones:
+                # Dấu thanh đặt sau nguyên âm đầu tiên của vần rồi ghép lại bằng NFC
+                i = next(i for i, ch in enumerate(rhyme) if ch in vowels)
+                marked = rhyme[:i + 1] + tone + rhyme[i + 1:]
+                syllables.append(unicodedata.normalize("NFC", onset.strip("_") + marked))
+    random.Random(0).shuffle(syllables)
+    return syllables
+
+SYLLABLES = _syllables()
+# Tần suất âm tiết theo phân phối Zipf như văn bản thật
+_SYLLABLE_WEIGHTS = list(itertools.accumulate(1 / rank for rank in range(1, len(SYLLABLES) + 1)))
+
+def news_sentence(rng: random.Random, min_words: int = 8, max_words: int = 25, topic_rate: float = 0.15) -> str:
+    """Câu tổng hợp với từ vựng lớn: âm tiết theo Zipf xen các từ chủ đề trong WORDS"""
+    count = rng.randint(min_words, max_words)
+    words = rng.choices(SYLLABLES, cum_weights=_SYLLABLE_WEIGHTS, k=count)
+    for i in range(count):
+        if rng.random() < topic_rate:
+            words[i] = rng.choice(WORDS)
+    sentence = " ".join(words)
+    return sentence[0].upper() + sentence[1:] + "."
+
+def random_sentence(rng: random.Random, min_words: int = 8, max_words: int = 25) -> str:
+    """Sinh một câu tiếng Việt ngẫu nhiên"""
+    words = [rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))]
+    sentence = " ".join(words)
+    return sentence[0].upper() + sentence[1:] + "."
+
+def _noise_block(rng: random.Random) -> str:
+    """Phần HTML không chứa tin (menu, script, quảng cáo) như trang thật"""
+    links = "".join(
+        f'<li class="menu-item"><a href="/muc-{i}">{rng.choice(WORDS)}</a></li>'
+        for i in range(60)
+    )
+    script = "var ads = [" + ",".join(f'"{rng.random():.6f}"' for _ in range(400)) + "];"
+    related = "".join(
+        f'<div class="box-related"><a href="/lien-quan-{rng.randint(1, 10**6)}">'
+        f'<img src="/thumb/{i}.jpg" alt=""></a><span class="time">{rng.randint(1, 59)} phút trước</span>'
+        f'<p>{random_sentence(rng, 6, 12)}</p></div>'
+        for i in range(15)
+    )
+    return (
+        f'<nav class="main-nav"><ul>{links}</ul></nav>'
+        f'<script type="text/javascript">{script}</script>'
+        f'<aside class="sidebar">{related}</aside>'
+        f'<div class="banner"><div class="ads-slot" data-id="{rng.randint(1, 9999)}"></div></div>'
+    )
+
+def render_page(crawler_name: str, num_articles: int = 40, seed: int = 0) -> str:
+    """Sinh trang category của một nguồn với num_articles tin"""
+    template = SITE_TEMPLATES[crawler_name]
+    rng = random.Random(f"{crawler_name}-{seed}")
+    parts = [
+        '<!DOCTYPE html><html lang="vi"><head><meta charset="utf-8">',
+        f'<title>{random_sentence(rng, 4, 8)}</title>',
+        '<link rel="stylesheet" href="/static/main.css"></head><body>',
+        _noise_block(rng),
+        '<main class="container"><section class="list-news">',
+    ]
+    for i in range(num_articles):
+        title = random_sentence(rng, 8, 16).rstrip(".")
+        slug = "-".join(title.lower().split()[:8])
+        description = " ".join(random_sentence(rng) for _ in range(2))
+        parts.append(template["item"].format(
+            id=seed * 100000 + i, slug=slug, title=title, description=description
+        ))
+        if i % 10 == 9:
+            parts.append(_noise_block(rng))
+    parts.append('</section></main>')
+    parts.append(_noise_block(rng))
+    parts.append('<footer class="footer"><p>Bản quyền thuộc về tòa soạn</p></footer></body></html>')
+    return "".join(parts)
+
+def render_article(crawler_name: str, num_paragraphs: int = 12, seed: int = 0) -> str:
+    """Sinh trang bài viết của một nguồn với num_paragraphs đoạn nội dung"""
+    template = SITE_TEMPLATES[crawler_name]
+    rng = random.Random(f"{crawler_name}-article-{seed}")
+    paragraphs = "".join(
+        template["paragraph"].format(text=" ".join(news_sentence(rng) for _ in range(rng.randint(2, 5))))
+        for _ in range(num_paragraphs)
+    )
+    return (
+        '<!DOCTYPE html><html lang="vi"><head><meta charset="utf-8">'
+        f'<title>{random_sentence(rng, 4, 8)}</title></head><body>'
+        f'{_noise_block(rng)}<main class="container">'
+        f'<h1 class="title-detail">{random_sentence(rng, 8, 16)}</h1>'
+        f'<p class="description">{random_sentence(rng)}</p>'
+        f'{template["body"].format(paragraphs=paragraphs)}'
+        f'</main>{_noise_block(rng)}</body></html>'
+    )
+
+CATEGORIES = ("thời sự", "thế giới", "kinh doanh", "giải trí", "thể thao", "giáo dục", "khoa học")
+SOURCES = ("VnExpress", "Tuổi Trẻ", "Thanh Niên", "Dân Trí", "Zing News", "VTV News")
+
+def make_news_items(count: int, seed: int = 0) -> List[Dict]:
+    """Sinh count tin đã tóm tắt cùng định dạng với NewsStorage.load_news()
+
+    Tin thứ i chỉ phụ thuộc vào seed và i, nên make_news_items(n + k)[n:]
+    là k tin mới nối tiếp make_news_items(n).
+    """
+    start = datetime(2025, 3, 1)
+    items = []
+    for i in range(count):
+        rng = random.Random(f"{seed}-{i}")
+        title = news_sentence(rng, 8, 16).rstrip(".")
+        slug = "-".join(title.lower().split()[:8])
+        description = " ".join(news_sentence(rng) for _ in range(2))
+        items.append({
+            "title": title,
+            "link": f"https://tin.example.vn/{slug}-{i}.html",
+            "summary": news_sentence(rng, 20, 40),
+            "description": description,
+            "category": rng.choice(CATEGORIES),
+            "source": rng.choice(SOURCES),
+            "timestamp": (start + timedelta(seconds=i * 37)).isoformat(),
+        })
+    return items
+
+def write_news_storage(path: str, items: List[Dict]) -> None:
+    """Ghi các tin đã tóm tắt vào kho SQLite path/news.sqlite"""
+    from data.storage import NewsStorage
+
+    os.makedirs(path, exist_ok=True)
+    storage = NewsStorage(os.path.join(path, "news.sqlite"))
+    try:
+        storage.import_processed(items)
+    finally:
+        storage.close()
+
+def fixture_path(crawler_name: str) -> str:
+    return os.path.join(FIXTURE_DIR, f"{crawler_name}.html")
+
+def load_fixture(crawler_name: str) -> str:
+    """Đọc trang fixture đã lưu của một nguồn"""
+    with open(fixture_path(crawler_name), "r", encoding="utf-8") as f:
+        return f.read()
+
+def write_fixtures() -> None:
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for crawler_name in SITE_TEMPLATES:
+        with open(fixture_path(crawler_name), "w", encoding="utf-8") as f:
+            f.write(render_page(crawler_name))
+
+if __name__ == "__main__":
+    write_fixtures()
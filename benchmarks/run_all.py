@@ -0,0 +1,230 @@
+"""Chạy bộ benchmark offline và ghi kết quả JSON để so sánh giữa các commit
+
+Mỗi benchmark (hàm run() của benchmarks/bench_*.py) chạy trong một process
+riêng để không ảnh hưởng lẫn nhau (thư mục làm việc, module đã import, bộ
+nhớ). Kích thước kho tin tổng hợp (make_news_items() trong
+benchmarks/fixtures.py, tin thứ i chỉ phụ thuộc vào seed và i) chọn theo
+--scale: 1k, 10k hoặc 100k tin. Kết quả ghi vào
+benchmarks/results/<thời điểm>-<commit>.json kèm commit, trạng thái cây
+làm việc và thông tin máy; --compare so sánh hai file kết quả và liệt kê
+các chỉ số thay đổi quá --threshold.
+
+    python benchmarks/run_all.py --scale 1k
+    python benchmarks/run_all.py --scale 100k --only api,search,extractive
+    python benchmarks/run_all.py --compare benchmarks/results/a.json benchmarks/results/b.json
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+SCALES = {"1k": 1000, "10k": 10000, "100k": 100000}
+
+def suite(scale: int) -> Dict[str, Tuple[str, Dict]]:
+    """Tên benchmark -> (module, tham số của run()) ở kích thước kho scale"""
+    return {
+        # crawl() pages/sec qua stub server, tuần tự / bất đồng bộ / có cache
+        "crawl": ("benchmarks.bench_crawl", {"latency": 0.05}),
+        # Thời gian extract_news() trên fixture HTML của từng nguồn và backend
+        "parse": ("benchmarks.bench_parse", {"repeat": 10}),
+        # NewsSummarizer.process_batch() articles/sec với mô hình tí hon
+        "summarize": ("benchmarks.bench_summarize", {"articles": 64}),
+        # Tóm tắt nhiều process: các cách chia workers x threads trên số nhân của máy
+        "sharding": ("benchmarks.bench_sharding", {"articles": 128}),
+        # extract_key_sentences() từng bài và theo batch
+        "extractive": ("benchmarks.bench_extractive", {"articles": scale, "check": min(scale, 1000)}),
+        # Làm sạch văn bản và tách câu tiếng Việt
+        "text": ("benchmarks.bench_text", {"descriptions": scale}),
+        # /news p50/p99 dưới tải đồng thời
+        "api": ("benchmarks.bench_api", {"news": scale, "requests": 500, "concurrency": 16}),
+        "search": ("benchmarks.bench_search", {"sizes": [scale]}),
+        "dedup": ("benchmarks.bench_dedup", {"stories": 1000, "sizes": [scale]}),
+        "pipeline": ("benchmarks.bench_pipeline", {}),
+        "scheduler": ("benchmarks.bench_scheduler", {}),
+        "web": ("benchmarks.bench_web", {"news": min(scale, 1000), "latencies": [0.0, 0.05]}),
+        "fulltext": ("benchmarks.bench_fulltext", {}),
+        "startup": ("benchmarks.bench_startup", {}),
+    }
+
+def git_info() -> Dict:
+    def git(*args: str) -> str:
+        try:
+            return subprocess.run(
+                ["git", *args], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return ""
+
+    return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+def machine_info() -> Dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+def run_child(module: str, kwargs: Dict, out: str) -> None:
+    """Chạy trong process con: gọi module.run(**kwargs) và ghi kết quả ra file"""
+    result = importlib.import_module(module).run(**kwargs)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False)
+
+def error_line(stderr: str) -> str:
+    """Dòng ngoại lệ cuối cùng của traceback (bỏ qua các dòng thư viện in thêm sau ngoại lệ)"""
+    lines = [line.rstrip() for line in stderr.splitlines() if line.strip()]
+    for i in range(len(lines) - 1, -1, -1):
+        line = lines[i]
+        # Dòng ngoại lệ không thụt lề, dạng "TênLỗi: thông báo"; thông báo có thể nằm ở các dòng sau
+        if not line.startswith(" ") and ("Error" in line or "Exception" in line):
+            detail = [rest.strip() for rest in lines[i + 1:] if any(c.isalpha() for c in rest)]
+            return " ".join([line.strip(), *detail[:1]])
+    return lines[-1].strip() if lines else ""
+
+def run_benchmark(name: str, module: str, kwargs: Dict, timeout: float) -> Dict:
+    """Một benchmark trong process riêng; lỗi được ghi vào kết quả thay vì dừng cả bộ"""
+    fd, out = tempfile.mkstemp(prefix=f"bench_{name}_", suffix=".json")
+    os.close(fd)
+    entry: Dict = {"module": module, "params": kwargs}
+    start = time.perf_counter()
+    try:
+        process = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", module, "--kwargs", json.dumps(kwargs), "--out", out],
+            cwd=ROOT_DIR, capture_output=True, text=True, timeout=timeout
+        )
+        if process.returncode == 0:
+            with open(out, "r", encoding="utf-8") as f:
+                entry["result"] = json.load(f)
+        else:
+            entry["error"] = error_line(process.stderr) or f"mã thoát {process.returncode}"
+    except subprocess.TimeoutExpired:
+        entry["error"] = f"Quá thời gian {timeout:.0f}s"
+    finally:
+        os.remove(out)
+    entry["seconds"] = time.perf_counter() - start
+    return entry
+
+def run_suite(scale: str, only: Optional[List[str]] = None, timeout: float = 1800) -> Dict:
+    benchmarks = suite(SCALES[scale])
+    names = only or list(benchmarks)
+    unknown = [name for name in names if name not in benchmarks]
+    if unknown:
+        raise ValueError(f"Benchmark không hợp lệ: {', '.join(unknown)} (chọn trong {', '.join(benchmarks)})")
+
+    report = {
+        "created_at": datetime.now().isoformat(),
+        "scale": scale,
+        **git_info(),
+        "machine": machine_info(),
+        "benchmarks": {},
+    }
+    for name in names:
+        module, kwargs = benchmarks[name]
+        print(f"Đang chạy {name}...", flush=True)
+        entry = run_benchmark(name, module, kwargs, timeout)
+        report["benchmarks"][name] = entry
+        status = f"lỗi: {entry['error']}" if "error" in entry else "xong"
+        print(f"  {name}: {status} ({entry['seconds']:.1f}s)", flush=True)
+    return report
+
+def save_report(report: Dict, results_dir: str = RESULTS_DIR) -> str:
+    os.makedirs(results_dir, exist_ok=True)
+    stamp = datetime.fromisoformat(report["created_at"]).strftime("%Y%m%d-%H%M%S")
+    commit = (report["commit"] or "nogit")[:10] + ("-dirty" if report["dirty"] else "")
+    path = os.path.join(results_dir, f"{stamp}-{report['scale']}-{commit}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+def flatten(data, prefix: str = "") -> Iterator[Tuple[str, float]]:
+    """Các chỉ số dạng số của một kết quả, khóa nối bằng dấu chấm"""
+    if isinstance(data, dict):
+        for key, value in data.items():
+            yield from flatten(value, f"{prefix}.{key}" if prefix else str(key))
+    elif isinstance(data, (int, float)) and not isinstance(data, bool):
+        yield prefix, float(data)
+
+def higher_is_better(metric: str) -> Optional[bool]:
+    """Chiều tốt của một chỉ số theo tên; None nếu không rõ (chỉ là tham số/số đếm)"""
+    name = metric.rsplit(".", 1)[-1]
+    if "per_sec" in name or "speedup" in name or "reduction" in name or "accuracy" in name or name in ("precision", "recall"):
+        return True
+    if "seconds" in name or "ms_per" in name or name.endswith(("_ms", "_s", "_mb", "_min")) or name.endswith("bytes"):
+        return False
+    return None
+
+def compare(old_path: str, new_path: str, threshold: float = 0.1) -> List[Dict]:
+    """Các chỉ số có chiều tốt/xấu rõ ràng thay đổi quá threshold (tỉ lệ) giữa hai lần chạy"""
+    with open(old_path, "r", encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, "r", encoding="utf-8") as f:
+        new = json.load(f)
+    changes = []
+    for name, entry in new["benchmarks"].items():
+        old_entry = old["benchmarks"].get(name)
+        if old_entry is None or "result" not in old_entry or "result" not in entry:
+            continue
+        old_metrics = dict(flatten(old_entry["result"]))
+        for metric, value in flatten(entry["result"]):
+            better = higher_is_better(metric)
+            before = old_metrics.get(metric)
+            if better is None or not before:
+                continue
+            change = (value - before) / abs(before)
+            if abs(change) >= threshold:
+                changes.append({
+                    "benchmark": name,
+                    "metric": metric,
+                    "old": before,
+                    "new": value,
+                    "change": change,
+                    "regression": (change < 0) == better,
+                })
+    return sorted(changes, key=lambda item: (not item["regression"], item["benchmark"], item["metric"]))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=list(SCALES), default="1k", help="Kích thước kho tin tổng hợp")
+    parser.add_argument("--only", default=None, help="Chỉ chạy các benchmark này, ví dụ: crawl,api")
+    parser.add_argument("--timeout", type=float, default=1800, help="Thời gian tối đa mỗi benchmark (giây)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="So sánh hai file kết quả")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Ngưỡng thay đổi khi so sánh (tỉ lệ)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--kwargs", default="{}", help=argparse.SUPPRESS)
+    parser.add_argument("--out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, json.loads(args.kwargs), args.out)
+        return
+    if args.compare:
+        changes = compare(*args.compare, threshold=args.threshold)
+        for item in changes:
+            tag = "XẤU ĐI" if item["regression"] else "tốt hơn"
+            print(
+                f"[{tag}] {item['benchmark']}.{item['metric']}: "
+                f"{item['old']:.4g} -> {item['new']:.4g} ({item['change']:+.0%})"
+            )
+        if not changes:
+            print(f"Không có chỉ số nào thay đổi quá {args.threshold:.0%}")
+        # Mã thoát khác 0 khi có chỉ số xấu đi, để dùng trong CI
+        sys.exit(1 if any(item["regression"] for item in changes) else 0)
+
+    only = [name.strip() for name in args.only.split(",")] if args.only else None
+    report = run_suite(args.scale, only, args.timeout)
+    print(f"Đã ghi kết quả vào {save_report(report)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""HTTP server giả lập các trang báo trên localhost cho benchmark"""
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        time.sleep(server.latency)
+        body = server.render(self.path)
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        if server.etags and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if server.etags:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class StubServer:
+    """Một host giả lập: trả về trang do render(path) sinh ra sau latency giây"""
+
+    def __init__(self, render: Callable[[str], bytes], latency: float = 0.1, etags: bool = True):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.render = render
+        self.httpd.latency = latency
+        self.httpd.etags = etags
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StubServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def rewrite_urls(urls: Dict[str, str], base_url: str) -> Dict[str, str]:
+    """Trỏ các URL category về stub server, giữ nguyên path"""
+    rewritten = {}
+    for category, url in urls.items():
+        path = url.split("/", 3)[3] if url.count("/") >= 3 else ""
+        rewritten[category] = f"{base_url}/{path}"
+    return rewritten
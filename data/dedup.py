@@ -0,0 +1,103 @@
+"""Phát hiện tin gần trùng nhau giữa các nguồn (MinHash + LSH)
+
+Mỗi bài được biểu diễn bằng tập shingle (SHINGLE_SIZE âm tiết liên tiếp
+của tiêu đề + mô tả đã chuẩn hóa và bỏ dấu) và chữ ký MinHash NUM_PERM giá
+trị. Chữ ký được chia thành BANDS dải, mỗi dải ROWS giá trị; hai bài có ít
+nhất một dải giống hệt nhau là ứng viên; ứng viên chỉ được coi là cùng một
+câu chuyện khi là bài của nguồn khác, đăng cách nhau không quá WINDOW_HOURS
+giờ, độ tương đồng Jaccard chính xác trên tập shingle đạt THRESHOLD và các
+con số của hai bài khớp nhau (numbers_agree()). Các bài cùng cụm dùng chung
+bản tóm tắt, nên ngưỡng được đặt chặt: thà tóm tắt lại một tin trùng còn
+hơn gán bản tóm tắt của tin này cho tin khác. Nhờ
+tra cứu theo dải, mỗi bài mới chỉ so sánh với vài ứng viên thay vì toàn bộ
+kho (xem NewsStorage.upsert_articles()).
+"""
+import hashlib
+import zlib
+from typing import List, Set
+
+import numpy as np
+
+from data.vietnamese import tokenize
+
+NUM_PERM = 64
+# 32 dải x 2 hàng: cặp đạt THRESHOLD gần như chắc chắn trở thành ứng viên,
+# cặp có Jaccard 0.05 chỉ ~8%
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+# Hai âm tiết: xấp xỉ một từ tiếng Việt
+SHINGLE_SIZE = 2
+# Tin khác nhau cùng khuôn ("Giá vàng/Giá xăng hôm nay 3/3", hai vụ tai nạn ở
+# hai tỉnh) có Jaccard tới 0.5-0.6 trên tiêu đề + mô tả; chỉ gom các bản gần
+# như chép lại của cùng một tin
+THRESHOLD = 0.6
+# Kho gom cụm với cấu hình khác (lưu trong bảng meta) được gom cụm lại khi mở
+CONFIG = f"{NUM_PERM}x{BANDS}x{SHINGLE_SIZE}@{THRESHOLD}"
+# Tin định kỳ cùng khuôn của một nguồn ("Giá vàng hôm nay 1/3", "... 2/3")
+# cũng giống nhau cỡ đó; chỉ so với bài của nguồn khác đăng gần cùng lúc
+WINDOW_HOURS = 48
+
+# Họ hàm băm h(x) = (a * x + b) mod P; hệ số cố định để chữ ký lưu trong kho
+# so sánh được giữa các process và các lần chạy
+_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(20250301)
+_A = _rng.randint(1, _PRIME, size=NUM_PERM).astype(np.uint64)
+_B = _rng.randint(0, _PRIME, size=NUM_PERM).astype(np.uint64)
+
+def shingles(text: str) -> Set[str]:
+    """Các cụm SHINGLE_SIZE âm tiết liên tiếp (đã bỏ dấu)"""
+    tokens = tokenize(text)
+    if len(tokens) < SHINGLE_SIZE:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+
+def minhash(text: str) -> np.ndarray:
+    """Chữ ký MinHash (NUM_PERM số uint32) của văn bản"""
+    values = np.fromiter(
+        (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles(text)), dtype=np.uint64
+    ) % _PRIME
+    if not len(values):
+        return np.full(NUM_PERM, _PRIME, dtype=np.uint32)
+    return ((np.outer(_A, values) + _B[:, None]) % _PRIME).min(axis=1).astype(np.uint32)
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    """Độ tương đồng Jaccard chính xác của hai tập shingle"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def numbers(text: str) -> Set[str]:
+    """Các âm tiết có chữ số: ngày, giá, số người, số hiệu quốc lộ..."""
+    return {token for token in tokenize(text) if any(char.isdigit() for char in token)}
+
+def numbers_agree(a: Set[str], b: Set[str]) -> bool:
+    """Con số của bài này đều có trong bài kia (hoặc ngược lại)
+
+    Tin cùng khuôn thường chỉ khác nhau ở con số ("2 người tử vong" và "3
+    người tử vong"), đủ để Jaccard vẫn cao; bản viết lại của cùng một tin
+    giữ nguyên các con số nhưng có thể lược bớt.
+    """
+    return a <= b or b <= a
+
+def band_keys(signature: np.ndarray) -> List[int]:
+    """Khóa bucket (số nguyên 64 bit có dấu, vừa kiểu INTEGER của SQLite) của từng dải"""
+    data = signature.astype(np.uint32).tobytes()
+    width = ROWS * 4
+    return [
+        int.from_bytes(hashlib.blake2b(data[i * width:(i + 1) * width], digest_size=8).digest(), "big", signed=True)
+        for i in range(BANDS)
+    ]
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Độ tương đồng Jaccard ước lượng từ hai chữ ký"""
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+def to_bytes(signature: np.ndarray) -> bytes:
+    return signature.astype(np.uint32).tobytes()
+
+def from_bytes(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype=np.uint32)
+
+def new_cluster_id(link: str) -> str:
+    """Mã cụm mới, sinh từ link (đã chuẩn hóa) của bài đầu tiên trong cụm"""
+    return hashlib.blake2b(link.encode("utf-8"), digest_size=6).hexdigest()
@@ -0,0 +1,132 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from pipeline.metrics import counter, histogram
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Thời gian request không tính thời gian chờ giới hạn đồng thời
+FETCH_SECONDS = histogram("news_fetch_seconds", "Thời gian một request HTTP theo host", ("host",))
+FETCH_BYTES = counter("news_fetch_bytes", "Số byte body đã tải theo host", ("host",))
+FETCH_ERRORS = counter("news_fetch_errors", "Số request lỗi (mạng, timeout, HTTP >= 400) theo host", ("host",))
+
+@dataclass
+class FetchResult:
+    """Kết quả tải một URL"""
+    url: str
+    status: int = 0
+    body: bytes = b""
+    # Tên header được đưa về chữ thường
+    headers: Dict[str, str] = field(default_factory=dict)
+    encoding: Optional[str] = None
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and 200 <= self.status < 300
+
+    @property
+    def text(self) -> str:
+        return decode_body(self.body, self.encoding)
+
+def decode_body(body: bytes, encoding: Optional[str] = None) -> str:
+    return body.decode(encoding or "utf-8", errors="replace")
+
+def host_of(url: str) -> str:
+    """Lấy host của một URL"""
+    return urlsplit(url).netloc.lower()
+
+class AsyncFetcher:
+    """HTTP client bất đồng bộ dùng chung connection pool cho tất cả crawler
+
+    Giới hạn số request đồng thời toàn cục và theo từng host, mỗi request
+    có timeout riêng.
+    """
+
+    def __init__(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        max_connections: int = 32,
+        max_per_host: int = 4,
+        timeout: float = 15.0
+    ):
+        self.headers = dict(headers or DEFAULT_HEADERS)
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._global_limit: Optional[asyncio.Semaphore] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self) -> "AsyncFetcher":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def open(self) -> None:
+        if self._session is not None:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=self.max_per_host,
+            ttl_dns_cache=300
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+        self._global_limit = asyncio.Semaphore(self.max_connections)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = host_of(url)
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.max_per_host)
+        return self._host_limits[host]
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> FetchResult:
+        """Tải một URL, không ném exception mà ghi lỗi vào kết quả"""
+        if self._session is None:
+            await self.open()
+        result = FetchResult(url=url)
+        start = time.perf_counter()
+        host = host_of(url)
+        async with self._global_limit, self._host_limit(url):
+            request_start = time.perf_counter()
+            try:
+                async with self._session.get(url, headers=headers) as response:
+                    result.status = response.status
+                    result.headers = {k.lower(): v for k, v in response.headers.items()}
+                    result.body = await response.read()
+                    result.encoding = response.get_encoding() if result.body else None
+                    if response.status >= 400:
+                        result.error = f"HTTP {response.status}"
+            except asyncio.TimeoutError:
+                result.error = f"Timeout sau {self.timeout}s"
+            except aiohttp.ClientError as e:
+                result.error = str(e) or e.__class__.__name__
+            FETCH_SECONDS.observe(time.perf_counter() - request_start, host=host)
+        FETCH_BYTES.inc(len(result.body), host=host)
+        if result.error is not None:
+            FETCH_ERRORS.inc(host=host)
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    async def fetch_all(self, urls: List[str]) -> List[FetchResult]:
+        """Tải nhiều URL đồng thời, giữ nguyên thứ tự đầu vào"""
+        return await asyncio.gather(*(self.fetch(url) for url in urls))
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from data.fetcher import FetchResult
+from data.storage import default_data_dir
+
+@dataclass
+class CacheEntry:
+    """Một trang category đã tải ở chu kỳ trước"""
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body_hash: str
+    items: List[Dict]
+
+def body_digest(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+class ResponseCache:
+    """Cache response HTTP trên đĩa theo URL
+
+    Lưu ETag/Last-Modified, body đã nén và danh sách tin đã trích xuất để
+    chu kỳ sau có thể gửi conditional GET và bỏ qua bước parse khi trang
+    không thay đổi.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(default_data_dir(), "http_cache.sqlite")
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body_hash TEXT NOT NULL,
+                body BLOB NOT NULL,
+                items BLOB NOT NULL,
+                fetched_at REAL NOT NULL,
+                checked_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+        self.stats = {"not_modified": 0, "unchanged": 0, "miss": 0}
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        row = self.conn.execute(
+            "SELECT etag, last_modified, body_hash, items FROM responses WHERE url = ?",
+            (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, body_hash, items = row
+        return CacheEntry(
+            url=url,
+            etag=etag,
+            last_modified=last_modified,
+            body_hash=body_hash,
+            items=json.loads(zlib.decompress(items))
+        )
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CacheEntry]) -> Dict[str, str]:
+        """Header If-None-Match/If-Modified-Since cho lần tải lại"""
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def store(self, result: FetchResult, body_hash: str, items: List[Dict]) -> None:
+        """Lưu trang vừa tải và các tin trích xuất được"""
+        now = time.time()
+        self.conn.execute(
+            """
+            INSERT OR REPLACE INTO responses
+                (url, etag, last_modified, body_hash, body, items, fetched_at, checked_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                result.url,
+                result.headers.get("etag"),
+                result.headers.get("last-modified"),
+                body_hash,
+                zlib.compress(result.body),
+                zlib.compress(json.dumps(items, ensure_ascii=False).encode("utf-8")),
+                now,
+                now
+            )
+        )
+        self.conn.commit()
+        self.stats["miss"] += 1
+
+    def revalidated(self, result: FetchResult, not_modified: bool) -> None:
+        """Ghi nhận trang không đổi (304 hoặc cùng hash body)"""
+        self.conn.execute(
+            """
+            UPDATE responses
+            SET etag = COALESCE(?, etag),
+                last_modified = COALESCE(?, last_modified),
+                checked_at = ?
+            WHERE url = ?
+            """,
+            (
+                result.headers.get("etag"),
+                result.headers.get("last-modified"),
+                time.time(),
+                result.url
+            )
+        )
+        self.conn.commit()
+        self.stats["not_modified" if not_modified else "unchanged"] += 1
+
+    def summary(self) -> str:
+        hits = self.stats["not_modified"] + self.stats["unchanged"]
+        return (
+            f"HTTP cache: {hits} hit "
+            f"(304: {self.stats['not_modified']}, không đổi: {self.stats['unchanged']}), "
+            f"{self.stats['miss']} miss"
+        )
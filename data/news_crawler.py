@@ -1,75 +1,67 @@
-from bs4 import BeautifulSoup
-import requests
-import json
-from typing import List, Dict
+import asyncio
+import multiprocessing
+import sys
+import os
+import time
+from typing import Awaitable, Callable, List, Dict, Optional, Type
 from datetime import datetime
 from abc import ABC, abstractmethod
-import re
 from urllib.parse import urljoin
-from sklearn.feature_extraction.text import TfidfVectorizer
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+# Thêm thư mục gốc vào PYTHONPATH để import các module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data.fetcher import AsyncFetcher, FetchResult, decode_body
+from data.http_cache import ResponseCache, body_digest
+from data.parsers import ParserBackend, get_parser
+from data.storage import NewsStorage, export_enabled, open_storage
+from pipeline.metrics import CYCLE_SECONDS, counter, histogram, publish
+
+# Thời gian parse một trang (trong process pool: tính cả thời gian chờ worker rảnh)
+PARSE_SECONDS = histogram("news_parse_seconds", "Thời gian parse một trang theo nguồn", ("source", "page"))
+CRAWLED_ITEMS = counter("news_crawled_items", "Số tin trích xuất được từ trang category theo nguồn", ("source",))
+
+# Nhận tin của từng trang category ngay khi parse xong (xem pipeline/streaming.py)
+NewsSink = Callable[[List[Dict]], Awaitable[None]]
 
 class NewsCrawler(ABC):
-    """Abstract base class cho các crawler của từng trang báo"""
+    """Abstract base class cho các crawler của từng trang báo
+
+    Lớp con khai báo tên nguồn, URL gốc và selector CSS của khối bài viết,
+    link tiêu đề và mô tả; extract_news() mặc định dùng các selector này
+    với backend parse đã chọn. Lớp con vẫn có thể override extract_news().
+    body_selector chọn các đoạn nội dung trên trang bài viết, dùng cho chế
+    độ tóm tắt toàn văn (extract_body()).
+    """
+    source = ""
+    base_url = ""
+    article_selector = ""
+    title_selector = ""
+    description_selector = ""
+    body_selector = ""
     
-    def __init__(self):
+    def __init__(self, parser: Optional[ParserBackend] = None):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
+        self.parser = parser or get_parser()
 
     @abstractmethod
     def get_category_urls(self) -> Dict[str, str]:
         """Trả về dictionary của các category và URL của chúng"""
         pass
 
-    @abstractmethod
     def extract_news(self, html: str, category: str) -> List[Dict]:
         """Trích xuất tin tức từ HTML của một trang"""
-        pass
-
-    def crawl(self) -> List[Dict]:
-        """Crawl tin tức từ tất cả các category"""
-        all_news = []
-        for category, url in self.get_category_urls().items():
-            try:
-                response = requests.get(url, headers=self.headers)
-                response.raise_for_status()
-                news_items = self.extract_news(response.text, category)
-                all_news.extend(news_items)
-                print(f"Đã crawl {len(news_items)} tin từ category {category}")
-            except Exception as e:
-                print(f"Lỗi khi crawl category {category}: {str(e)}")
-        return all_news
-
-class VnExpressCrawler(NewsCrawler):
-    def get_category_urls(self) -> Dict[str, str]:
-        return {
-            "thời sự": "https://vnexpress.net/thoi-su",
-            "thế giới": "https://vnexpress.net/the-gioi",
-            "kinh doanh": "https://vnexpress.net/kinh-doanh",
-            "giải trí": "https://vnexpress.net/giai-tri",
-            "thể thao": "https://vnexpress.net/the-thao",
-            "khoa học": "https://vnexpress.net/khoa-hoc",
-            "giáo dục": "https://vnexpress.net/giao-duc"
-        }
-
-    def extract_news(self, html: str, category: str) -> List[Dict]:
-        soup = BeautifulSoup(html, 'html.parser')
         news_items = []
-        
-        for article in soup.find_all('article', class_='item-news'):
+        articles = self.parser.iter_articles(
+            html, self.article_selector, self.title_selector, self.description_selector
+        )
+        for title, href, description in articles:
             try:
-                title_tag = article.find('h3', class_='title-news')
-                if not title_tag or not title_tag.a:
+                if not href:
                     continue
-                    
-                title = title_tag.a.text.strip()
-                link = title_tag.a['href']
-                description = ""
-                
-                desc_tag = article.find('p', class_='description')
-                if desc_tag:
-                    description = desc_tag.text.strip()
+                link = urljoin(self.base_url, href)
 
                 words = description.split()
                 if len(words) > 500:
@@ -80,15 +72,160 @@ class VnExpressCrawler(NewsCrawler):
                     "link": link,
                     "description": description,
                     "category": category,
-                    "source": "VnExpress",
+                    "source": self.source,
                     "timestamp": datetime.now().isoformat()
                 })
             except Exception as e:
-                print(f"Lỗi khi xử lý một tin VnExpress: {str(e)}")
+                print(f"Lỗi khi xử lý một tin {self.source}: {str(e)}")
                 
         return news_items
 
+    def extract_body(self, html: str) -> str:
+        """Nội dung bài viết (các đoạn nối bằng khoảng trắng) từ HTML của trang bài viết"""
+        if not self.body_selector:
+            return ""
+        return " ".join(text for text in self.parser.iter_texts(html, self.body_selector) if text)
+
+    async def parse_page(self, result: FetchResult, category: str, pool: Optional[Executor] = None) -> List[Dict]:
+        """Trích xuất tin từ trang đã tải, trong process pool nếu có"""
+        with PARSE_SECONDS.time(source=self.source, page="category"):
+            if pool is None:
+                news_items = self.extract_news(result.text, category)
+            else:
+                loop = asyncio.get_running_loop()
+                news_items = await loop.run_in_executor(
+                    pool, parse_page_worker, type(self), self.parser, result.body, result.encoding, category
+                )
+        CRAWLED_ITEMS.inc(len(news_items), source=self.source)
+        return news_items
+
+    async def parse_body(self, result: FetchResult, pool: Optional[Executor] = None) -> str:
+        """Trích xuất nội dung từ trang bài viết đã tải, trong process pool nếu có"""
+        with PARSE_SECONDS.time(source=self.source, page="article"):
+            if pool is None:
+                return self.extract_body(result.text)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                pool, parse_body_worker, type(self), self.parser, result.body, result.encoding
+            )
+
+    def crawl(self, cache: Optional[ResponseCache] = None) -> List[Dict]:
+        """Crawl tin tức từ tất cả các category"""
+        return asyncio.run(self._crawl_standalone(cache))
+
+    async def _crawl_standalone(self, cache: Optional[ResponseCache]) -> List[Dict]:
+        own_cache = cache is None
+        if own_cache:
+            cache = ResponseCache()
+        try:
+            async with AsyncFetcher(headers=self.headers) as fetcher:
+                return await self.crawl_async(fetcher, cache)
+        finally:
+            if own_cache:
+                cache.close()
+
+    async def crawl_async(
+        self,
+        fetcher: AsyncFetcher,
+        cache: Optional[ResponseCache] = None,
+        pool: Optional[Executor] = None,
+        sink: Optional[NewsSink] = None
+    ) -> List[Dict]:
+        """Crawl đồng thời tất cả các category bằng fetcher dùng chung"""
+        results = await asyncio.gather(*(
+            self.crawl_category(fetcher, category, url, cache, pool, sink)
+            for category, url in self.get_category_urls().items()
+        ))
+        all_news = []
+        for news_items in results:
+            all_news.extend(news_items)
+        return all_news
+
+    async def crawl_category(
+        self,
+        fetcher: AsyncFetcher,
+        category: str,
+        url: str,
+        cache: Optional[ResponseCache] = None,
+        pool: Optional[Executor] = None,
+        sink: Optional[NewsSink] = None
+    ) -> List[Dict]:
+        """Tải và trích xuất tin tức của một category
+
+        Nếu có cache, gửi conditional GET và trả lại tin của lần trước mà
+        không parse khi trang không thay đổi (304 hoặc cùng hash body).
+        Bước parse chạy trong pool (nếu có) để không chặn event loop.
+        Nếu có sink, tin được đẩy vào sink (chờ khi sink đầy) thay vì trả về.
+        """
+        news_items = await self._fetch_category(fetcher, category, url, cache, pool)
+        if sink is None:
+            return news_items
+        if news_items:
+            await sink(news_items)
+        return []
+
+    async def _fetch_category(
+        self,
+        fetcher: AsyncFetcher,
+        category: str,
+        url: str,
+        cache: Optional[ResponseCache],
+        pool: Optional[Executor]
+    ) -> List[Dict]:
+        entry = cache.get(url) if cache is not None else None
+        result = await fetcher.fetch(url, headers=ResponseCache.conditional_headers(entry))
+
+        if entry is not None and result.status == 304:
+            cache.revalidated(result, not_modified=True)
+            print(f"Category {category} không thay đổi (304), dùng lại {len(entry.items)} tin")
+            return entry.items
+        if not result.ok:
+            print(f"Lỗi khi crawl category {category}: {result.error}")
+            return []
+
+        body_hash = body_digest(result.body)
+        if entry is not None and entry.body_hash == body_hash:
+            cache.revalidated(result, not_modified=False)
+            print(f"Category {category} không thay đổi, dùng lại {len(entry.items)} tin")
+            return entry.items
+
+        try:
+            news_items = await self.parse_page(result, category, pool)
+        except Exception as e:
+            print(f"Lỗi khi crawl category {category}: {str(e)}")
+            return []
+        if cache is not None:
+            cache.store(result, body_hash, news_items)
+        print(f"Đã crawl {len(news_items)} tin từ category {category}")
+        return news_items
+
+class VnExpressCrawler(NewsCrawler):
+    source = "VnExpress"
+    base_url = "https://vnexpress.net"
+    article_selector = "article.item-news"
+    title_selector = "h3.title-news a"
+    description_selector = "p.description"
+    body_selector = "article.fck_detail p.Normal"
+
+    def get_category_urls(self) -> Dict[str, str]:
+        return {
+            "thời sự": "https://vnexpress.net/thoi-su",
+            "thế giới": "https://vnexpress.net/the-gioi",
+            "kinh doanh": "https://vnexpress.net/kinh-doanh",
+            "giải trí": "https://vnexpress.net/giai-tri",
+            "thể thao": "https://vnexpress.net/the-thao",
+            "khoa học": "https://vnexpress.net/khoa-hoc",
+            "giáo dục": "https://vnexpress.net/giao-duc"
+        }
+
 class TuoiTreCrawler(NewsCrawler):
+    source = "Tuổi Trẻ"
+    base_url = "https://tuoitre.vn"
+    article_selector = "div.news-item"
+    title_selector = "h3.title-news a"
+    description_selector = "div.description"
+    body_selector = "div.detail-content p"
+
     def get_category_urls(self) -> Dict[str, str]:
         return {
             "thời sự": "https://tuoitre.vn/thoi-su.htm",
@@ -100,42 +237,14 @@ class TuoiTreCrawler(NewsCrawler):
             "giáo dục": "https://tuoitre.vn/giao-duc.htm"
         }
 
-    def extract_news(self, html: str, category: str) -> List[Dict]:
-        soup = BeautifulSoup(html, 'html.parser')
-        news_items = []
-        
-        for article in soup.find_all('div', class_='news-item'):
-            try:
-                title_tag = article.find('h3', class_='title-news')
-                if not title_tag or not title_tag.a:
-                    continue
-                    
-                title = title_tag.a.text.strip()
-                link = urljoin("https://tuoitre.vn", title_tag.a['href'])
-                description = ""
-                
-                desc_tag = article.find('div', class_='description')
-                if desc_tag:
-                    description = desc_tag.text.strip()
-
-                words = description.split()
-                if len(words) > 500:
-                    description = ' '.join(words[:500])
-
-                news_items.append({
-                    "title": title,
-                    "link": link,
-                    "description": description,
-                    "category": category,
-                    "source": "Tuổi Trẻ",
-                    "timestamp": datetime.now().isoformat()
-                })
-            except Exception as e:
-                print(f"Lỗi khi xử lý một tin Tuổi Trẻ: {str(e)}")
-                
-        return news_items
-
 class ThanhNienCrawler(NewsCrawler):
+    source = "Thanh Niên"
+    base_url = "https://thanhnien.vn"
+    article_selector = "article.story"
+    title_selector = "h2.story__title a"
+    description_selector = "div.story__description"
+    body_selector = "div.detail-cmain p"
+
     def get_category_urls(self) -> Dict[str, str]:
         return {
             "thời sự": "https://thanhnien.vn/thoi-su/",
@@ -147,42 +256,14 @@ class ThanhNienCrawler(NewsCrawler):
             "giáo dục": "https://thanhnien.vn/giao-duc/"
         }
 
-    def extract_news(self, html: str, category: str) -> List[Dict]:
-        soup = BeautifulSoup(html, 'html.parser')
-        news_items = []
-        
-        for article in soup.find_all('article', class_='story'):
-            try:
-                title_tag = article.find('h2', class_='story__title')
-                if not title_tag or not title_tag.a:
-                    continue
-                    
-                title = title_tag.a.text.strip()
-                link = urljoin("https://thanhnien.vn", title_tag.a['href'])
-                description = ""
-                
-                desc_tag = article.find('div', class_='story__description')
-                if desc_tag:
-                    description = desc_tag.text.strip()
-
-                words = description.split()
-                if len(words) > 500:
-                    description = ' '.join(words[:500])
-
-                news_items.append({
-                    "title": title,
-                    "link": link,
-                    "description": description,
-                    "category": category,
-                    "source": "Thanh Niên",
-                    "timestamp": datetime.now().isoformat()
-                })
-            except Exception as e:
-                print(f"Lỗi khi xử lý một tin Thanh Niên: {str(e)}")
-                
-        return news_items
-
 class DanTriCrawler(NewsCrawler):
+    source = "Dân Trí"
+    base_url = "https://dantri.com.vn"
+    article_selector = "article.article-item"
+    title_selector = "h3.article-title a"
+    description_selector = "div.article-excerpt"
+    body_selector = "div.singular-content p"
+
     def get_category_urls(self) -> Dict[str, str]:
         return {
             "thời sự": "https://dantri.com.vn/xa-hoi.htm",
@@ -194,42 +275,14 @@ class DanTriCrawler(NewsCrawler):
             "giáo dục": "https://dantri.com.vn/giao-duc-huong-nghiep.htm"
         }
 
-    def extract_news(self, html: str, category: str) -> List[Dict]:
-        soup = BeautifulSoup(html, 'html.parser')
-        news_items = []
-        
-        for article in soup.find_all('article', class_='article-item'):
-            try:
-                title_tag = article.find('h3', class_='article-title')
-                if not title_tag or not title_tag.a:
-                    continue
-                    
-                title = title_tag.a.text.strip()
-                link = urljoin("https://dantri.com.vn", title_tag.a['href'])
-                description = ""
-                
-                desc_tag = article.find('div', class_='article-excerpt')
-                if desc_tag:
-                    description = desc_tag.text.strip()
-
-                words = description.split()
-                if len(words) > 500:
-                    description = ' '.join(words[:500])
-
-                news_items.append({
-                    "title": title,
-                    "link": link,
-                    "description": description,
-                    "category": category,
-                    "source": "Dân Trí",
-                    "timestamp": datetime.now().isoformat()
-                })
-            except Exception as e:
-                print(f"Lỗi khi xử lý một tin Dân Trí: {str(e)}")
-                
-        return news_items
-
 class ZingNewsCrawler(NewsCrawler):
+    source = "Zing News"
+    base_url = "https://zingnews.vn"
+    article_selector = "article.article-item"
+    title_selector = "header.article-header p a"
+    description_selector = "p.article-summary"
+    body_selector = "div.the-article-body p"
+
     def get_category_urls(self) -> Dict[str, str]:
         return {
             "thời sự": "https://zingnews.vn/thoi-su.html",
@@ -241,42 +294,14 @@ class ZingNewsCrawler(NewsCrawler):
             "giáo dục": "https://zingnews.vn/giao-duc.html"
         }
 
-    def extract_news(self, html: str, category: str) -> List[Dict]:
-        soup = BeautifulSoup(html, 'html.parser')
-        news_items = []
-        
-        for article in soup.find_all('article', class_='article-item'):
-            try:
-                title_tag = article.find('header', class_='article-header')
-                if not title_tag or not title_tag.p or not title_tag.p.a:
-                    continue
-                    
-                title = title_tag.p.a.text.strip()
-                link = urljoin("https://zingnews.vn", title_tag.p.a['href'])
-                description = ""
-                
-                desc_tag = article.find('p', class_='article-summary')
-                if desc_tag:
-                    description = desc_tag.text.strip()
-
-                words = description.split()
-                if len(words) > 500:
-                    description = ' '.join(words[:500])
-
-                news_items.append({
-                    "title": title,
-                    "link": link,
-                    "description": description,
-                    "category": category,
-                    "source": "Zing News",
-                    "timestamp": datetime.now().isoformat()
-                })
-            except Exception as e:
-                print(f"Lỗi khi xử lý một tin Zing News: {str(e)}")
-                
-        return news_items
-
 class VTVNewsCrawler(NewsCrawler):
+    source = "VTV News"
+    base_url = "https://vtv.vn"
+    article_selector = "div.item-news"
+    title_selector = "h3.title a"
+    description_selector = "div.sapo"
+    body_selector = "div#entry-body p"
+
     def get_category_urls(self) -> Dict[str, str]:
         return {
             "thời sự": "https://vtv.vn/thoi-su.htm",
@@ -288,44 +313,57 @@ class VTVNewsCrawler(NewsCrawler):
             "giáo dục": "https://vtv.vn/giao-duc.htm"
         }
 
-    def extract_news(self, html: str, category: str) -> List[Dict]:
-        soup = BeautifulSoup(html, 'html.parser')
-        news_items = []
-        
-        for article in soup.find_all('div', class_='item-news'):
-            try:
-                title_tag = article.find('h3', class_='title')
-                if not title_tag or not title_tag.a:
-                    continue
-                    
-                title = title_tag.a.text.strip()
-                link = urljoin("https://vtv.vn", title_tag.a['href'])
-                description = ""
-                
-                desc_tag = article.find('div', class_='sapo')
-                if desc_tag:
-                    description = desc_tag.text.strip()
+def parse_page_worker(
+    crawler_cls: Type[NewsCrawler],
+    parser: ParserBackend,
+    body: bytes,
+    encoding: Optional[str],
+    category: str
+) -> List[Dict]:
+    """Chạy trong process con: nhận HTML thô, trả về danh sách tin gọn"""
+    return crawler_cls(parser).extract_news(decode_body(body, encoding), category)
 
-                words = description.split()
-                if len(words) > 500:
-                    description = ' '.join(words[:500])
+def parse_body_worker(
+    crawler_cls: Type[NewsCrawler],
+    parser: ParserBackend,
+    body: bytes,
+    encoding: Optional[str]
+) -> str:
+    """Chạy trong process con: nhận HTML thô của trang bài viết, trả về nội dung"""
+    return crawler_cls(parser).extract_body(decode_body(body, encoding))
 
-                news_items.append({
-                    "title": title,
-                    "link": link,
-                    "description": description,
-                    "category": category,
-                    "source": "VTV News",
-                    "timestamp": datetime.now().isoformat()
-                })
-            except Exception as e:
-                print(f"Lỗi khi xử lý một tin VTV News: {str(e)}")
-                
-        return news_items
+def default_parse_workers() -> int:
+    """Số process parse: biến môi trường CRAWL_PARSE_WORKERS hoặc số nhân CPU"""
+    value = os.environ.get("CRAWL_PARSE_WORKERS")
+    if value:
+        return int(value)
+    return os.cpu_count() or 1
 
-def crawl_all_news():
-    """Crawl tin tức từ tất cả các nguồn"""
-    crawlers = [
+def parse_pool(parse_workers: int) -> Optional[ProcessPoolExecutor]:
+    """Process pool để parse trang (None nếu parse_workers = 0)
+
+    Không fork từ process hiện tại: process chạy crawler có thể đã tải mô hình
+    tóm tắt và có các luồng (torch, sqlite, asyncio) mà process con fork ra sẽ
+    kế thừa ở trạng thái khóa. Worker được tạo qua forkserver (spawn nếu
+    không có), chỉ import các module parse.
+    """
+    if parse_workers <= 0:
+        return None
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    return ProcessPoolExecutor(max_workers=parse_workers, mp_context=context)
+
+def full_article_enabled() -> bool:
+    """Có tải trang bài viết để tóm tắt toàn văn không (NEWS_FULL_ARTICLE)"""
+    return os.environ.get("NEWS_FULL_ARTICLE", "") not in ("", "0")
+
+def full_article_budget() -> float:
+    """Số giây tối đa mỗi chu kỳ dành cho tải và tóm tắt toàn văn (NEWS_FULL_ARTICLE_BUDGET)"""
+    return float(os.environ.get("NEWS_FULL_ARTICLE_BUDGET", "300"))
+
+def get_crawlers() -> List[NewsCrawler]:
+    """Danh sách crawler của tất cả các nguồn"""
+    return [
         VnExpressCrawler(),
         TuoiTreCrawler(),
         ThanhNienCrawler(),
@@ -333,35 +371,121 @@ def crawl_all_news():
         ZingNewsCrawler(),
         VTVNewsCrawler()
     ]
-    
+
+async def crawl_all_news_async(
+    crawlers: List[NewsCrawler],
+    cache: Optional[ResponseCache] = None,
+    parse_workers: Optional[int] = None,
+    max_connections: int = 32,
+    max_per_host: int = 4,
+    timeout: float = 15.0,
+    sink: Optional[NewsSink] = None
+) -> List[Dict]:
+    """Crawl đồng thời tất cả các nguồn qua một connection pool dùng chung
+
+    Thời gian của cả chu kỳ bị chặn bởi host chậm nhất thay vì tổng độ trễ
+    của từng trang. Các trang đã tải được parse trong ProcessPoolExecutor
+    với parse_workers process (mặc định theo default_parse_workers(); 0 để
+    parse ngay trong event loop). Nếu có sink, tin của mỗi trang được đẩy
+    vào sink ngay khi parse xong và kết quả trả về là danh sách rỗng.
+    """
+    if parse_workers is None:
+        parse_workers = default_parse_workers()
+    pool = parse_pool(parse_workers)
+    try:
+        async with AsyncFetcher(
+            max_connections=max_connections,
+            max_per_host=max_per_host,
+            timeout=timeout
+        ) as fetcher:
+            results = await asyncio.gather(
+                *(crawler.crawl_async(fetcher, cache, pool, sink) for crawler in crawlers),
+                return_exceptions=True
+            )
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
     all_news = []
-    for crawler in crawlers:
+    for crawler, news in zip(crawlers, results):
+        if isinstance(news, Exception):
+            print(f"Lỗi khi crawl từ {crawler.__class__.__name__}: {str(news)}")
+            continue
+        all_news.extend(news)
+    return all_news
+
+async def fetch_article_bodies(
+    news_list: List[Dict],
+    fetcher: AsyncFetcher,
+    crawlers: Optional[List[NewsCrawler]] = None,
+    pool: Optional[Executor] = None,
+    deadline: Optional[float] = None
+) -> int:
+    """Tải đồng thời trang bài viết của các tin và ghi nội dung vào news["body"]
+
+    Số request đồng thời tới mỗi host bị giới hạn bởi fetcher. Tin của
+    nguồn không có body_selector, tin tải lỗi và tin chưa kịp tải trước
+    deadline (time.monotonic()) giữ nguyên, chỉ dùng tiêu đề và mô tả.
+    Trả về số tin đã lấy được nội dung.
+    """
+    by_source = {crawler.source: crawler for crawler in (crawlers if crawlers is not None else get_crawlers())}
+
+    async def fetch_body(news: Dict) -> bool:
+        crawler = by_source.get(news["source"])
+        if crawler is None or not crawler.body_selector:
+            return False
+        if deadline is not None and time.monotonic() >= deadline:
+            return False
+        result = await fetcher.fetch(news["link"])
+        if not result.ok:
+            print(f"Lỗi khi tải bài {news['link']}: {result.error}")
+            return False
         try:
-            news = crawler.crawl()
-            all_news.extend(news)
+            body = await crawler.parse_body(result, pool)
         except Exception as e:
-            print(f"Lỗi khi crawl từ {crawler.__class__.__name__}: {str(e)}")
-    
-    # Lưu tin tức theo từng category
+            print(f"Lỗi khi trích xuất nội dung {news['link']}: {str(e)}")
+            return False
+        if not body:
+            return False
+        news["body"] = body
+        return True
+
+    return sum(await asyncio.gather(*(fetch_body(news) for news in news_list)))
+
+def save_news(all_news: List[Dict], storage: NewsStorage) -> Dict[str, List[Dict]]:
+    """Lưu tin tức vào kho (một transaction) và xuất file JSON nếu được bật"""
     news_by_category = {}
     for item in all_news:
-        category = item["category"]
-        if category not in news_by_category:
-            news_by_category[category] = []
-        news_by_category[category].append(item)
-    
-    # Lưu tin tức vào các file riêng biệt theo category
-    for category, news in news_by_category.items():
-        filename = f"data/raw_news_{category.replace(' ', '_')}.json"
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(news, f, ensure_ascii=False, indent=2)
-    
-    # Lưu tất cả tin tức vào một file
-    with open("data/raw_news.json", "w", encoding="utf-8") as f:
-        json.dump(all_news, f, ensure_ascii=False, indent=2)
+        news_by_category.setdefault(item["category"], []).append(item)
+
+    inserted, changed = storage.upsert_articles(all_news)
+    print(f"Đã lưu vào kho: {inserted} bài mới, {changed} bài đổi nội dung")
+    if export_enabled():
+        storage.export_json()
+
+    return news_by_category
+
+def crawl_all_news():
+    """Crawl tin tức từ tất cả các nguồn"""
+    started = time.perf_counter()
+    crawlers = get_crawlers()
+    cache = ResponseCache()
+    try:
+        all_news = asyncio.run(crawl_all_news_async(crawlers, cache))
+    finally:
+        cache.close()
+    storage = open_storage()
+    try:
+        news_by_category = save_news(all_news, storage)
+        CYCLE_SECONDS.observe(time.perf_counter() - started, mode="crawl")
+        # Process này không có HTTP server: ghi chỉ số vào kho cho /metrics của API
+        publish(storage, "crawler")
+    finally:
+        storage.close()
     
     print(f"Đã crawl tổng cộng {len(all_news)} tin tức từ {len(crawlers)} nguồn")
     print(f"Phân loại theo category: {', '.join(news_by_category.keys())}")
+    print(cache.summary())
 
 if __name__ == "__main__":
-    crawl_all_news() 
\ No newline at end of file
+    crawl_all_news()
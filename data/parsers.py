@@ -0,0 +1,150 @@
+"""Backend parse HTML cho các crawler
+
+Mỗi crawler khai báo selector CSS của khối bài viết, link tiêu đề và mô tả
+(trang category) và của các đoạn nội dung (trang bài viết). Backend chỉ
+parse/duyệt các khối đó thay vì dựng cây của cả trang:
+selectolax (nhanh nhất), BeautifulSoup + lxml, hoặc BeautifulSoup +
+html.parser làm phương án dự phòng khi không có thư viện nào khác.
+"""
+import os
+import re
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Iterator, Optional, Tuple
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# (tiêu đề, href, mô tả) của một bài viết
+ArticleFields = Tuple[str, Optional[str], str]
+
+_SIMPLE_SELECTOR = re.compile(r'^([a-zA-Z][\w-]*)?((?:\.[\w-]+)*)$')
+
+def strainer_for(selector: str) -> Optional[SoupStrainer]:
+    """Tạo SoupStrainer cho selector dạng "tag.class" (None nếu selector phức tạp hơn)"""
+    match = _SIMPLE_SELECTOR.match(selector.strip())
+    if not match:
+        return None
+    name, classes = match.groups()
+    classes = [c for c in classes.split('.') if c]
+    if len(classes) > 1:
+        return None
+    if classes:
+        return SoupStrainer(name or True, class_=_has_class(classes[0]))
+    return SoupStrainer(name)
+
+def _has_class(class_name: str):
+    # Khi lọc trong lúc parse, thuộc tính class vẫn là chuỗi thô chưa tách,
+    # nên so khớp từng class thay vì cả chuỗi
+    def match(value) -> bool:
+        if not value:
+            return False
+        classes = value.split() if isinstance(value, str) else value
+        return class_name in classes
+    return match
+
+class ParserBackend(ABC):
+    """Giao diện chung: duyệt các khối bài viết và lấy ra các trường cần thiết"""
+    name = "base"
+
+    @abstractmethod
+    def iter_articles(
+        self,
+        html: str,
+        article_selector: str,
+        title_selector: str,
+        description_selector: str
+    ) -> Iterator[ArticleFields]:
+        """(tiêu đề, href, mô tả) của từng khối bài viết, theo thứ tự trong trang"""
+        pass
+
+    @abstractmethod
+    def iter_texts(self, html: str, selector: str) -> Iterator[str]:
+        """Văn bản (đã bỏ khoảng trắng hai đầu) của các thẻ khớp selector, theo thứ tự trong trang"""
+        pass
+
+class SoupBackend(ParserBackend):
+    """BeautifulSoup, chỉ giữ lại các khối bài viết nhờ SoupStrainer"""
+
+    def __init__(self, features: str = 'html.parser', strain: bool = True):
+        self.features = features
+        self.strain = strain
+        self.name = features if strain else f"{features} (full tree)"
+
+    def iter_articles(self, html, article_selector, title_selector, description_selector):
+        parse_only = strainer_for(article_selector) if self.strain else None
+        soup = BeautifulSoup(html, self.features, parse_only=parse_only)
+        for article in soup.select(article_selector):
+            title_tag = article.select_one(title_selector)
+            if title_tag is None:
+                continue
+            desc_tag = article.select_one(description_selector)
+            yield (
+                title_tag.get_text().strip(),
+                title_tag.get('href'),
+                desc_tag.get_text().strip() if desc_tag is not None else ""
+            )
+
+    def iter_texts(self, html, selector):
+        # Chỉ giữ khối chứa (phần đầu của selector), ví dụ "article.fck_detail"
+        parse_only = strainer_for(selector.split()[0]) if self.strain else None
+        soup = BeautifulSoup(html, self.features, parse_only=parse_only)
+        for tag in soup.select(selector):
+            yield tag.get_text().strip()
+
+class SelectolaxBackend(ParserBackend):
+    """selectolax (lexbor) với selector CSS biên dịch sẵn trong C"""
+    name = "selectolax"
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser = LexborHTMLParser
+
+    def iter_articles(self, html, article_selector, title_selector, description_selector):
+        tree = self._parser(html)
+        for article in tree.css(article_selector):
+            title_tag = article.css_first(title_selector)
+            if title_tag is None:
+                continue
+            desc_tag = article.css_first(description_selector)
+            yield (
+                title_tag.text().strip(),
+                title_tag.attributes.get('href'),
+                desc_tag.text().strip() if desc_tag is not None else ""
+            )
+
+    def iter_texts(self, html, selector):
+        for tag in self._parser(html).css(selector):
+            yield tag.text().strip()
+
+def _lxml_available() -> bool:
+    try:
+        import lxml  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def create_parser(name: str) -> ParserBackend:
+    """Tạo backend theo tên: selectolax, lxml hoặc html.parser"""
+    if name == "selectolax":
+        return SelectolaxBackend()
+    if name in ("lxml", "html.parser"):
+        return SoupBackend(name)
+    raise ValueError(f"Backend parse không hợp lệ: {name}")
+
+@lru_cache(maxsize=None)
+def get_parser(name: Optional[str] = None) -> ParserBackend:
+    """Backend parse mặc định
+
+    Đọc tên từ tham số hoặc biến môi trường NEWS_PARSER; nếu không chỉ định
+    thì chọn backend nhanh nhất đang cài đặt.
+    """
+    name = name or os.environ.get("NEWS_PARSER")
+    if name:
+        return create_parser(name)
+    try:
+        return SelectolaxBackend()
+    except ImportError:
+        pass
+    if _lxml_available():
+        return SoupBackend('lxml')
+    return SoupBackend('html.parser')
@@ -0,0 +1,586 @@
+"""Lưu trữ tin tức trong SQLite (WAL)
+
+Mỗi bài là một dòng trong bảng articles, khóa theo link đã chuẩn hóa (ghi
+đè theo link); các category của bài nằm trong bảng article_categories. Mọi
+lần ghi là một transaction và tăng số phiên bản trong bảng meta nếu dữ liệu
+tin thực sự thay đổi, nên người đọc (API) chỉ cần so sánh phiên bản để biết
+dữ liệu đã đổi. Ở chế độ WAL
+người đọc không bao giờ bị chặn bởi người ghi và chỉ thấy các transaction
+đã commit.
+
+Các bài gần trùng nhau giữa các nguồn được gom thành cụm (cluster_id, xem
+data/dedup.py) ngay khi ghi; mỗi cụm chỉ cần tóm tắt một bài, các bài còn
+lại dùng chung bản tóm tắt đó.
+
+Các file JSON cũ (raw_news.json, raw_news_<category>.json,
+processed_news.json) chỉ còn là bản xuất tùy chọn: đặt NEWS_EXPORT_JSON=1.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import unicodedata
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from data import dedup
+
+# Thư mục data/ của dự án, không phụ thuộc thư mục đang chạy
+PROJECT_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+NEWS_COLUMNS = "a.url, a.title, a.summary, a.description, c.category, a.source, a.timestamp, a.cluster_id"
+
+# Bài cần tóm tắt: chưa có bản tóm tắt cho nội dung hiện tại
+PENDING_CONDITION = "(summary IS NULL OR instr(summary_hashes, content_hash) = 0)"
+# Bài s đăng cách thời điểm {a} không quá dedup.WINDOW_HOURS giờ (tham số thứ hai)
+_WINDOW_CONDITION = "abs(julianday(s.timestamp) - julianday({a})) * 24 <= ?"
+# Số ứng viên tối đa lấy từ một bucket LSH (bucket quá đông là văn bản rất ngắn/chung chung)
+MAX_BUCKET_CANDIDATES = 64
+
+def normalize_link(link: str) -> str:
+    """Chuẩn hóa link để cùng một bài viết luôn cho cùng một khóa
+
+    Bỏ query string, fragment và dấu "/" cuối; scheme và host về chữ
+    thường, http và https coi như nhau.
+    """
+    parts = urlsplit(link.strip())
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https", parts.netloc.lower(), path, "", ""))
+
+def content_hash(title: str, description: str) -> str:
+    """Hash nội dung tiêu đề + mô tả, bỏ qua khác biệt về unicode và khoảng trắng"""
+    text = unicodedata.normalize("NFKC", f"{title}\n{description or ''}")
+    text = " ".join(text.split())
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+def default_data_dir() -> str:
+    """Thư mục dữ liệu dùng chung của crawler, scheduler, API và web (NEWS_DATA_DIR hoặc data/ của dự án)"""
+    return os.environ.get("NEWS_DATA_DIR") or PROJECT_DATA_DIR
+
+def export_enabled() -> bool:
+    """Có xuất thêm các file JSON sau mỗi lần ghi không (NEWS_EXPORT_JSON)"""
+    return os.environ.get("NEWS_EXPORT_JSON", "") not in ("", "0")
+
+def _row_to_news(row: Tuple) -> Dict:
+    url, title, summary, description, category, source, timestamp, cluster_id = row
+    return {
+        "title": title,
+        "link": url,
+        "summary": summary,
+        "description": description,
+        "category": category,
+        "source": source,
+        "timestamp": timestamp,
+        "cluster_id": cluster_id
+    }
+
+def _write_json(path: str, data) -> None:
+    """Ghi ra file tạm rồi đổi tên để không bao giờ để lại file dở dang"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+class NewsStorage:
+    """Kho tin tức dùng chung cho crawler, summarizer và API"""
+    # Số hash nội dung tối đa dùng chung một bản tóm tắt (xem save_summaries)
+    max_hashes = 8
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(default_data_dir(), "news.sqlite")
+        self._lock = threading.Lock()
+        # isolation_level=None: tự quản lý transaction bằng BEGIN/COMMIT
+        self.conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS articles (
+                link TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                title TEXT NOT NULL,
+                description TEXT NOT NULL DEFAULT '',
+                source TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                summary TEXT,
+                summary_hashes TEXT NOT NULL DEFAULT '[]',
+                timestamp TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                cluster_id TEXT,
+                minhash BLOB
+            );
+            CREATE TABLE IF NOT EXISTS article_categories (
+                link TEXT NOT NULL REFERENCES articles (link) ON DELETE CASCADE,
+                category TEXT NOT NULL,
+                PRIMARY KEY (link, category)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_articles_source ON articles (source);
+            CREATE INDEX IF NOT EXISTS idx_articles_timestamp ON articles (timestamp);
+            CREATE INDEX IF NOT EXISTS idx_articles_last_seen ON articles (last_seen);
+            CREATE INDEX IF NOT EXISTS idx_article_categories_category ON article_categories (category, link);
+            CREATE TABLE IF NOT EXISTS lsh_buckets (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                link TEXT NOT NULL REFERENCES articles (link) ON DELETE CASCADE,
+                PRIMARY KEY (band, bucket, link)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_lsh_buckets_link ON lsh_buckets (link);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+        """)
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        with self.transaction(bump_version=False):
+            self._migrate(self.conn)
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES (?, ?)",
+                [("generation", uuid.uuid4().hex), ("version", "0"), ("updated_at", datetime.now().isoformat())]
+            )
+        self._backfill_clusters()
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        """Thêm các cột mới vào kho tạo bởi phiên bản cũ; bỏ các cụm gom theo cấu hình dedup khác"""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(articles)")}
+        for name, definition in (("cluster_id", "TEXT"), ("minhash", "BLOB")):
+            if name not in columns:
+                conn.execute(f"ALTER TABLE articles ADD COLUMN {name} {definition}")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_cluster ON articles (cluster_id)")
+        row = conn.execute("SELECT value FROM meta WHERE key = 'dedup'").fetchone()
+        if row is None or row[0] != dedup.CONFIG:
+            # Cụm gom theo ngưỡng cũ có thể chứa các tin khác nhau: _backfill_clusters() gom lại từ đầu
+            conn.execute("DELETE FROM lsh_buckets")
+            conn.execute("UPDATE articles SET minhash = NULL, cluster_id = NULL")
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('dedup', ?)", (dedup.CONFIG,))
+
+    def _backfill_clusters(self) -> None:
+        """Gom cụm các bài chưa có chữ ký MinHash (kho tạo bởi phiên bản cũ)"""
+        with self.snapshot() as conn:
+            missing = conn.execute("SELECT COUNT(*) FROM articles WHERE minhash IS NULL").fetchone()[0]
+        if not missing:
+            return
+        with self.transaction() as conn:
+            rows = conn.execute(
+                "SELECT link, title, description FROM articles WHERE minhash IS NULL ORDER BY timestamp, link"
+            ).fetchall()
+            for link, title, description in rows:
+                self._assign_cluster(conn, link, title, description, None)
+        print(f"Đã gom cụm {len(rows)} bài trong kho")
+
+    def _assign_cluster(
+        self,
+        conn: sqlite3.Connection,
+        link: str,
+        title: str,
+        description: str,
+        cluster_id: Optional[str]
+    ) -> str:
+        """Tính chữ ký MinHash của bài và đưa bài vào cụm giống nhất (hoặc cụm mới)
+
+        Ứng viên từ LSH chỉ được nhận khi là bài của nguồn khác trong vòng
+        dedup.WINDOW_HOURS giờ, cụm của nó chưa có bài nào của nguồn này, và
+        Jaccard chính xác trên tập shingle đạt dedup.THRESHOLD và các con số
+        khớp nhau (dedup.numbers_agree()). Cụm của các
+        bài đã có không bao giờ bị gộp hay đổi mã, nên cluster_id ổn định
+        giữa các lần ghi.
+        """
+        text = f"{title} {description or ''}"
+        signature = dedup.minhash(text)
+        keys = dedup.band_keys(signature)
+        conn.execute("DELETE FROM lsh_buckets WHERE link = ?", (link,))
+        candidates = set()
+        for band, key in enumerate(keys):
+            candidates.update(
+                row[0] for row in conn.execute(
+                    "SELECT link FROM lsh_buckets WHERE band = ? AND bucket = ? LIMIT ?",
+                    (band, key, MAX_BUCKET_CANDIDATES)
+                )
+            )
+        source, timestamp = conn.execute("SELECT source, timestamp FROM articles WHERE link = ?", (link,)).fetchone()
+        own_shingles = dedup.shingles(text)
+        own_numbers = dedup.numbers(text)
+        best = None
+        for candidate in candidates:
+            row = conn.execute(
+                f"""
+                SELECT s.title, s.description, s.minhash, s.cluster_id FROM articles s
+                WHERE s.link = ? AND s.source != ? AND {_WINDOW_CONDITION.format(a="?")}
+                    AND NOT EXISTS (
+                        SELECT 1 FROM articles m WHERE m.cluster_id = s.cluster_id AND m.source = ? AND m.link != ?
+                    )
+                """,
+                (candidate, source, timestamp, dedup.WINDOW_HOURS, source, link)
+            ).fetchone()
+            # Ước lượng từ chữ ký loại nhanh các ứng viên khác xa trước khi tính Jaccard chính xác
+            if row is None or dedup.similarity(signature, dedup.from_bytes(row[2])) < dedup.THRESHOLD / 2:
+                continue
+            score = self._match(own_shingles, own_numbers, row[0], row[1])
+            if score is not None and (best is None or score > best[0]):
+                best = (score, row[3])
+        if best is not None and self._matches_cluster(conn, link, own_shingles, own_numbers, best[1]):
+            cluster_id = best[1]
+        elif cluster_id is None:
+            cluster_id = dedup.new_cluster_id(link)
+        conn.executemany(
+            "INSERT INTO lsh_buckets (band, bucket, link) VALUES (?, ?, ?)",
+            [(band, key, link) for band, key in enumerate(keys)]
+        )
+        conn.execute(
+            "UPDATE articles SET minhash = ?, cluster_id = ? WHERE link = ?",
+            (dedup.to_bytes(signature), cluster_id, link)
+        )
+        return cluster_id
+
+    @staticmethod
+    def _match(own_shingles: Set[str], own_numbers: Set[str], title: str, description: Optional[str]) -> Optional[float]:
+        """Jaccard với một bài khác nếu hai bài là cùng một tin, ngược lại None"""
+        other = f"{title} {description or ''}"
+        score = dedup.jaccard(own_shingles, dedup.shingles(other))
+        if score < dedup.THRESHOLD or not dedup.numbers_agree(own_numbers, dedup.numbers(other)):
+            return None
+        return score
+
+    def _matches_cluster(
+        self,
+        conn: sqlite3.Connection,
+        link: str,
+        own_shingles: Set[str],
+        own_numbers: Set[str],
+        cluster_id: str
+    ) -> bool:
+        """Bài khớp với mọi bài trong cụm, không chỉ bài giống nhất
+
+        Các bài cùng cụm dùng chung bản tóm tắt, nên không để cụm lan dần
+        qua các bài chỉ giống bài bên cạnh.
+        """
+        members = conn.execute(
+            "SELECT title, description FROM articles WHERE cluster_id = ? AND link != ?", (cluster_id, link)
+        ).fetchall()
+        return all(self._match(own_shingles, own_numbers, title, description) is not None for title, description in members)
+
+    def _share_summaries(self, conn: sqlite3.Connection, links: List[str]) -> int:
+        """Bài cần tóm tắt trong links dùng bản tóm tắt hiện hành mới nhất của một bài cùng cụm
+
+        Chỉ lấy từ bài của nguồn khác, đăng trong vòng dedup.WINDOW_HOURS giờ.
+        """
+        if not links:
+            return 0
+        placeholders = ", ".join("?" * len(links))
+        donor = f"""
+            FROM articles s
+            WHERE s.cluster_id = a.cluster_id AND s.link != a.link AND s.source != a.source
+                AND {_WINDOW_CONDITION.format(a="a.timestamp")}
+                AND s.summary IS NOT NULL AND instr(s.summary_hashes, s.content_hash) > 0
+        """
+        return conn.execute(
+            f"""
+            UPDATE articles AS a SET
+                summary = (SELECT s.summary {donor} ORDER BY s.timestamp DESC LIMIT 1),
+                summary_hashes = '["' || a.content_hash || '"]'
+            WHERE a.link IN ({placeholders})
+                AND (a.summary IS NULL OR instr(a.summary_hashes, a.content_hash) = 0)
+                AND EXISTS (SELECT 1 {donor})
+            """,
+            [dedup.WINDOW_HOURS, *links, dedup.WINDOW_HOURS]
+        ).rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+    @contextmanager
+    def transaction(self, bump_version: bool = True) -> Iterator[sqlite3.Connection]:
+        """Một transaction ghi; khi commit, tăng phiên bản dữ liệu nếu có dòng nào thay đổi
+
+        Các thay đổi ghi qua _touch() (chỉ cập nhật last_seen) không tính.
+        """
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            start = self.conn.total_changes
+            self._quiet_changes = 0
+            try:
+                yield self.conn
+                if bump_version and self.conn.total_changes - start > self._quiet_changes:
+                    self.conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+                    self.conn.execute(
+                        "UPDATE meta SET value = ? WHERE key = 'updated_at'", (datetime.now().isoformat(),)
+                    )
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def _touch(self, conn: sqlite3.Connection, links: List[str], now: str) -> None:
+        """Ghi nhận các bài vẫn còn trên trang nguồn; không đổi dữ liệu tin nên không tăng phiên bản"""
+        self._quiet_changes += conn.executemany(
+            "UPDATE articles SET last_seen = ? WHERE link = ?", [(now, link) for link in links]
+        ).rowcount
+
+    @contextmanager
+    def snapshot(self) -> Iterator[sqlite3.Connection]:
+        """Một transaction đọc: mọi truy vấn bên trong thấy cùng một phiên bản dữ liệu"""
+        with self._lock:
+            self.conn.execute("BEGIN")
+            try:
+                yield self.conn
+            finally:
+                self.conn.execute("COMMIT")
+
+    def _meta(self, conn: sqlite3.Connection) -> Dict[str, str]:
+        return dict(conn.execute("SELECT key, value FROM meta"))
+
+    def version(self) -> str:
+        """Phiên bản dữ liệu, đổi sau mỗi transaction ghi"""
+        with self.snapshot() as conn:
+            meta = self._meta(conn)
+        return f"{meta['generation'][:12]}.{meta['version']}"
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self.snapshot() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def meta_items(self, prefix: str) -> Dict[str, str]:
+        """Các giá trị phụ có khóa bắt đầu bằng prefix"""
+        with self.snapshot() as conn:
+            rows = conn.execute(
+                "SELECT key, value FROM meta WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+            ).fetchall()
+        return dict(rows)
+
+    def set_meta(self, key: str, value: str) -> None:
+        """Ghi một giá trị phụ (trạng thái scheduler, ...); không đổi phiên bản dữ liệu tin"""
+        with self.transaction(bump_version=False) as conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def upsert_articles(self, news_list: List[Dict]) -> Tuple[int, int]:
+        """Ghi một đợt tin vừa crawl trong một transaction
+
+        Ghi đè tiêu đề/mô tả theo link (bản xuất hiện đầu tiên trong đợt),
+        giữ timestamp lần đầu thấy bài. Bài mới hoặc đổi nội dung được gom
+        cụm lại; nếu cụm đã có bản tóm tắt, bài dùng luôn bản đó. Trả về (số
+        bài mới, số bài đổi nội dung).
+        """
+        now = datetime.now().isoformat()
+        articles: Dict[str, Dict] = {}
+        categories = set()
+        for news in news_list:
+            link = normalize_link(news["link"])
+            articles.setdefault(link, news)
+            categories.add((link, news["category"]))
+
+        inserted = changed = 0
+        with self.transaction() as conn:
+            unchanged = []
+            for link, news in articles.items():
+                description = news.get("description") or ""
+                digest = content_hash(news["title"], description)
+                row = conn.execute(
+                    "SELECT content_hash, minhash IS NULL, cluster_id, url, title, description, source FROM articles WHERE link = ?",
+                    (link,)
+                ).fetchone()
+                if row is None:
+                    inserted += 1
+                    conn.execute(
+                        """
+                        INSERT INTO articles (link, url, title, description, source, content_hash, timestamp, last_seen)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        (link, news["link"], news["title"], description, news["source"], digest,
+                         news.get("timestamp") or now, now)
+                    )
+                    self._assign_cluster(conn, link, news["title"], description, None)
+                elif not row[1] and row[3:] == (news["link"], news["title"], description, news["source"]):
+                    unchanged.append(link)
+                else:
+                    changed += row[0] != digest
+                    conn.execute(
+                        """
+                        UPDATE articles SET url = ?, title = ?, description = ?, source = ?,
+                            content_hash = ?, last_seen = ?
+                        WHERE link = ?
+                        """,
+                        (news["link"], news["title"], description, news["source"], digest, now, link)
+                    )
+                    if row[0] != digest or row[1]:
+                        self._assign_cluster(conn, link, news["title"], description, row[2])
+            self._touch(conn, unchanged, now)
+            conn.executemany("INSERT OR IGNORE INTO article_categories (link, category) VALUES (?, ?)", categories)
+            self._share_summaries(conn, list(articles))
+        return inserted, changed
+
+    def pending_summaries(self, links: Optional[List[str]] = None) -> List[Dict]:
+        """Các bài chưa có bản tóm tắt cho nội dung hiện tại (chỉ trong links nếu có)
+
+        Mỗi cụm chỉ trả về một bài (bài thấy sớm nhất); save_summaries() chia
+        sẻ bản tóm tắt của nó cho cả cụm.
+        """
+        condition, params = "", []
+        if links is not None:
+            links = sorted({normalize_link(link) for link in links})
+            condition = f"AND link IN ({', '.join('?' * len(links))})"
+            params = links
+        with self.snapshot() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT link, url, title, description, source, content_hash, cluster_id, MIN(timestamp) AS first_seen
+                FROM articles
+                WHERE {PENDING_CONDITION} {condition}
+                GROUP BY COALESCE(cluster_id, link)
+                ORDER BY first_seen DESC
+                """,
+                params
+            ).fetchall()
+        return [
+            {"key": key, "link": url, "title": title, "description": description,
+             "source": source, "content_hash": digest, "cluster_id": cluster_id}
+            for key, url, title, description, source, digest, cluster_id, _ in rows
+        ]
+
+    def save_summaries(self, items: List[Tuple[Dict, str]]) -> None:
+        """Ghi bản tóm tắt cho các bài (dòng của pending_summaries()) trong một transaction
+
+        Nếu bản tóm tắt mới giống bản cũ, hash nội dung mới được thêm vào
+        danh sách hash của bản tóm tắt, để cùng một bài có mô tả hơi khác
+        nhau giữa các chu kỳ không bị tóm tắt lại mãi. Các bài khác trong
+        cùng cụm đang chờ tóm tắt dùng chung bản tóm tắt này.
+        """
+        with self.transaction() as conn:
+            for news, summary in items:
+                row = conn.execute(
+                    "SELECT summary, summary_hashes FROM articles WHERE link = ?", (news["key"],)
+                ).fetchone()
+                if row is None:
+                    continue
+                hashes = []
+                if row[0] == summary:
+                    hashes = json.loads(row[1])[-(self.max_hashes - 1):]
+                hashes.append(news["content_hash"])
+                conn.execute(
+                    "UPDATE articles SET summary = ?, summary_hashes = ? WHERE link = ?",
+                    (summary, json.dumps(hashes), news["key"])
+                )
+            clusters = [news["cluster_id"] for news, _ in items if news.get("cluster_id")]
+            if clusters:
+                placeholders = ", ".join("?" * len(clusters))
+                members = [
+                    row[0] for row in conn.execute(
+                        f"SELECT link FROM articles WHERE cluster_id IN ({placeholders}) AND {PENDING_CONDITION}",
+                        clusters
+                    )
+                ]
+                self._share_summaries(conn, members)
+
+    def import_processed(self, news_list: List[Dict]) -> int:
+        """Nhập tin đã tóm tắt (định dạng processed_news.json), giữ timestamp và bản tóm tắt
+
+        Dùng một lần khi chuyển từ file JSON sang SQLite; bài đã có bản tóm
+        tắt trong kho thì giữ nguyên.
+        """
+        self.upsert_articles(news_list)
+        imported = 0
+        with self.transaction() as conn:
+            for news in news_list:
+                link = normalize_link(news["link"])
+                digest = content_hash(news["title"], news.get("description") or "")
+                imported += conn.execute(
+                    """
+                    UPDATE articles SET summary = ?, summary_hashes = ?, timestamp = ?
+                    WHERE link = ? AND summary IS NULL
+                    """,
+                    (news["summary"], json.dumps([digest]), news["timestamp"], link)
+                ).rowcount
+        return imported
+
+    def count(self, summarized: bool = False) -> int:
+        with self.snapshot() as conn:
+            where = " WHERE summary IS NOT NULL" if summarized else ""
+            return conn.execute(f"SELECT COUNT(*) FROM articles{where}").fetchone()[0]
+
+    def load_news(self) -> Tuple[List[Dict], List[str], str, str]:
+        """Mọi tin đã tóm tắt (mỗi category một dòng), mọi category, phiên bản và thời điểm cập nhật
+
+        Đọc trong một transaction nên danh sách luôn khớp với phiên bản.
+        """
+        with self.snapshot() as conn:
+            meta = self._meta(conn)
+            rows = conn.execute(
+                f"""
+                SELECT {NEWS_COLUMNS} FROM articles a JOIN article_categories c ON c.link = a.link
+                WHERE a.summary IS NOT NULL
+                ORDER BY a.timestamp DESC, a.url DESC, c.category DESC
+                """
+            ).fetchall()
+            categories = [row[0] for row in conn.execute("SELECT DISTINCT category FROM article_categories")]
+        version = f"{meta['generation'][:12]}.{meta['version']}"
+        return [_row_to_news(row) for row in rows], categories, version, meta["updated_at"]
+
+    def query_news(
+        self,
+        category: Optional[str] = None,
+        source: Optional[str] = None,
+        summarized: bool = True,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """Tin theo category/nguồn, mới nhất trước, dùng các index của bảng"""
+        conditions, params = [], []
+        if summarized:
+            conditions.append("a.summary IS NOT NULL")
+        if category:
+            conditions.append("c.category = ?")
+            params.append(category)
+        if source:
+            conditions.append("a.source = ?")
+            params.append(source)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = f"""
+            SELECT {NEWS_COLUMNS} FROM articles a JOIN article_categories c ON c.link = a.link
+            {where} ORDER BY a.timestamp DESC, a.url DESC, c.category DESC
+        """
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self.snapshot() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        news_list = [_row_to_news(row) for row in rows]
+        if not summarized:
+            for news in news_list:
+                del news["summary"]
+        return news_list
+
+    def categories(self) -> List[str]:
+        with self.snapshot() as conn:
+            return [row[0] for row in conn.execute("SELECT DISTINCT category FROM article_categories ORDER BY category")]
+
+    def prune(self, max_age_days: int = 30) -> int:
+        """Xóa các bài không còn xuất hiện trong max_age_days ngày"""
+        cutoff = (datetime.now() - timedelta(days=max_age_days)).isoformat()
+        with self.transaction() as conn:
+            return conn.execute("DELETE FROM articles WHERE last_seen < ?", (cutoff,)).rowcount
+
+    def export_json(self, data_dir: Optional[str] = None) -> None:
+        """Xuất raw_news.json, raw_news_<category>.json và processed_news.json (mặc định cạnh file kho)"""
+        data_dir = data_dir or os.path.dirname(os.path.abspath(self.path))
+        _write_json(os.path.join(data_dir, "raw_news.json"), self.query_news(summarized=False))
+        for category in self.categories():
+            filename = f"raw_news_{category.replace(' ', '_')}.json"
+            _write_json(os.path.join(data_dir, filename), self.query_news(category, summarized=False))
+        _write_json(os.path.join(data_dir, "processed_news.json"), self.query_news())
+
+def open_storage(data_dir: Optional[str] = None) -> NewsStorage:
+    """Mở kho tin của thư mục dữ liệu
+
+    Lần đầu (kho còn trống), tin đã tóm tắt trong processed_news.json của
+    phiên bản cũ được nhập vào để không phải tóm tắt lại.
+    """
+    data_dir = data_dir or default_data_dir()
+    storage = NewsStorage(os.path.join(data_dir, "news.sqlite"))
+    legacy_path = os.path.join(data_dir, "processed_news.json")
+    if storage.count() == 0 and os.path.exists(legacy_path):
+        with open(legacy_path, "r", encoding="utf-8") as f:
+            imported = storage.import_processed(json.load(f))
+        print(f"Đã nhập {imported} bài từ {legacy_path} vào {storage.path}")
+    return storage
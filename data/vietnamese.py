@@ -0,0 +1,115 @@
+"""Xử lý văn bản tiếng Việt dùng chung: chuẩn hóa, làm sạch, bỏ dấu, tách âm tiết và tách câu"""
+import re
+import unicodedata
+from typing import Iterable, List
+
+_WORD_RE = re.compile(r"\w+")
+
+# Các dấu kết hợp (thanh điệu, mũ, móc, trăng) sau khi phân rã NFD
+_COMBINING_RE = re.compile("[\u0300-\u036f]+")
+
+def normalize(text: str) -> str:
+    """Chuẩn hóa NFKC và chữ thường"""
+    return unicodedata.normalize("NFKC", text).lower()
+
+def fold_diacritics(text: str) -> str:
+    """Bỏ dấu tiếng Việt: "thời sự" -> "thoi su", "đà nẵng" -> "da nang" """
+    # đ/Đ là chữ riêng, không tách được thành d + dấu khi phân rã NFD
+    text = text.replace("đ", "d").replace("Đ", "D")
+    decomposed = unicodedata.normalize("NFD", text)
+    return unicodedata.normalize("NFC", _COMBINING_RE.sub("", decomposed))
+
+def tokenize(text: str) -> List[str]:
+    """Tách văn bản thành các âm tiết đã chuẩn hóa và bỏ dấu"""
+    return _WORD_RE.findall(fold_diacritics(normalize(text)))
+
+# Ký tự giữ lại khi làm sạch: chữ (\w gồm cả chữ có dấu tiếng Việt), số, gạch
+# dưới và dấu câu cơ bản. Mỗi dãy ký tự khác, kể cả khoảng trắng, thành một
+# dấu cách trong một lượt thay thế (thay cho bỏ ký tự lạ rồi gộp khoảng
+# trắng). Dấu cách đơn, chiếm phần lớn các dãy như vậy, không khớp nên không
+# phải thay.
+_UNWANTED_RE = re.compile(r" [^\w.,!?-]+|[^\w.,!?\- ][^\w.,!?-]*")
+
+def clean_text(text: str) -> str:
+    """Chuẩn hóa NFKC, bỏ ký tự lạ và khoảng trắng thừa"""
+    # Văn bản đã ở dạng NFKC (gần như mọi tin) thì không cần tạo chuỗi mới
+    if not unicodedata.is_normalized("NFKC", text):
+        text = unicodedata.normalize("NFKC", text)
+    return _UNWANTED_RE.sub(" ", text).strip()
+
+def clean_texts(texts: Iterable[str]) -> List[str]:
+    """clean_text() cho cả batch"""
+    is_normalized, normalize_form, sub = unicodedata.is_normalized, unicodedata.normalize, _UNWANTED_RE.sub
+    return [
+        sub(" ", text if is_normalized("NFKC", text) else normalize_form("NFKC", text)).strip()
+        for text in texts
+    ]
+
+# Từ viết tắt hay đứng trước dấu chấm trong tin tức (chữ thường, không có dấu
+# chấm cuối); với "PGS.TS." chỉ xét phần sau dấu chấm cuối cùng
+ABBREVIATIONS = frozenset({
+    "tp", "tt", "tx", "q", "p", "h", "x", "gs", "pgs", "ts", "ths", "bs", "ck", "ks", "ls",
+    "tr", "nxb", "sđt", "st", "mr", "mrs", "ms", "dr", "vs",
+})
+
+# Dấu kết thúc câu (kể cả "..." và "…"), dấu đóng ngoặc/nháy đi kèm, rồi khoảng trắng
+_SENTENCE_END_RE = re.compile(r"[.!?…]+[\"'”’»)\]]*(?=\s)")
+_OPENERS = "\"'“‘«(["
+_CLOSERS = "\"'”’»)]"
+# Dấu nháy chưa đóng chỉ được tính nếu dấu đóng nằm trong chừng này ký tự
+_MAX_QUOTE_LENGTH = 400
+
+def _is_abbreviation(text: str, end: int) -> bool:
+    """Từ ngay trước dấu chấm ở vị trí end có phải từ viết tắt không"""
+    start = end
+    while start > 0 and not text[start - 1].isspace():
+        start -= 1
+    token = text[start:end].lstrip(_OPENERS)
+    return token.rsplit(".", 1)[-1].lower() in ABBREVIATIONS
+
+def _inside_quote(text: str, start: int, end: int) -> bool:
+    """Vị trí end nằm trong một lời trích dẫn mở từ start và đóng ở phía sau"""
+    span = text[start:end]
+    after = text[end:end + _MAX_QUOTE_LENGTH]
+    if span.count("“") > span.count("”") and "”" in after:
+        return True
+    return span.count('"') % 2 == 1 and '"' in after
+
+def split_sentences(text: str) -> List[str]:
+    """Tách văn bản tiếng Việt thành câu theo luật
+
+    Câu kết thúc ở ".", "!", "?", "..." hoặc "…" (kèm dấu đóng nháy/ngoặc
+    ngay sau) khi sau đó là khoảng trắng và câu tiếp theo bắt đầu bằng chữ
+    hoa, chữ số hoặc dấu mở nháy/ngoặc. Không tách:
+
+    - sau từ viết tắt (TP. HCM, PGS.TS. Nguyễn..., Q. 1);
+    - trong số ("1.200", "3.5") và tên miền vì không có khoảng trắng sau dấu chấm;
+    - trước chữ thường ("... và các tỉnh khác... nhưng");
+    - bên trong lời trích dẫn chưa đóng ("Tôi đi. Anh về." - ông nói).
+    """
+    sentences = []
+    start = 0
+    length = len(text)
+    for match in _SENTENCE_END_RE.finditer(text):
+        end = match.end()
+        next_start = end
+        while next_start < length and text[next_start].isspace():
+            next_start += 1
+        first = next_start
+        while first < length and text[first] in _OPENERS:
+            first += 1
+        if first >= length or not (text[first].isupper() or text[first].isdigit()):
+            continue
+        if match.group()[0] == "." and len(match.group().rstrip(_CLOSERS)) == 1 \
+                and _is_abbreviation(text, match.start()):
+            continue
+        if _inside_quote(text, start, end):
+            continue
+        sentence = text[start:end].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = next_start
+    tail = text[start:].strip()
+    if tail:
+        sentences.append(tail)
+    return sentences
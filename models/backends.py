@@ -0,0 +1,63 @@
+"""Backend suy luận cho NewsSummarizer
+
+- torch: mô hình PyTorch fp32 (cách làm mặc định)
+- torch-int8: lượng tử hóa động int8 các lớp Linear, chỉ chạy trên CPU
+- onnx: mô hình encoder-decoder xuất sang ONNX (có KV cache) chạy bằng
+  ONNX Runtime; bản xuất được lưu lại trong onnx/ của thư mục dữ liệu
+  (data/ của dự án hoặc NEWS_DATA_DIR) để chỉ xuất một lần
+
+Chọn backend bằng tham số hoặc biến môi trường SUMMARIZER_BACKEND.
+"""
+import os
+import re
+
+from data.storage import default_data_dir
+
+BACKENDS = ("torch", "torch-int8", "onnx")
+
+def default_backend() -> str:
+    return os.environ.get("SUMMARIZER_BACKEND", "torch")
+
+def _onnx_export_dir(model_name: str) -> str:
+    return os.path.join(default_data_dir(), "onnx", re.sub(r'[^\w.-]+', '_', model_name.strip("/")))
+
+def _load_torch_int8(model_name: str):
+    import torch
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+    model.eval()
+    model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model, tokenizer
+
+def _load_onnx(model_name: str):
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    from transformers import AutoTokenizer
+
+    export_dir = _onnx_export_dir(model_name)
+    if os.path.exists(os.path.join(export_dir, "config.json")):
+        model = ORTModelForSeq2SeqLM.from_pretrained(export_dir, use_cache=True)
+        tokenizer = AutoTokenizer.from_pretrained(export_dir)
+    else:
+        model = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True, use_cache=True)
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model.save_pretrained(export_dir)
+        tokenizer.save_pretrained(export_dir)
+    return model, tokenizer
+
+def load_summarization_pipeline(model_name: str, backend: str, device: int = -1):
+    """Tạo pipeline "summarization" của transformers với backend đã chọn"""
+    from transformers import pipeline
+
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend không hợp lệ: {backend} (chọn một trong {', '.join(BACKENDS)})")
+    if backend == "torch":
+        return pipeline("summarization", model=model_name, device=device)
+    if device != -1:
+        raise ValueError(f"Backend {backend} chỉ hỗ trợ CPU")
+    if backend == "torch-int8":
+        model, tokenizer = _load_torch_int8(model_name)
+    else:
+        model, tokenizer = _load_onnx(model_name)
+    return pipeline("summarization", model=model, tokenizer=tokenizer, device=-1)
@@ -0,0 +1,82 @@
+"""Tóm tắt trích xuất (TF-IDF) theo batch
+
+Tất cả câu của cả batch được tách một lần, dùng chung một từ điển/IDF và
+được chấm điểm bằng tổng theo hàng của ma trận thưa trong một lượt; các câu
+có điểm cao nhất của từng bài được chọn bằng một lần sắp xếp theo nhóm.
+Với một bài duy nhất, kết quả giống hệt cách làm cũ (fit TF-IDF riêng cho
+từng bài). Câu được tách bằng bộ tách câu tiếng Việt theo luật
+(data/vietnamese.py), không cần dữ liệu punkt của nltk.
+"""
+from typing import List, Optional
+
+import numpy as np
+
+from data.vietnamese import split_sentences
+
+def split_article(text: str, num_sentences: int, max_words: int = 500) -> Optional[List[str]]:
+    """Tách câu của một bài; None nếu bài đủ ngắn để giữ nguyên"""
+    sentences = split_sentences(text)
+    if len(sentences) <= num_sentences:
+        return None
+
+    # Nếu văn bản quá dài, chỉ lấy max_words từ đầu tiên
+    words = text.split()
+    if len(words) > max_words:
+        sentences = split_sentences(' '.join(words[:max_words]))
+    return sentences
+
+def score_sentences(sentences: List[str], max_features: Optional[int] = None) -> np.ndarray:
+    """Điểm TF-IDF (tổng theo hàng) của mọi câu với một từ điển dùng chung"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    vectorizer = TfidfVectorizer(max_features=max_features, stop_words=None)
+    try:
+        tfidf_matrix = vectorizer.fit_transform(sentences)
+    except ValueError:
+        # Không câu nào có từ hợp lệ: mọi câu cùng điểm 0
+        return np.zeros(len(sentences))
+    return np.asarray(tfidf_matrix.sum(axis=1)).ravel()
+
+def extract_key_sentences_batch(
+    texts: List[str],
+    num_sentences: int = 2,
+    max_features: Optional[int] = None
+) -> List[str]:
+    """Trích xuất các câu quan trọng nhất của từng bài trong batch
+
+    Thứ tự chọn giống cách làm cũ: điểm giảm dần, cùng điểm thì ưu tiên câu
+    đứng sau; các câu được chọn giữ thứ tự xuất hiện trong bài.
+    """
+    results = list(texts)
+    articles, sentences, owners = [], [], []
+    for i, text in enumerate(texts):
+        article_sentences = split_article(text, num_sentences)
+        if article_sentences is None:
+            continue
+        articles.append(i)
+        sentences.extend(article_sentences)
+        owners.extend([len(articles) - 1] * len(article_sentences))
+    if not sentences:
+        return results
+
+    scores = score_sentences(sentences, max_features)
+    owners = np.asarray(owners)
+    starts = np.searchsorted(owners, np.arange(len(articles)))
+    positions = np.arange(len(sentences)) - starts[owners]
+
+    # Sắp theo (bài tăng dần, điểm giảm dần, vị trí câu giảm dần) rồi lấy
+    # num_sentences câu đầu của mỗi bài
+    order = np.lexsort((-positions, -scores, owners))
+    rank = np.arange(len(order)) - starts[owners[order]]
+    selected = np.sort(order[rank < num_sentences])
+
+    picked: List[List[str]] = [[] for _ in articles]
+    for k in selected:
+        picked[owners[k]].append(sentences[k])
+    for article, article_sentences in zip(articles, picked):
+        results[article] = ' '.join(article_sentences)
+    return results
+
+def extract_key_sentences(text: str, num_sentences: int = 2) -> str:
+    """Trích xuất các câu quan trọng nhất dựa trên TF-IDF"""
+    return extract_key_sentences_batch([text], num_sentences, max_features=500)[0]
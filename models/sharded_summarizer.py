@@ -0,0 +1,222 @@
+"""Tóm tắt song song trên nhiều process, mỗi process một phần số nhân CPU
+
+Một NewsSummarizer dùng tất cả các nhân cho phép tính bên trong từng lần gọi
+mô hình (luồng intra-op của torch), nhưng các batch nhỏ của tin tức không
+tận dụng được nhiều nhân: tốc độ ngừng tăng sau vài nhân. ShardedSummarizer
+tải mô hình một lần rồi fork N process worker; trọng số được dùng chung
+theo copy-on-write nên bộ nhớ không tăng N lần. Mỗi worker đặt số luồng
+intra-op/inter-op riêng, nhận các nhóm văn bản qua hàng đợi, và kết quả
+được gom lại đúng thứ tự. Cache và chỉ số vẫn nằm ở process chính.
+
+Cấu hình qua biến môi trường (dịch vụ tóm tắt đọc khi khởi động):
+
+    SUMMARIZER_WORKERS=4 SUMMARIZER_THREADS=8 python models/summarizer_service.py
+
+Chọn cách chia workers x threads cho máy bằng benchmarks/bench_sharding.py.
+"""
+import atexit
+import gc
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+from typing import Iterator, List, Optional, Tuple
+
+# Thêm thư mục gốc vào PYTHONPATH để import các module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.summarizer import NewsSummarizer
+
+# Số lần khởi động lại các worker tối đa trong một lần gọi (ví dụ một nhóm
+# văn bản làm worker bị OOM killer dừng mỗi lần chạy)
+MAX_RESTARTS = 2
+
+class WorkerDied(RuntimeError):
+    """Một worker đã dừng (OOM killer, lỗi native); việc nó đang làm bị mất"""
+
+def sharding_config() -> Tuple[int, Optional[int], int]:
+    """(workers, threads, interop_threads) từ SUMMARIZER_WORKERS, SUMMARIZER_THREADS, SUMMARIZER_INTEROP_THREADS
+
+    threads là None nếu không đặt: chia đều số nhân cho các worker.
+    """
+    workers = int(os.environ.get("SUMMARIZER_WORKERS", "1"))
+    threads = os.environ.get("SUMMARIZER_THREADS")
+    interop_threads = int(os.environ.get("SUMMARIZER_INTEROP_THREADS", "1"))
+    return max(1, workers), int(threads) if threads else None, max(1, interop_threads)
+
+def _worker_main(summarizer: NewsSummarizer, tasks, results, threads: int, interop_threads: int) -> None:
+    import torch
+
+    # Ctrl+C gửi tới cả nhóm process; process chính tự dừng các worker
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(interop_threads)
+    except RuntimeError:
+        # Nhóm luồng inter-op đã được khởi tạo trong process chính trước khi fork
+        pass
+    NewsSummarizer.warm_up(summarizer)
+    results.put((None, os.getpid(), None))
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        task_id, batch = task
+        try:
+            results.put((task_id, summarizer.summarize_bucket(batch), None))
+        except Exception as e:
+            results.put((task_id, None, str(e)))
+
+class ShardedSummarizer(NewsSummarizer):
+    """NewsSummarizer chia các nhóm văn bản cho nhiều process worker
+
+    Cùng giao diện process_batch(); không dùng đồng thời từ nhiều luồng
+    (SummarizerService đã xử lý lần lượt từng yêu cầu).
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        threads: Optional[int] = None,
+        interop_threads: int = 1,
+        start_timeout: float = 600,
+        **kwargs
+    ):
+        import torch
+
+        # Fork sau khi OpenMP đã tạo nhóm luồng làm worker bị treo, nên
+        # process chính chỉ dùng một luồng intra-op, kể cả khi tải mô hình
+        torch.set_num_threads(1)
+        super().__init__(**kwargs)
+        self.workers = workers
+        self.threads = threads or max(1, (os.cpu_count() or 1) // workers)
+        self.interop_threads = interop_threads
+        self.start_timeout = start_timeout
+        self.processes: List[multiprocessing.Process] = []
+        self.restarts = 0
+        self._calls = 0
+        atexit.register(self.close)
+        self.start()
+
+    def start(self) -> None:
+        """Fork các worker và đợi đến khi tất cả đã làm nóng mô hình
+
+        Dùng hàng đợi mới mỗi lần: worker bị dừng giữa chừng có thể để lại
+        khóa của hàng đợi cũ ở trạng thái đang giữ.
+        """
+        context = multiprocessing.get_context("fork")
+        self._tasks = context.Queue()
+        self._results = context.Queue()
+        # Các đối tượng hiện có (kể cả trọng số mô hình) không bị GC của worker
+        # chạm vào, để các trang bộ nhớ được dùng chung thay vì bị sao chép
+        gc.freeze()
+        try:
+            for _ in range(self.workers):
+                process = context.Process(
+                    target=_worker_main,
+                    args=(self, self._tasks, self._results, self.threads, self.interop_threads),
+                    daemon=True
+                )
+                process.start()
+                self.processes.append(process)
+        finally:
+            gc.unfreeze()
+
+        try:
+            for _ in range(self.workers):
+                self._next_result(self.start_timeout)
+        except BaseException:
+            # Lần gọi sau sẽ thử khởi động lại từ đầu
+            self._stop()
+            raise
+        print(f"Đã khởi động {self.workers} worker tóm tắt, mỗi worker {self.threads} luồng")
+
+    def _stop(self) -> None:
+        for process in self.processes:
+            if process.is_alive():
+                process.kill()
+            process.join(timeout=5)
+        self.processes = []
+
+    def restart(self) -> None:
+        """Dừng mọi worker và fork lại từ mô hình đã tải trong process chính
+
+        Process chính vẫn chỉ dùng một luồng intra-op nên fork lại được; các
+        luồng khác của dịch vụ chỉ chờ trên socket, không giữ khóa nào.
+        """
+        self.restarts += 1
+        self._stop()
+        self.start()
+
+    def close(self) -> None:
+        """Dừng các worker"""
+        for _ in self.processes:
+            self._tasks.put(None)
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
+
+    def warm_up(self) -> bool:
+        """Các worker đã tự làm nóng mô hình trong start()"""
+        return False
+
+    def _next_result(self, timeout: Optional[float] = None) -> Tuple:
+        waited = 0.0
+        while True:
+            try:
+                return self._results.get(timeout=1.0)
+            except queue.Empty:
+                waited += 1.0
+                dead = [process for process in self.processes if not process.is_alive()]
+                if dead:
+                    raise WorkerDied(f"{len(dead)} worker tóm tắt đã dừng (mã thoát {dead[0].exitcode})")
+                if timeout is not None and waited >= timeout:
+                    raise TimeoutError("Worker tóm tắt không phản hồi sau thời gian chờ")
+
+    def bucket_size(self, count: int, batch_size: int) -> int:
+        # Đủ nhóm để mọi worker đều có việc, nhưng không lớn hơn batch_size
+        return max(1, min(batch_size, -(-count // self.workers)))
+
+    def summarize_buckets(self, batches: List[List[str]]) -> Iterator[Tuple[List[str], List[str]]]:
+        """Chia các nhóm cho worker và trả kết quả đúng thứ tự
+
+        Khi một worker dừng, mọi worker được khởi động lại và các nhóm chưa
+        có kết quả được gửi lại (tối đa MAX_RESTARTS lần mỗi lần gọi).
+        """
+        if not self.processes:
+            # Lần khởi động trước bị lỗi
+            self.restart()
+
+        # Kết quả của lần gọi trước bị bỏ dở (nếu có) được nhận diện bằng số thứ tự lần gọi
+        self._calls += 1
+        call = self._calls
+        for index, batch in enumerate(batches):
+            self._tasks.put(((call, index), batch))
+
+        received = {}
+        restarts = 0
+        for index, batch in enumerate(batches):
+            while index not in received:
+                try:
+                    task_id, result, error = self._next_result()
+                except WorkerDied as e:
+                    if restarts >= MAX_RESTARTS:
+                        raise
+                    restarts += 1
+                    missing = [i for i in range(index, len(batches)) if i not in received]
+                    print(f"{e}: khởi động lại các worker và gửi lại {len(missing)} nhóm")
+                    self.restart()
+                    for i in missing:
+                        self._tasks.put(((call, i), batches[i]))
+                    continue
+                if task_id is not None and task_id[0] == call:
+                    received[task_id[1]] = (result, error)
+            result, error = received.pop(index)
+            if error is not None:
+                print(f"Worker tóm tắt lỗi, xử lý nhóm trong process chính: {error}")
+                result = self.summarize_bucket(batch)
+            summaries, methods, elapsed = result
+            yield self.finish_bucket(batch, summaries, methods, elapsed), methods
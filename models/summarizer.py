@@ -1,200 +1,458 @@
-from transformers import pipeline
-import torch
-import json
-import re
-from typing import List, Dict, Tuple
-import unicodedata
-from nltk.tokenize import sent_tokenize
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-import nltk
-from concurrent.futures import ThreadPoolExecutor
-from functools import partial
-
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-
-def normalize_vietnamese(text: str) -> str:
-    """Chuẩn hóa unicode cho tiếng Việt"""
-    return unicodedata.normalize('NFKC', text)
-
-def clean_text(text: str) -> str:
-    """Làm sạch và chuẩn hóa text tiếng Việt"""
-    # Chuẩn hóa unicode
-    text = normalize_vietnamese(text)
-    
-    # Giữ lại các ký tự tiếng Việt và dấu câu quan trọng
-    text = re.sub(r'[^\w\s\đĐơƠưƯăĂâÂêÊôÔơƠưƯáàảãạéèẻẽẹíìỉĩịóòỏõọúùủũụýỳỷỹỵÁÀẢÃẠÉÈẺẼẸÍÌỈĨỊÓÒỎÕỌÚÙỦŨỤÝỲỶỸỴ\.,!?-]', ' ', text)
-    
-    # Xóa khoảng trắng thừa
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
-
-def extract_key_sentences(text: str, num_sentences: int = 2) -> str:
-    """Trích xuất các câu quan trọng nhất dựa trên TF-IDF"""
-    # Tách câu
-    sentences = sent_tokenize(text)
-    if len(sentences) <= num_sentences:
-        return text
-    
-    # Nếu văn bản quá dài, chỉ lấy 500 từ đầu tiên
-    words = text.split()
-    if len(words) > 500:
-        text = ' '.join(words[:500])
-        sentences = sent_tokenize(text)
-    
-    # Tính TF-IDF nhanh hơn với ít features hơn
-    vectorizer = TfidfVectorizer(max_features=500, stop_words=None)
-    tfidf_matrix = vectorizer.fit_transform(sentences)
-    
-    # Tính điểm cho mỗi câu
-    sentence_scores = []
-    for i, sentence in enumerate(sentences):
-        score = np.sum(tfidf_matrix[i].toarray())
-        sentence_scores.append((score, i, sentence))
-    
-    # Chọn các câu có điểm cao nhất
-    sentence_scores.sort(reverse=True)
-    selected_indices = [x[1] for x in sentence_scores[:num_sentences]]
-    selected_indices.sort()
-    ordered_sentences = [sentences[i] for i in selected_indices]
-    
-    return ' '.join(ordered_sentences)
+import asyncio
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+import sys
+import os
+
+# Thêm thư mục gốc vào PYTHONPATH để import các module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data.storage import export_enabled, open_storage
+from data.vietnamese import clean_text, clean_texts, split_sentences
+from models.summary_cache import SummaryCache, summary_key
+from models.summarizer_service import SummarizerClient
+from models.backends import default_backend, load_summarization_pipeline
+from models.extractive import extract_key_sentences, extract_key_sentences_batch
+from pipeline.metrics import CYCLE_SECONDS, SIZE_BUCKETS, counter, gauge, histogram, publish
+
+MODEL_NAME = os.environ.get("SUMMARIZER_MODEL", "facebook/bart-large-cnn")
+
+# Tham số sinh tối ưu cho tốc độ
+GENERATION_KWARGS = {
+    "max_length": 130,      # Giảm độ dài tối đa
+    "min_length": 30,       # Giảm độ dài tối thiểu
+    "length_penalty": 1.0,  # Giảm penalty
+    "num_beams": 2,         # Giảm beam search
+    "early_stopping": True
+}
+
+# Số token tối đa của một văn bản đưa vào mô hình; văn bản dài hơn (toàn văn
+# bài viết) được chia đoạn và tóm tắt theo kiểu map-reduce
+MAX_INPUT_TOKENS = int(os.environ.get("SUMMARIZER_MAX_INPUT_TOKENS", "512"))
+# Số vòng rút gọn tối đa; mỗi vòng giảm độ dài khoảng max_input_tokens / max_length lần
+MAX_REDUCE_ROUNDS = 3
+# Số bài mỗi lần gọi process_batch() trong summarize_news()
+SUMMARIZE_CHUNK_SIZE = 32
+
+# method: model (mô hình), cache, extractive (không tải được mô hình),
+# fallback (mô hình lỗi, dùng trích xuất câu)
+SUMMARIZED_TEXTS = counter("news_summarizer_texts", "Số văn bản (kể cả các đoạn của bài dài) đã tóm tắt theo cách tóm tắt", ("method",))
+BATCH_SIZE = histogram(
+    "news_summarizer_batch_size", "Số văn bản mỗi lần gọi mô hình", ("method",), buckets=SIZE_BUCKETS
+)
+BATCH_SECONDS = histogram("news_summarizer_batch_seconds", "Thời gian mỗi lần gọi mô hình", ("method",))
+INPUT_TOKENS = counter("news_summarizer_input_tokens", "Số token đầu vào đã đưa qua mô hình")
+TOKENS_PER_SECOND = gauge("news_summarizer_tokens_per_second", "Token đầu vào mỗi giây của lần gọi mô hình gần nhất")
 
 class NewsSummarizer:
-    def __init__(self):
+    def __init__(
+        self,
+        cache: Optional[SummaryCache] = None,
+        model_name: str = MODEL_NAME,
+        backend: Optional[str] = None,
+        max_input_tokens: int = MAX_INPUT_TOKENS
+    ):
+        self.model_name = model_name
+        self.backend = backend or default_backend()
+        self.generation_kwargs = dict(GENERATION_KWARGS)
+        self.max_input_tokens = max_input_tokens
+        self.cache = cache if cache is not None else SummaryCache()
+
+        # torch chỉ được import khi thực sự tạo summarizer
+        import torch
+
         # Khởi tạo model và tokenizer
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         print(f"Sử dụng thiết bị: {self.device}")
         
         # Tạo pipeline với mô hình nhỏ hơn và nhanh hơn
         try:
-            self.summarizer = pipeline(
-                "summarization",
-                model="facebook/bart-large-cnn",  # Sử dụng mô hình nhanh hơn
+            self.summarizer = load_summarization_pipeline(
+                self.model_name,  # Sử dụng mô hình nhanh hơn
+                self.backend,
                 device=0 if torch.cuda.is_available() else -1
             )
-            print("Đã tải mô hình BART-CNN")
+            print(f"Đã tải mô hình BART-CNN (backend {self.backend})")
         except Exception as e:
             print(f"Không thể tải mô hình: {str(e)}")
             print("Sử dụng phương pháp trích xuất câu quan trọng")
             self.summarizer = None
 
+    def cache_key(self, text: str) -> str:
+        """Khóa cache của văn bản đã tiền xử lý với mô hình đang dùng"""
+        if self.summarizer is not None:
+            return summary_key(text, f"{self.model_name}@{self.backend}", self.generation_kwargs)
+        return summary_key(text, "extractive", {"num_sentences": 2})
+
     def process_single_text(self, text: str) -> str:
         """Xử lý một văn bản"""
         try:
             # Tiền xử lý
             text = self.preprocess_text(text)
+            if self.token_lengths([text])[0] > self.max_input_tokens:
+                # Văn bản dài: chia đoạn và tóm tắt theo map-reduce
+                return self.process_batch([text])[0]
+
+            key = self.cache_key(text)
+            cached = self.cache.get(key)
+            if cached is not None:
+                SUMMARIZED_TEXTS.inc(method="cache")
+                return cached
             
-            if self.summarizer is not None:
-                # Tóm tắt với tham số tối ưu cho tốc độ
-                summary = self.summarizer(
-                    text,
-                    max_length=130,      # Giảm độ dài tối đa
-                    min_length=30,       # Giảm độ dài tối thiểu
-                    length_penalty=1.0,   # Giảm penalty
-                    num_beams=2,         # Giảm beam search
-                    early_stopping=True
-                )[0]['summary_text']
-            else:
-                # Sử dụng phương pháp trích xuất
-                summary = extract_key_sentences(text, num_sentences=2)
+            method = "model" if self.summarizer is not None else "extractive"
+            with BATCH_SECONDS.time(method=method):
+                if self.summarizer is not None:
+                    # Tóm tắt với tham số tối ưu cho tốc độ
+                    summary = self.summarizer(text, **self.generation_kwargs)[0]['summary_text']
+                else:
+                    # Sử dụng phương pháp trích xuất
+                    summary = extract_key_sentences(text, num_sentences=2)
+            BATCH_SIZE.observe(1, method=method)
+            cleaned = self.summarizer is None
+            SUMMARIZED_TEXTS.inc(method=method)
             
-            return self.postprocess_summary(summary)
+            summary = self.postprocess_summary(summary, cleaned=cleaned)
+            self.cache.put(key, summary)
+            return summary
             
         except Exception as e:
             print(f"Lỗi khi xử lý văn bản: {str(e)}")
+            SUMMARIZED_TEXTS.inc(method="fallback")
             return extract_key_sentences(text, num_sentences=2)
 
     def preprocess_text(self, text: str) -> str:
-        """Tiền xử lý văn bản trước khi tóm tắt"""
-        # Làm sạch text
-        text = clean_text(text)
-        
-        # Giới hạn độ dài văn bản
-        words = text.split()
-        if len(words) > 500:
-            text = ' '.join(words[:500])
-        
-        return text
+        """Tiền xử lý văn bản trước khi tóm tắt
+
+        Không cắt độ dài: văn bản dài được chia đoạn trong process_batch().
+        """
+        return clean_text(text)
+
+    def preprocess_texts(self, texts: List[str]) -> List[str]:
+        """preprocess_text() cho cả batch"""
+        return clean_texts(texts)
 
-    def postprocess_summary(self, summary: str) -> str:
-        """Hậu xử lý bản tóm tắt"""
-        summary = clean_text(summary)
+    def postprocess_summary(self, summary: str, cleaned: bool = False) -> str:
+        """Hậu xử lý bản tóm tắt
+
+        cleaned=True khi bản tóm tắt gồm các câu lấy từ văn bản đã làm sạch
+        (tóm tắt trích xuất): không cần làm sạch lại.
+        """
+        if not cleaned:
+            summary = clean_text(summary)
         if not summary.endswith(('.', '!', '?')):
             summary += '.'
         return summary
 
+    def token_lengths(self, texts: List[str]) -> List[int]:
+        """Độ dài token của từng văn bản (số từ nếu không có tokenizer)"""
+        tokenizer = getattr(self.summarizer, "tokenizer", None)
+        if tokenizer is None:
+            return [len(text.split()) for text in texts]
+        # Không cắt: cần độ dài thật để biết văn bản nào phải chia đoạn
+        return [len(ids) for ids in tokenizer(texts, truncation=False, verbose=False)["input_ids"]]
+
+    def chunk_text(self, text: str) -> List[str]:
+        """Chia văn bản thành các đoạn liên tiếp theo ranh giới câu, mỗi đoạn tối đa max_input_tokens token"""
+        budget = self.max_input_tokens
+        sentences = split_sentences(text)
+        pieces: List[Tuple[str, int]] = []
+        for sentence, length in zip(sentences, self.token_lengths(sentences)):
+            if length <= budget:
+                pieces.append((sentence, length))
+                continue
+            # Câu quá dài (hoặc văn bản không có dấu câu): cắt theo số từ, chừa
+            # 10% vì số token mỗi từ không đều
+            words = sentence.split()
+            step = max(1, int(len(words) * budget * 0.9) // length)
+            for start in range(0, len(words), step):
+                piece = words[start:start + step]
+                pieces.append((" ".join(piece), length * len(piece) // len(words) + 1))
+
+        chunks: List[str] = []
+        current: List[str] = []
+        current_length = 0
+        for piece, length in pieces:
+            if current and current_length + length > budget:
+                chunks.append(" ".join(current))
+                current, current_length = [], 0
+            current.append(piece)
+            current_length += length
+        if current:
+            chunks.append(" ".join(current))
+        return chunks
+
+    def reduce_long_texts(self, texts: List[str], batch_size: int = 8) -> Tuple[List[str], List[bool]]:
+        """Rút gọn các văn bản dài hơn max_input_tokens token bằng map-reduce
+
+        Map: văn bản dài được chia đoạn (chunk_text()), các đoạn của mọi văn
+        bản được tóm tắt chung theo batch như văn bản thường (và qua cache).
+        Reduce: bản tóm tắt các đoạn của mỗi văn bản được nối lại theo thứ tự;
+        nếu vẫn quá dài thì lặp lại, tối đa MAX_REDUCE_ROUNDS vòng (sau đó
+        mô hình tự cắt phần thừa). Văn bản ngắn được giữ nguyên.
+
+        Trả về (văn bản, bị suy giảm): suy giảm khi có đoạn phải dùng bản tóm
+        tắt dự phòng, hoặc văn bản vẫn quá dài sau vòng cuối.
+        """
+        texts = list(texts)
+        degraded = [False] * len(texts)
+        for _ in range(MAX_REDUCE_ROUNDS):
+            lengths = self.token_lengths(texts)
+            long_indices = [i for i, length in enumerate(lengths) if length > self.max_input_tokens]
+            if not long_indices:
+                break
+            chunks: List[str] = []
+            owners: List[int] = []
+            for i in long_indices:
+                for chunk in self.chunk_text(texts[i]):
+                    chunks.append(chunk)
+                    owners.append(i)
+            partials, partial_degraded = self._summarize_prepared(chunks, batch_size, reduce_long=False)
+            joined: Dict[int, List[str]] = {i: [] for i in long_indices}
+            for i, partial, bad in zip(owners, partials, partial_degraded):
+                joined[i].append(partial)
+                degraded[i] = degraded[i] or bad
+            for i in long_indices:
+                texts[i] = " ".join(joined[i])
+        else:
+            for i, length in enumerate(self.token_lengths(texts)):
+                if length > self.max_input_tokens:
+                    degraded[i] = True
+        return texts, degraded
+
     def process_batch(self, texts: List[str], batch_size: int = 8) -> List[str]:
-        """Xử lý và tóm tắt một batch các văn bản song song"""
-        # Chia thành các batch nhỏ hơn
-        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
-        summaries = []
-        
-        # Xử lý song song các batch
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            for batch_summaries in executor.map(self.process_batch_internal, batches):
-                summaries.extend(batch_summaries)
-                print(f"Đã xử lý {len(summaries)}/{len(texts)} tin tức")
-        
-        return summaries
+        """Xử lý và tóm tắt một batch các văn bản
+
+        Các văn bản chưa có trong cache được sắp theo độ dài token và chia
+        thành các nhóm batch_size văn bản có độ dài gần nhau; mỗi nhóm là
+        một lần gọi mô hình với padding động tới văn bản dài nhất trong nhóm.
+        Văn bản dài hơn max_input_tokens token được rút gọn trước bằng
+        reduce_long_texts(). Kết quả được trả về đúng thứ tự đầu vào.
+        """
+        prepared = self.preprocess_texts(texts)
+        return self._summarize_prepared(prepared, batch_size)[0]
+
+    def _summarize_prepared(
+        self,
+        prepared: List[str],
+        batch_size: int,
+        reduce_long: bool = True
+    ) -> Tuple[List[str], List[bool]]:
+        """(bản tóm tắt, bị suy giảm) của các văn bản đã tiền xử lý
+
+        Suy giảm: bản tóm tắt dự phòng (trích xuất câu khi mô hình lỗi) của
+        văn bản hoặc của một đoạn khi rút gọn văn bản dài.
+        """
+        summaries: List[Optional[str]] = [None] * len(prepared)
+        degraded = [False] * len(prepared)
+
+        # Lấy từ cache, văn bản trùng nhau chỉ tóm tắt một lần
+        pending: Dict[str, List[int]] = {}
+        for i, text in enumerate(prepared):
+            key = self.cache_key(text)
+            cached = self.cache.get(key)
+            if cached is not None:
+                summaries[i] = cached
+            else:
+                pending.setdefault(key, []).append(i)
+
+        keys = list(pending)
+        unique_texts = [prepared[pending[key][0]] for key in keys]
+        reduced_degraded = [False] * len(keys)
+        if reduce_long and unique_texts:
+            unique_texts, reduced_degraded = self.reduce_long_texts(unique_texts, batch_size)
+        lengths = self.token_lengths(unique_texts) if unique_texts else []
+        order = sorted(range(len(keys)), key=lambda j: lengths[j])
+
+        done = len(prepared) - sum(len(indices) for indices in pending.values())
+        if done:
+            SUMMARIZED_TEXTS.inc(done, method="cache")
+        size = self.bucket_size(len(order), batch_size)
+        buckets = [order[start:start + size] for start in range(0, len(order), size)]
+        results = self.summarize_buckets([[unique_texts[j] for j in bucket] for bucket in buckets])
+        for bucket, (bucket_summaries, methods) in zip(buckets, results):
+            for j, summary, method in zip(bucket, bucket_summaries, methods):
+                bad = reduced_degraded[j] or method == "fallback"
+                if unique_texts[j] != prepared[pending[keys[j]][0]] and not bad:
+                    # Lưu cả theo văn bản gốc (trước khi rút gọn) để lần sau không phải chia đoạn lại;
+                    # bản suy giảm thì không, để lần sau thử lại với mô hình
+                    self.cache.put(keys[j], summary)
+                for i in pending[keys[j]]:
+                    summaries[i] = summary
+                    degraded[i] = bad
+                done += len(pending[keys[j]])
+            if reduce_long:
+                print(f"Đã xử lý {done}/{len(prepared)} tin tức")
+
+        if reduce_long:
+            print(self.cache.summary())
+        return summaries, degraded
+
+    def bucket_size(self, count: int, batch_size: int) -> int:
+        """Số văn bản mỗi lần gọi mô hình khi có count văn bản cần tóm tắt"""
+        return batch_size
+
+    def summarize_buckets(self, batches: List[List[str]]) -> Iterator[Tuple[List[str], List[str]]]:
+        """Tóm tắt lần lượt từng nhóm, trả (bản tóm tắt, cách tóm tắt) đúng thứ tự các nhóm
+
+        ShardedSummarizer chia các nhóm cho nhiều process worker.
+        """
+        for batch in batches:
+            summaries, methods, elapsed = self.summarize_bucket(batch)
+            yield self.finish_bucket(batch, summaries, methods, elapsed), methods
 
     def process_batch_internal(self, batch: List[str]) -> List[str]:
-        """Xử lý một batch nội bộ"""
-        return [self.process_single_text(text) for text in batch]
+        """Tóm tắt một nhóm văn bản đã tiền xử lý bằng một lần gọi mô hình"""
+        return self.finish_bucket(batch, *self.summarize_bucket(batch))
+
+    def summarize_bucket(self, batch: List[str]) -> Tuple[List[str], List[str], float]:
+        """Một lần gọi mô hình cho một nhóm văn bản, không dùng cache và không ghi chỉ số
+
+        Trả về (bản tóm tắt, cách tóm tắt từng văn bản, thời gian). Chạy được
+        trong process worker; cache và chỉ số do finish_bucket() ghi ở process chính.
+        """
+        start = time.perf_counter()
+        if self.summarizer is None:
+            summaries = [
+                self.postprocess_summary(summary, cleaned=True)
+                for summary in extract_key_sentences_batch(batch, num_sentences=2)
+            ]
+            return summaries, ["extractive"] * len(batch), time.perf_counter() - start
+        try:
+            outputs = self.summarizer(
+                batch,
+                batch_size=len(batch),
+                truncation=True,
+                **self.generation_kwargs
+            )
+        except Exception as e:
+            print(f"Lỗi khi tóm tắt theo batch, xử lý từng văn bản: {str(e)}")
+            results = [self._summarize_one(text) for text in batch]
+            return [summary for summary, _ in results], [method for _, method in results], time.perf_counter() - start
+        summaries = [self.postprocess_summary(output['summary_text']) for output in outputs]
+        return summaries, ["model"] * len(batch), time.perf_counter() - start
+
+    def _summarize_one(self, text: str) -> Tuple[str, str]:
+        try:
+            summary = self.summarizer(text, **self.generation_kwargs)[0]['summary_text']
+            return self.postprocess_summary(summary), "model"
+        except Exception as e:
+            print(f"Lỗi khi xử lý văn bản: {str(e)}")
+            return extract_key_sentences(text, num_sentences=2), "fallback"
+
+    def finish_bucket(self, batch: List[str], summaries: List[str], methods: List[str], elapsed: float) -> List[str]:
+        """Ghi chỉ số và lưu cache cho kết quả của summarize_bucket()"""
+        method = "model" if self.summarizer is not None else "extractive"
+        BATCH_SECONDS.observe(elapsed, method=method)
+        BATCH_SIZE.observe(len(batch), method=method)
+        for name in set(methods):
+            SUMMARIZED_TEXTS.inc(methods.count(name), method=name)
+        if self.summarizer is not None:
+            tokens = sum(self.token_lengths(batch))
+            INPUT_TOKENS.inc(tokens)
+            if elapsed > 0:
+                TOKENS_PER_SECOND.set(tokens / elapsed)
+
+        for text, summary, name in zip(batch, summaries, methods):
+            # Bản tóm tắt dự phòng không được lưu để lần sau thử lại mô hình
+            if name != "fallback":
+                self.cache.put(self.cache_key(text), summary)
+        return summaries
+
+    def warm_up(self) -> bool:
+        """Sinh thử một lần để khởi tạo kernel và bộ nhớ đệm của torch; False nếu không có mô hình"""
+        if self.summarizer is None:
+            return False
+        self.summarizer("Dịch vụ tóm tắt tin tức đang khởi động.", truncation=True, **self.generation_kwargs)
+        return True
+
+def build_text(news: Dict) -> str:
+    """Văn bản đầu vào cho mô hình: tiêu đề, mô tả và nội dung bài nếu đã tải (chế độ toàn văn)"""
+    text_parts = [news["title"]]
+    if news.get("description"):
+        text_parts.append(news["description"])
+    if news.get("body"):
+        text_parts.append(news["body"])
+    return " ".join(text_parts)
+
+async def _fetch_bodies(news_list: List[Dict], deadline: float) -> int:
+    from data.fetcher import AsyncFetcher
+    from data.news_crawler import fetch_article_bodies
+
+    async with AsyncFetcher(max_per_host=2) as fetcher:
+        return await fetch_article_bodies(news_list, fetcher, deadline=deadline)
+
+_local_summarizer = None
+
+def get_summarizer():
+    """Summarizer cho summarize_news()
+
+    Dùng dịch vụ tóm tắt chạy lâu dài nếu nó đang chạy; nếu không, dùng
+    một NewsSummarizer trong process hiện tại, chỉ tải mô hình một lần.
+    """
+    global _local_summarizer
+    client = SummarizerClient()
+    if client.ping():
+        return client
+    if _local_summarizer is None:
+        _local_summarizer = NewsSummarizer()
+    return _local_summarizer
 
 def summarize_news():
-    """Hàm chính để tóm tắt tin tức"""
+    """Hàm chính để tóm tắt tin tức
+
+    Chỉ các bài mới hoặc đã đổi nội dung (theo hash nội dung trong kho) mới
+    được đưa qua mô hình; các bài còn lại giữ bản tóm tắt và timestamp cũ.
+    Với NEWS_FULL_ARTICLE=1, trang bài viết được tải để tóm tắt toàn văn
+    trong giới hạn full_article_budget() giây; hết thời gian, các bài còn
+    lại chỉ được tóm tắt từ tiêu đề và mô tả.
+    """
     print("Bắt đầu tóm tắt tin tức...")
     
+    cycle_started = time.perf_counter()
+    storage = open_storage()
     try:
-        # Đọc dữ liệu
-        with open("data/raw_news.json", "r", encoding="utf-8") as f:
-            news_list = json.load(f)
-        
-        # Khởi tạo summarizer
-        summarizer = NewsSummarizer()
+        # Mỗi link là một dòng trong kho nên chỉ được tóm tắt một lần,
+        # dù bài xuất hiện ở nhiều category
+        pending = storage.pending_summaries()
+        print(f"Có {len(pending)}/{storage.count()} tin mới hoặc đã thay đổi cần tóm tắt")
         
-        # Chuẩn bị danh sách văn bản
-        texts = []
-        for news in news_list:
-            # Chỉ sử dụng tiêu đề và mô tả để tăng tốc
-            text_parts = [news["title"]]
-            if news.get("description"):
-                text_parts.append(news["description"])
-            text = " ".join(text_parts)
-            texts.append(text)
-        
-        total = len(texts)
-        print(f"Bắt đầu xử lý {total} tin tức...")
-        
-        # Xử lý theo batch
-        summaries = summarizer.process_batch(texts)
-        
-        # Tạo kết quả
-        processed_news = []
-        for i, (news, summary) in enumerate(zip(news_list, summaries), 1):
-            processed_news.append({
-                "title": news["title"],
-                "link": news["link"],
-                "summary": summary,
-                "description": news.get("description", ""),
-                "category": news["category"],
-                "source": news["source"],
-                "timestamp": news["timestamp"]
-            })
-        
-        # Lưu kết quả
-        with open("data/processed_news.json", "w", encoding="utf-8") as f:
-            json.dump(processed_news, f, ensure_ascii=False, indent=2)
+        if pending:
+            # Lấy summarizer (dịch vụ đã tải sẵn mô hình nếu có)
+            summarizer = get_summarizer()
+            
+            from data.news_crawler import full_article_budget, full_article_enabled
+
+            started = time.monotonic()
+            budget = full_article_budget() if full_article_enabled() else 0.0
+            if budget > 0:
+                fetched = asyncio.run(_fetch_bodies(pending, started + budget))
+                print(f"Đã tải nội dung của {fetched}/{len(pending)} bài")
+
+            # Xử lý theo batch, ghi toàn bộ kết quả trong một transaction
+            summaries = []
+            for i in range(0, len(pending), SUMMARIZE_CHUNK_SIZE):
+                chunk = pending[i:i + SUMMARIZE_CHUNK_SIZE]
+                if time.monotonic() - started >= budget:
+                    # Hết thời gian cho toàn văn: chỉ tóm tắt tiêu đề và mô tả
+                    for news in chunk:
+                        news.pop("body", None)
+                summaries.extend(summarizer.process_batch([build_text(news) for news in chunk]))
+            storage.save_summaries(list(zip(pending, summaries)))
+
+        pruned = storage.prune()
+        if pruned:
+            print(f"Đã xóa {pruned} tin cũ khỏi kho")
+        if export_enabled():
+            storage.export_json()
         
+        CYCLE_SECONDS.observe(time.perf_counter() - cycle_started, mode="summarize")
+        publish(storage, "summarizer")
         print("Đã hoàn thành tóm tắt tin tức!")
         
     except Exception as e:
         print(f"Lỗi trong quá trình xử lý: {str(e)}")
         raise
+    finally:
+        storage.close()
 
 if __name__ == "__main__":
     summarize_news()
@@ -0,0 +1,206 @@
+"""Dịch vụ tóm tắt chạy lâu dài
+
+Mô hình chỉ được tải một lần khi dịch vụ khởi động và được "làm nóng" bằng
+một lần sinh thử; summarize_news() gửi văn bản qua socket cục bộ thay vì
+tải lại mô hình mỗi chu kỳ. Với SUMMARIZER_WORKERS > 1 dịch vụ dùng
+ShardedSummarizer (models/sharded_summarizer.py) để chia việc cho nhiều process.
+
+Client và dịch vụ xác thực bằng khóa SUMMARIZER_AUTHKEY, hoặc nếu không đặt,
+bằng khóa ngẫu nhiên trong data/.summarizer_authkey (quyền 0600). Dịch vụ
+chỉ mở ở địa chỉ ngoài máy cục bộ khi SUMMARIZER_AUTHKEY được đặt.
+
+    python models/summarizer_service.py
+"""
+import ipaddress
+import os
+import secrets
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from typing import List, Optional, Tuple
+
+# Thêm thư mục gốc vào PYTHONPATH để import các module
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+Address = Tuple[str, int]
+
+def default_address() -> Address:
+    """Địa chỉ dịch vụ từ biến môi trường SUMMARIZER_ADDRESS (host:port)"""
+    host, _, port = os.environ.get("SUMMARIZER_ADDRESS", "127.0.0.1:6001").rpartition(":")
+    return (host or "127.0.0.1", int(port))
+
+# Khóa sinh ngẫu nhiên khi không đặt SUMMARIZER_AUTHKEY; chỉ chủ sở hữu đọc được
+AUTHKEY_PATH = os.path.join(ROOT_DIR, "data", ".summarizer_authkey")
+
+def default_authkey(path: str = AUTHKEY_PATH) -> bytes:
+    """Khóa xác thực từ SUMMARIZER_AUTHKEY, hoặc từ file khóa (tạo mới với quyền 0600 nếu chưa có)
+
+    Kết nối dùng pickle nên ai có khóa là chạy được mã trong dịch vụ; khóa
+    không bao giờ là một giá trị cố định.
+    """
+    key = os.environ.get("SUMMARIZER_AUTHKEY")
+    if key:
+        return key.encode("utf-8")
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        with open(path, "rb") as f:
+            key = f.read().strip()
+        if key:
+            return key
+        # File rỗng: process khác vừa tạo và chưa kịp ghi
+        time.sleep(0.1)
+        with open(path, "rb") as f:
+            return f.read().strip()
+    key = secrets.token_hex(32).encode("ascii")
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
+
+def is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+class SummarizerService:
+    """Giữ một NewsSummarizer trong bộ nhớ và phục vụ yêu cầu qua socket"""
+
+    def __init__(self, address: Optional[Address] = None, authkey: Optional[bytes] = None):
+        self.address = address or default_address()
+        if not is_loopback(self.address[0]) and authkey is None and not os.environ.get("SUMMARIZER_AUTHKEY"):
+            raise ValueError(
+                f"Không mở dịch vụ tóm tắt ở địa chỉ {self.address[0]} ngoài máy cục bộ khi chưa đặt SUMMARIZER_AUTHKEY"
+            )
+        self.authkey = authkey or default_authkey()
+
+        from models.sharded_summarizer import ShardedSummarizer, sharding_config
+        from models.summarizer import NewsSummarizer
+
+        workers, threads, interop_threads = sharding_config()
+        if workers > 1:
+            # Chia các nhóm văn bản cho nhiều process, mỗi process một phần số nhân CPU
+            self.summarizer = ShardedSummarizer(workers, threads, interop_threads)
+        else:
+            if threads:
+                import torch
+
+                torch.set_num_threads(threads)
+            self.summarizer = NewsSummarizer()
+        # Chỉ có một mô hình nên các yêu cầu được xử lý lần lượt
+        self._lock = threading.Lock()
+        self._publisher = None
+        self.warm_up()
+
+    def warm_up(self) -> None:
+        """Sinh thử một lần để khởi tạo kernel và bộ nhớ đệm của torch"""
+        start = time.perf_counter()
+        if self.summarizer.warm_up():
+            print(f"Đã làm nóng mô hình trong {time.perf_counter() - start:.1f}s")
+
+    def handle(self, request: dict) -> dict:
+        op = request.get("op")
+        if op == "ping":
+            return {"status": "ok", "model": self.summarizer.model_name}
+        if op == "summarize":
+            with self._lock:
+                summaries = self.summarizer.process_batch(
+                    request["texts"], batch_size=request.get("batch_size", 8)
+                )
+                self.publish_metrics()
+            return {"summaries": summaries}
+        return {"error": f"Yêu cầu không hợp lệ: {op}"}
+
+    def publish_metrics(self) -> None:
+        """Ghi chỉ số của mô hình vào kho (tối đa mỗi 15 giây) để /metrics của API xuất lại"""
+        if self._publisher is None:
+            from data.storage import open_storage
+            from pipeline.metrics import Publisher
+
+            try:
+                self._publisher = Publisher(open_storage(), "summarizer_service")
+            except Exception as e:
+                # Không thử lại ở mỗi yêu cầu
+                print(f"Không thể mở kho để ghi chỉ số: {str(e)}")
+                self._publisher = False
+        if self._publisher:
+            self._publisher.maybe_publish()
+
+    def _serve_connection(self, conn) -> None:
+        try:
+            while True:
+                try:
+                    request = conn.recv()
+                except EOFError:
+                    break
+                try:
+                    response = self.handle(request)
+                except Exception as e:
+                    response = {"error": str(e)}
+                conn.send(response)
+        finally:
+            conn.close()
+
+    def serve_forever(self) -> None:
+        with Listener(self.address, authkey=self.authkey) as listener:
+            print(f"Dịch vụ tóm tắt đang chạy tại {self.address[0]}:{self.address[1]}")
+            while True:
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    print(f"Lỗi khi nhận kết nối: {str(e)}")
+                    continue
+                threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+
+class SummarizerClient:
+    """Client của SummarizerService, cùng giao diện process_batch() với NewsSummarizer"""
+
+    def __init__(self, address: Optional[Address] = None, authkey: Optional[bytes] = None):
+        self.address = address or default_address()
+        self.authkey = authkey or default_authkey()
+
+    def _request(self, request: dict) -> dict:
+        with Client(self.address, authkey=self.authkey) as conn:
+            conn.send(request)
+            response = conn.recv()
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response
+
+    def ping(self) -> bool:
+        try:
+            return self._request({"op": "ping"}).get("status") == "ok"
+        except (OSError, EOFError, RuntimeError, AuthenticationError):
+            # Sai khóa cũng coi như không có dịch vụ: summarize_news() tóm tắt trong process
+            return False
+
+    def process_batch(self, texts: List[str], batch_size: int = 8) -> List[str]:
+        return self._request({"op": "summarize", "texts": texts, "batch_size": batch_size})["summaries"]
+
+def start_service_process(timeout: float = 600) -> Optional[subprocess.Popen]:
+    """Chạy dịch vụ trong process riêng và đợi đến khi nó sẵn sàng
+
+    Trả về None nếu đã có dịch vụ đang chạy ở địa chỉ mặc định.
+    """
+    client = SummarizerClient()
+    if client.ping():
+        return None
+    process = subprocess.Popen([sys.executable, os.path.abspath(__file__)], cwd=ROOT_DIR)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Dịch vụ tóm tắt đã dừng với mã {process.returncode}")
+        if client.ping():
+            return process
+        time.sleep(1)
+    process.terminate()
+    raise TimeoutError("Dịch vụ tóm tắt không sẵn sàng sau thời gian chờ")
+
+if __name__ == "__main__":
+    SummarizerService().serve_forever()
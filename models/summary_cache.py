@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from data.storage import default_data_dir
+
+def summary_key(text: str, model_id: str, params: Dict) -> str:
+    """Khóa cache: hash của văn bản đã tiền xử lý, mô hình và tham số sinh"""
+    payload = json.dumps({"model": model_id, "params": params, "text": text}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class SummaryCache:
+    """Cache bản tóm tắt theo nội dung, hai tầng
+
+    Tầng LRU trong bộ nhớ nằm trên tầng SQLite trên đĩa, nên cùng một văn
+    bản (tin được nhiều báo đăng lại, khởi động lại web app, chạy lại sau
+    khi lỗi) không phải tóm tắt lại. Mục quá max_age_days ngày hoặc vượt
+    quá max_entries (mục ít dùng nhất) sẽ bị xóa.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        memory_size: int = 4096,
+        max_entries: int = 200000,
+        max_age_days: float = 30,
+        evict_every: int = 1000
+    ):
+        self.path = path or os.path.join(default_data_dir(), "summary_cache.sqlite")
+        self.memory_size = memory_size
+        self.max_entries = max_entries
+        self.max_age = max_age_days * 86400
+        self.evict_every = evict_every
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._puts = 0
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS summaries (
+                key TEXT PRIMARY KEY,
+                summary TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_summaries_accessed ON summaries (accessed_at)")
+        self.conn.commit()
+        self.evict()
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+    def _remember(self, key: str, summary: str) -> None:
+        self._memory[key] = summary
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            summary = self._memory.get(key)
+            if summary is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return summary
+
+            row = self.conn.execute("SELECT summary FROM summaries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            self.conn.execute("UPDATE summaries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+            self._remember(key, row[0])
+            self.stats["disk_hits"] += 1
+            return row[0]
+
+    def put(self, key: str, summary: str) -> None:
+        with self._lock:
+            now = time.time()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, summary, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, summary, now, now)
+            )
+            self.conn.commit()
+            self._remember(key, summary)
+            self._puts += 1
+            should_evict = self._puts % self.evict_every == 0
+        if should_evict:
+            self.evict()
+
+    def evict(self) -> int:
+        """Xóa mục quá hạn và các mục ít dùng nhất khi vượt quá max_entries"""
+        with self._lock:
+            removed = self.conn.execute(
+                "DELETE FROM summaries WHERE created_at < ?", (time.time() - self.max_age,)
+            ).rowcount
+            count = self.conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+            if count > self.max_entries:
+                removed += self.conn.execute(
+                    """
+                    DELETE FROM summaries WHERE key IN (
+                        SELECT key FROM summaries ORDER BY accessed_at LIMIT ?
+                    )
+                    """,
+                    (count - self.max_entries,)
+                ).rowcount
+            self.conn.commit()
+            if removed:
+                # Tầng bộ nhớ có thể giữ mục vừa bị xóa trên đĩa
+                self._memory.clear()
+            return removed
+
+    def hit_rate(self) -> float:
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"Cache tóm tắt: {self.stats['memory_hits']} hit bộ nhớ, "
+            f"{self.stats['disk_hits']} hit đĩa, {self.stats['misses']} miss "
+            f"(tỉ lệ hit {self.hit_rate():.0%})"
+        )
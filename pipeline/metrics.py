@@ -0,0 +1,272 @@
+"""Chỉ số đo (counter, gauge, histogram) và xuất theo định dạng Prometheus
+
+Mỗi process giữ các chỉ số của mình trong REGISTRY; ghi nhận một giá trị
+chỉ là một phép cộng dưới lock nên có thể bật thường xuyên trong production.
+API (FastAPI) và web app (Flask) xuất chỉ số qua /metrics.
+
+Crawler, pipeline và dịch vụ tóm tắt không có HTTP server: các process này
+định kỳ ghi snapshot chỉ số vào bảng meta của kho (publish()), và /metrics
+của API xuất thêm các snapshot đó, phân biệt bằng nhãn process.
+
+    from pipeline.metrics import histogram
+    FETCH_SECONDS = histogram("news_fetch_seconds", "Thời gian tải một URL", ("host",))
+    FETCH_SECONDS.observe(0.12, host="vnexpress.net")
+"""
+import bisect
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Tiền tố khóa trong bảng meta của kho cho snapshot của từng process
+META_PREFIX = "metrics:"
+
+# Bucket mặc định (giây): từ một request nhanh tới cả chu kỳ crawl 30 phút
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0
+)
+# Bucket cho kích thước batch (số văn bản/số tin)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+# (hậu tố tên, nhãn, giá trị)
+Sample = Tuple[str, Dict[str, str], float]
+
+class Metric(ABC):
+    """Một họ chỉ số có nhãn; mỗi tổ hợp giá trị nhãn là một chuỗi riêng"""
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} cần các nhãn {self.labelnames}, nhận {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abstractmethod
+    def samples(self) -> List[Sample]:
+        """Các mẫu (hậu tố tên, nhãn, giá trị) hiện tại để xuất"""
+        pass
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        return [("_total", dict(zip(self.labelnames, key)), value) for key, value in items]
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        return [("", dict(zip(self.labelnames, key)), value) for key, value in items]
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Số lần quan sát theo từng bucket (không cộng dồn), bucket cuối là +Inf; tổng
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Đo thời gian chạy của khối lệnh (kể cả khi có exception)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            items = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        samples = []
+        for key, counts, total in items:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                samples.append(("_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            samples.append(("_sum", labels, total))
+            samples.append(("_count", labels, cumulative))
+        return samples
+
+class Registry:
+    """Các họ chỉ số của một process, theo tên"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        """Đăng ký chỉ số; nếu tên đã có (module được import lại) thì trả về chỉ số cũ"""
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Chỉ số {metric.name} đã được đăng ký với kiểu hoặc nhãn khác")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Giá trị hiện tại của mọi chỉ số, dạng JSON được"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            metric.name: {"type": metric.type, "help": metric.documentation, "samples": metric.samples()}
+            for metric in metrics
+        }
+
+REGISTRY = Registry()
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return REGISTRY.register(Gauge(name, documentation, labelnames))
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    buckets: Sequence[float] = DEFAULT_BUCKETS
+) -> Histogram:
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+# Dùng chung cho các cách chạy một chu kỳ cập nhật (pipeline streaming, summarize_news, ...)
+CYCLE_SECONDS = histogram("news_cycle_seconds", "Thời gian một chu kỳ cập nhật tin", ("mode",))
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def render(snapshots: Dict[str, Dict[str, Dict]]) -> str:
+    """Định dạng text của Prometheus cho snapshot của nhiều process (process -> snapshot)
+
+    Các chuỗi của cùng một chỉ số từ nhiều process được gộp vào một họ,
+    phân biệt bằng nhãn process.
+    """
+    families: Dict[str, Dict] = {}
+    for process, snapshot in snapshots.items():
+        for name, data in snapshot.items():
+            family = families.setdefault(name, {"type": data["type"], "help": data["help"], "samples": []})
+            for suffix, labels, value in data["samples"]:
+                family["samples"].append((suffix, {"process": process, **labels}, value))
+
+    lines = []
+    for name in sorted(families):
+        family = families[name]
+        # Ở định dạng text 0.0.4 tên họ phải trùng tên mẫu: mẫu của counter là <tên>_total
+        family_name = f"{name}_total" if family["type"] == "counter" else name
+        lines.append(f"# HELP {family_name} {_escape(family['help'])}")
+        lines.append(f"# TYPE {family_name} {family['type']}")
+        for suffix, labels, value in family["samples"]:
+            label_text = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+            lines.append(f"{name}{suffix}{{{label_text}}} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+def publish(storage, process: str) -> None:
+    """Ghi snapshot chỉ số của process này vào kho để /metrics của API xuất lại"""
+    data = {"updated_at": time.time(), "metrics": REGISTRY.snapshot()}
+    storage.set_meta(META_PREFIX + process, json.dumps(data, ensure_ascii=False))
+
+def published(storage) -> Dict[str, Dict[str, Dict]]:
+    """Snapshot chỉ số các process khác đã ghi vào kho, kèm tuổi của mỗi snapshot"""
+    snapshots = {}
+    now = time.time()
+    for key, value in storage.meta_items(META_PREFIX).items():
+        try:
+            data = json.loads(value)
+        except ValueError:
+            continue
+        metrics = data.get("metrics", {})
+        metrics["news_metrics_snapshot_age_seconds"] = {
+            "type": "gauge",
+            "help": "Số giây từ lần cuối process ghi snapshot chỉ số vào kho",
+            "samples": [("", {}, max(0.0, now - data.get("updated_at", now)))],
+        }
+        snapshots[key[len(META_PREFIX):]] = metrics
+    return snapshots
+
+class Publisher:
+    """Ghi snapshot chỉ số vào kho, tối đa một lần mỗi interval giây"""
+
+    def __init__(self, storage, process: str, interval: float = 15.0):
+        self.storage = storage
+        self.process = process
+        self.interval = interval
+        self._published_at = float("-inf")
+
+    def maybe_publish(self, force: bool = False) -> bool:
+        now = time.monotonic()
+        if not force and now - self._published_at < self.interval:
+            return False
+        self._published_at = now
+        try:
+            publish(self.storage, self.process)
+        except Exception as e:
+            # Chỉ số không được làm hỏng công việc chính
+            print(f"Không thể ghi chỉ số vào kho: {str(e)}")
+            return False
+        return True
+
+def render_process(process: str, storage=None) -> str:
+    """/metrics của một process có HTTP server: chỉ số của nó và (nếu có kho) của các process khác"""
+    snapshots = {process: REGISTRY.snapshot()}
+    if storage is not None:
+        try:
+            for name, snapshot in published(storage).items():
+                snapshots.setdefault(name, snapshot)
+        except Exception as e:
+            print(f"Không thể đọc chỉ số từ kho: {str(e)}")
+    return render(snapshots)
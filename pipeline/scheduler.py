@@ -0,0 +1,263 @@
+"""Scheduler crawl theo từng feed (nguồn, category) với tần suất tự điều chỉnh
+
+Mỗi feed ghi nhận số link mới của mỗi lần tải và ước lượng tốc độ ra tin
+(link mới/giây, trung bình trượt mũ). Khoảng cách giữa hai lần tải được
+chọn sao cho mỗi lần tải có khoảng target_new link mới, trong giới hạn
+[min_interval, max_interval]: feed ra tin nhanh như thời sự được tải
+thường xuyên hơn, feed chậm ít hơn. Lịch có jitter ngẫu nhiên để các feed
+không dồn vào cùng thời điểm, và các request tới cùng host cách nhau ít
+nhất host_delay giây.
+
+Tin của mỗi feed được đẩy vào StreamingPipeline dùng chung, nên việc tóm
+tắt chạy song song với các lần crawl tiếp theo thay vì theo chu kỳ tuần
+tự. Tốc độ ra tin đã học được lưu trong kho để giữ lại sau khi khởi động
+lại.
+
+    python pipeline/scheduler.py
+"""
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, FrozenSet, List, Optional
+
+# Thêm thư mục gốc vào PYTHONPATH để import các module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data.fetcher import AsyncFetcher, host_of
+from data.http_cache import ResponseCache
+from data.news_crawler import NewsCrawler, default_parse_workers, get_crawlers, parse_pool
+from data.storage import NewsStorage, export_enabled, normalize_link, open_storage
+from pipeline.metrics import Publisher, histogram
+from pipeline.streaming import StreamingPipeline
+
+# Khóa trong bảng meta của kho
+STATE_KEY = "scheduler_feeds"
+NEXT_POLL_KEY = "scheduler_next_poll"
+
+POLL_SECONDS = histogram("news_scheduler_poll_seconds", "Thời gian tải và parse một feed theo nguồn", ("source",))
+
+@dataclass
+class Feed:
+    """Một trang category của một nguồn và trạng thái lịch tải của nó"""
+    crawler: NewsCrawler
+    category: str
+    url: str
+    interval: float
+    next_due: float = 0.0
+    # Tốc độ ra tin ước lượng (link mới/giây); None khi chưa đủ hai lần tải
+    rate: Optional[float] = None
+    last_polled: Optional[float] = None
+    last_links: FrozenSet[str] = frozenset()
+    polls: int = 0
+    new_links: int = 0
+
+    @property
+    def key(self) -> str:
+        return f"{self.crawler.source}|{self.category}"
+
+    @property
+    def host(self) -> str:
+        return host_of(self.url)
+
+class FeedScheduler:
+    """Lập lịch và chạy các lần tải feed, tóm tắt song song qua StreamingPipeline"""
+
+    def __init__(
+        self,
+        crawlers: Optional[List[NewsCrawler]] = None,
+        initial_interval: float = 30 * 60,
+        min_interval: float = 5 * 60,
+        max_interval: float = 2 * 60 * 60,
+        target_new: float = 4.0,
+        alpha: float = 0.3,
+        jitter: float = 0.1,
+        host_delay: float = 2.0,
+        seed: Optional[int] = None
+    ):
+        self.initial_interval = initial_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_new = target_new
+        self.alpha = alpha
+        self.jitter = jitter
+        self.host_delay = host_delay
+        self.rng = random.Random(seed)
+        self.feeds: List[Feed] = [
+            Feed(crawler, category, url, initial_interval)
+            for crawler in (crawlers if crawlers is not None else get_crawlers())
+            for category, url in crawler.get_category_urls().items()
+        ]
+        self.requests = 0
+        self._host_free: Dict[str, float] = {}
+
+    def observe(self, feed: Feed, links: List[str], now: float) -> int:
+        """Ghi nhận kết quả một lần tải feed và lên lịch lần tải sau; trả về số link mới
+
+        Lần tải không có tin nào (lỗi mạng, trang lỗi) không được tính vào
+        tốc độ ra tin; feed giữ khoảng cách cũ.
+        """
+        if not links:
+            feed.next_due = now + feed.interval * self.rng.uniform(1 - self.jitter, 1 + self.jitter)
+            return 0
+        current = frozenset(normalize_link(link) for link in links)
+        new = len(current - feed.last_links) if feed.polls else 0
+        if feed.last_polled is not None and now > feed.last_polled:
+            sample = new / (now - feed.last_polled)
+            feed.rate = sample if feed.rate is None else self.alpha * sample + (1 - self.alpha) * feed.rate
+        if feed.rate is not None:
+            if feed.rate > 0:
+                feed.interval = self.target_new / feed.rate
+            else:
+                # Chưa thấy tin mới: giãn dần thay vì nhảy thẳng lên max_interval
+                feed.interval *= 2
+            feed.interval = min(self.max_interval, max(self.min_interval, feed.interval))
+        feed.last_links = current
+        feed.last_polled = now
+        feed.polls += 1
+        feed.new_links += new
+        feed.next_due = now + feed.interval * self.rng.uniform(1 - self.jitter, 1 + self.jitter)
+        return new
+
+    def due(self, now: float) -> List[Feed]:
+        return [feed for feed in self.feeds if feed.next_due <= now]
+
+    def reserve_host(self, host: str, now: float) -> float:
+        """Giữ chỗ request kế tiếp tới host; trả về số giây cần chờ trước khi gửi"""
+        start = max(now, self._host_free.get(host, now))
+        self._host_free[host] = start + self.host_delay
+        return start - now
+
+    def load_state(self, storage: NewsStorage) -> None:
+        """Khôi phục khoảng cách và tốc độ ra tin đã học từ kho"""
+        state = json.loads(storage.get_meta(STATE_KEY) or "{}")
+        for feed in self.feeds:
+            saved = state.get(feed.key)
+            if saved:
+                feed.interval = saved["interval"]
+                feed.rate = saved["rate"]
+
+    def save_state(self, storage: NewsStorage, now: float) -> None:
+        state = {feed.key: {"interval": feed.interval, "rate": feed.rate} for feed in self.feeds}
+        storage.set_meta(STATE_KEY, json.dumps(state, ensure_ascii=False))
+        next_due = min((feed.next_due for feed in self.feeds), default=math.inf)
+        if next_due != math.inf:
+            next_poll = datetime.now() + timedelta(seconds=max(0.0, next_due - now))
+            storage.set_meta(NEXT_POLL_KEY, next_poll.isoformat())
+
+    async def poll(
+        self,
+        feed: Feed,
+        fetcher: AsyncFetcher,
+        pipeline: StreamingPipeline,
+        cache: Optional[ResponseCache] = None,
+        pool=None
+    ) -> int:
+        """Tải một feed (theo lịch giữ chỗ của host) và đẩy tin vào pipeline"""
+        await asyncio.sleep(self.reserve_host(feed.host, time.monotonic()))
+        links: List[str] = []
+
+        async def sink(news_items: List[Dict]) -> None:
+            links.extend(news["link"] for news in news_items)
+            await pipeline.sink(news_items)
+
+        self.requests += 1
+        with POLL_SECONDS.time(source=feed.crawler.source):
+            await feed.crawler.crawl_category(fetcher, feed.category, feed.url, cache, pool, sink)
+        return self.observe(feed, links, time.monotonic())
+
+    async def run_async(
+        self,
+        storage: NewsStorage,
+        summarizer=None,
+        cache: Optional[ResponseCache] = None,
+        duration: Optional[float] = None,
+        parse_workers: Optional[int] = None,
+        maintenance_interval: float = 10 * 60
+    ) -> Dict:
+        """Chạy scheduler (mãi mãi, hoặc duration giây); trả về thống kê của pipeline"""
+        self.load_state(storage)
+        pipeline = StreamingPipeline(storage, summarizer)
+        pipeline.start()
+        if parse_workers is None:
+            parse_workers = default_parse_workers()
+        pool = parse_pool(parse_workers)
+        started = time.monotonic()
+        next_maintenance = started + maintenance_interval
+        running: Dict[asyncio.Task, Feed] = {}
+        # Process này không có HTTP server: chỉ số được ghi định kỳ vào kho cho /metrics của API
+        publisher = Publisher(storage, "scheduler")
+        try:
+            async with AsyncFetcher(max_per_host=2) as fetcher:
+                while duration is None or time.monotonic() - started < duration:
+                    now = time.monotonic()
+                    for feed in self.due(now):
+                        # Không lên lịch lại feed đang được tải
+                        feed.next_due = math.inf
+                        running[asyncio.create_task(self.poll(feed, fetcher, pipeline, cache, pool))] = feed
+
+                    finished = [task for task in running if task.done()]
+                    for task in finished:
+                        feed = running.pop(task)
+                        if task.exception() is not None:
+                            print(f"Lỗi khi tải {feed.key}: {task.exception()}")
+                            self.observe(feed, [], time.monotonic())
+                    if finished:
+                        self.save_state(storage, time.monotonic())
+                    publisher.maybe_publish()
+
+                    if now >= next_maintenance:
+                        pruned = storage.prune()
+                        if pruned:
+                            print(f"Đã xóa {pruned} tin cũ khỏi kho")
+                        if export_enabled():
+                            storage.export_json()
+                        # Ngân sách toàn văn tính theo từng khoảng bảo trì
+                        pipeline.reset_budget()
+                        next_maintenance = now + maintenance_interval
+
+                    next_due = min((feed.next_due for feed in self.feeds), default=math.inf)
+                    await asyncio.sleep(min(1.0, max(0.0, next_due - time.monotonic())))
+                if running:
+                    await asyncio.gather(*running, return_exceptions=True)
+        finally:
+            for task in running:
+                task.cancel()
+            if pool is not None:
+                pool.shutdown()
+        stats = await pipeline.finish()
+        publisher.maybe_publish(force=True)
+        return stats
+
+def run_scheduler(duration: Optional[float] = None) -> Dict:
+    """Chạy scheduler với kho và cache mặc định"""
+    storage = open_storage()
+    cache = ResponseCache()
+    scheduler = FeedScheduler()
+    try:
+        stats = asyncio.run(scheduler.run_async(storage, cache=cache, duration=duration))
+    finally:
+        cache.close()
+        storage.close()
+    print(f"Đã gửi {scheduler.requests} request, tóm tắt {stats['summarized']} tin")
+    print(cache.summary())
+    return stats
+
+if __name__ == "__main__":
+    import atexit
+
+    from models.summarizer_service import start_service_process
+
+    # Khởi động dịch vụ tóm tắt để mô hình chỉ được tải một lần
+    try:
+        service_process = start_service_process()
+        if service_process is not None:
+            atexit.register(service_process.terminate)
+    except Exception as e:
+        print(f"Không thể khởi động dịch vụ tóm tắt, sẽ tóm tắt trong process: {str(e)}")
+
+    run_scheduler()
@@ -0,0 +1,290 @@
+"""Pipeline crawl -> tóm tắt chạy song song qua một hàng đợi giới hạn
+
+Crawler đẩy tin của từng trang category vào hàng đợi ngay khi parse xong;
+một consumer gom tin thành batch, ghi vào kho (một transaction), tóm tắt
+các bài mới hoặc đã đổi nội dung trong thread riêng và ghi bản tóm tắt vào
+kho ngay, nên API thấy bản tóm tắt đầu tiên khi trang đầu tiên vừa xong
+thay vì sau khi nguồn chậm nhất xong. Khi hàng đợi đầy (mô hình tóm tắt
+chậm hơn crawl), crawler chờ trước khi đẩy tiếp, nên bộ nhớ không tăng
+theo kích thước cả chu kỳ.
+
+Ở chế độ toàn văn (NEWS_FULL_ARTICLE=1), trang bài viết của các bài cần
+tóm tắt được tải ngay trước khi tóm tắt (tối đa 2 request đồng thời mỗi
+host). Thời gian dành cho toàn văn (tải + tóm tắt) bị giới hạn bởi
+full_article_budget; hết ngân sách, các bài còn lại trong chu kỳ chỉ được
+tóm tắt từ tiêu đề và mô tả.
+
+    python pipeline/streaming.py
+"""
+import asyncio
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+# Thêm thư mục gốc vào PYTHONPATH để import các module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data.fetcher import AsyncFetcher
+from data.http_cache import ResponseCache
+from data.news_crawler import (
+    NewsCrawler,
+    crawl_all_news_async,
+    fetch_article_bodies,
+    full_article_budget,
+    full_article_enabled,
+    get_crawlers
+)
+from data.storage import NewsStorage, export_enabled, open_storage
+from pipeline.metrics import CYCLE_SECONDS, SIZE_BUCKETS, counter, gauge, histogram, publish
+
+# Số tin tối đa nằm trong hàng đợi giữa crawler và consumer
+DEFAULT_QUEUE_SIZE = 256
+# Kích thước batch tối đa đưa qua mô hình tóm tắt
+DEFAULT_BATCH_SIZE = 32
+# Thời gian chờ thêm tin để lấp đầy batch trước khi xử lý
+DEFAULT_MAX_WAIT = 0.2
+
+_DONE = object()
+
+QUEUE_DEPTH = gauge("news_pipeline_queue_depth", "Số tin đang chờ trong hàng đợi giữa crawler và consumer")
+BATCH_SIZE = histogram("news_pipeline_batch_size", "Số tin mỗi batch của consumer", buckets=SIZE_BUCKETS)
+# stage: upsert (ghi tin), fetch_bodies (tải toàn văn), summarize (mô hình), save (ghi bản tóm tắt)
+STAGE_SECONDS = histogram("news_pipeline_stage_seconds", "Thời gian mỗi bước của consumer", ("stage",))
+BATCH_ERRORS = counter("news_pipeline_batch_errors", "Số batch của consumer bị lỗi (các bài được thử lại sau)")
+
+class StreamingPipeline:
+    """Một chu kỳ crawl + tóm tắt dạng streaming
+
+    summarizer là đối tượng có process_batch(texts) (NewsSummarizer hoặc
+    SummarizerClient); nếu None, get_summarizer() chỉ được gọi khi có bài
+    đầu tiên cần tóm tắt.
+    """
+
+    def __init__(
+        self,
+        storage: NewsStorage,
+        summarizer=None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_wait: float = DEFAULT_MAX_WAIT,
+        full_article: Optional[bool] = None,
+        budget: Optional[float] = None
+    ):
+        self.storage = storage
+        self.summarizer = summarizer
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.full_article = full_article_enabled() if full_article is None else full_article
+        self.budget = full_article_budget() if budget is None else budget
+        self.stats = {
+            "crawled": 0,
+            "inserted": 0,
+            "changed": 0,
+            "summarized": 0,
+            "batches": 0,
+            "max_queue": 0,
+            "first_summary_seconds": None,
+            "bodies": 0,
+            "full_article_seconds": 0.0,
+            "errors": 0,
+            "seconds": 0.0,
+        }
+        self._budget_spent = 0.0
+        # summarizer do pipeline tự lấy qua get_summarizer() (được lấy lại sau lỗi)
+        self._own_summarizer = False
+        self._fetcher: Optional[AsyncFetcher] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._consumer: Optional[asyncio.Task] = None
+        self._started = 0.0
+
+    def _get_summarizer(self):
+        if self.summarizer is None:
+            from models.summarizer import get_summarizer
+
+            self.summarizer = get_summarizer()
+            self._own_summarizer = True
+        return self.summarizer
+
+    async def _next_batch(self, queue: asyncio.Queue) -> Optional[List[Dict]]:
+        """Tối đa batch_size tin, chờ thêm tối đa max_wait giây; None khi crawl đã xong"""
+        item = await queue.get()
+        if item is _DONE:
+            return None
+        batch = [item]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.batch_size:
+            # Không dùng wait_for(queue.get()): khi hết giờ đúng lúc có tin,
+            # tin đó có thể bị mất (kể cả dấu kết thúc)
+            try:
+                item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                if time.monotonic() >= deadline:
+                    break
+                await asyncio.sleep(0.01)
+                continue
+            if item is _DONE:
+                # Trả lại dấu kết thúc cho lần gọi sau
+                queue.put_nowait(item)
+                break
+            batch.append(item)
+        return batch
+
+    def reset_budget(self) -> None:
+        """Bắt đầu chu kỳ mới của ngân sách toàn văn (scheduler chạy liên tục gọi định kỳ)"""
+        self._budget_spent = 0.0
+
+    async def _summarize(self, pending: List[Dict], started: float) -> None:
+        from models.summarizer import build_text
+
+        summarizer = await asyncio.to_thread(self._get_summarizer)
+        for i in range(0, len(pending), self.batch_size):
+            chunk = pending[i:i + self.batch_size]
+            full_article = self.full_article and self._budget_spent < self.budget
+            chunk_started = time.perf_counter()
+            if full_article:
+                deadline = time.monotonic() + self.budget - self._budget_spent
+                with STAGE_SECONDS.time(stage="fetch_bodies"):
+                    self.stats["bodies"] += await fetch_article_bodies(chunk, self._fetcher, deadline=deadline)
+            # Mô hình chạy trong thread riêng để crawler tiếp tục tải trang
+            with STAGE_SECONDS.time(stage="summarize"):
+                summaries = await asyncio.to_thread(
+                    summarizer.process_batch, [build_text(news) for news in chunk]
+                )
+            if full_article:
+                elapsed = time.perf_counter() - chunk_started
+                self._budget_spent += elapsed
+                self.stats["full_article_seconds"] += elapsed
+            with STAGE_SECONDS.time(stage="save"):
+                await asyncio.to_thread(self.storage.save_summaries, list(zip(chunk, summaries)))
+            self.stats["summarized"] += len(chunk)
+            self.stats["batches"] += 1
+            if self.stats["first_summary_seconds"] is None:
+                self.stats["first_summary_seconds"] = time.perf_counter() - started
+
+    async def _consume(self, queue: asyncio.Queue, started: float) -> None:
+        """Xử lý các batch cho tới khi crawl xong
+
+        Lỗi của một batch (mô hình, dịch vụ tóm tắt, kho bị khóa) không làm
+        dừng consumer: các bài chưa tóm tắt vẫn nằm trong kho ở trạng thái
+        chờ và được tóm tắt cùng batch thành công kế tiếp.
+        """
+        retry = False
+        while True:
+            batch = await self._next_batch(queue)
+            if batch is None:
+                return
+            QUEUE_DEPTH.set(queue.qsize())
+            BATCH_SIZE.observe(len(batch))
+            try:
+                with STAGE_SECONDS.time(stage="upsert"):
+                    # Ghi kho trong thread: chờ khóa ghi của SQLite không chặn các lượt tải trang
+                    inserted, changed = await asyncio.to_thread(self.storage.upsert_articles, batch)
+                    links = None if retry else [news["link"] for news in batch]
+                    pending = await asyncio.to_thread(self.storage.pending_summaries, links)
+                self.stats["inserted"] += inserted
+                self.stats["changed"] += changed
+                if pending:
+                    await self._summarize(pending, started)
+                retry = False
+            except Exception as e:
+                print(f"Lỗi khi xử lý batch {len(batch)} tin, sẽ thử lại với batch sau: {str(e)}")
+                BATCH_ERRORS.inc()
+                self.stats["errors"] += 1
+                retry = True
+                if self._own_summarizer:
+                    # Lấy lại summarizer (dịch vụ có thể đã dừng) ở lần tóm tắt sau
+                    self.summarizer = None
+
+    def start(self) -> None:
+        """Tạo hàng đợi và chạy consumer; phải gọi trong event loop"""
+        self._started = time.perf_counter()
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        if self.full_article:
+            self._fetcher = AsyncFetcher(max_per_host=2)
+        self._consumer = asyncio.create_task(self._consume(self._queue, self._started))
+
+    async def sink(self, news_items: List[Dict]) -> None:
+        """Đẩy tin của một trang vào hàng đợi (NewsSink của crawler)"""
+        if self._consumer.done():
+            # Consumer đã dừng vì lỗi: báo lỗi thay vì chờ mãi trên hàng đợi đầy
+            self._consumer.result()
+        for news in news_items:
+            # Chờ ở đây khi hàng đợi đầy: backpressure về phía crawler
+            await self._queue.put(news)
+        self.stats["crawled"] += len(news_items)
+        self.stats["max_queue"] = max(self.stats["max_queue"], self._queue.qsize())
+        QUEUE_DEPTH.set(self._queue.qsize())
+
+    async def finish(self) -> Dict:
+        """Đợi consumer xử lý hết hàng đợi, tóm tắt các bài còn tồn; trả về thống kê"""
+        try:
+            await self._queue.put(_DONE)
+            await self._consumer
+        finally:
+            self._consumer.cancel()
+
+        # Các bài còn tồn từ chu kỳ trước (ví dụ bị lỗi giữa chừng)
+        leftover = await asyncio.to_thread(self.storage.pending_summaries)
+        try:
+            if leftover:
+                await self._summarize(leftover, self._started)
+        finally:
+            if self._fetcher is not None:
+                await self._fetcher.close()
+        self.stats["seconds"] = time.perf_counter() - self._started
+        return self.stats
+
+    async def run_async(
+        self,
+        crawlers: List[NewsCrawler],
+        cache: Optional[ResponseCache] = None,
+        **crawl_kwargs
+    ) -> Dict:
+        """Chạy một chu kỳ; trả về thống kê (số tin, thời gian tới bản tóm tắt đầu tiên, ...)"""
+        self.start()
+        crawl = asyncio.create_task(crawl_all_news_async(crawlers, cache, sink=self.sink, **crawl_kwargs))
+        try:
+            done, _ = await asyncio.wait({crawl, self._consumer}, return_when=asyncio.FIRST_COMPLETED)
+            if self._consumer in done:
+                # Consumer chỉ dừng trước khi crawl xong khi bị lỗi; crawler
+                # sẽ chờ mãi trên hàng đợi đầy nếu không dừng lại
+                self._consumer.result()
+            await crawl
+        except BaseException:
+            crawl.cancel()
+            self._consumer.cancel()
+            raise
+        return await self.finish()
+
+def run_pipeline(crawlers: Optional[List[NewsCrawler]] = None, summarizer=None) -> Dict:
+    """Một chu kỳ cập nhật tin tức: crawl tất cả các nguồn và tóm tắt dạng streaming"""
+    crawlers = crawlers if crawlers is not None else get_crawlers()
+    storage = open_storage()
+    cache = ResponseCache()
+    try:
+        pipeline = StreamingPipeline(storage, summarizer)
+        stats = asyncio.run(pipeline.run_async(crawlers, cache))
+        pruned = storage.prune()
+        if pruned:
+            print(f"Đã xóa {pruned} tin cũ khỏi kho")
+        if export_enabled():
+            storage.export_json()
+        CYCLE_SECONDS.observe(stats["seconds"], mode="streaming")
+        # Process này không có HTTP server: ghi chỉ số vào kho cho /metrics của API
+        publish(storage, "pipeline")
+    finally:
+        cache.close()
+        storage.close()
+
+    first = stats["first_summary_seconds"]
+    print(
+        f"Đã crawl {stats['crawled']} tin từ {len(crawlers)} nguồn, tóm tắt {stats['summarized']} tin "
+        f"trong {stats['seconds']:.1f}s"
+        + (f" (bản tóm tắt đầu tiên sau {first:.1f}s)" if first is not None else "")
+    )
+    print(cache.summary())
+    return stats
+
+if __name__ == "__main__":
+    run_pipeline()
@@ -0,0 +1,40 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import api.api as api_module
+from api.news_store import NewsStore
+from api.response_cache import ResponseCache
+from benchmarks.fixtures import make_news_items, write_news_storage
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    write_news_storage(str(tmp_path), make_news_items(120))
+    store = NewsStore(str(tmp_path))
+    monkeypatch.setattr(api_module, "store", store)
+    monkeypatch.setattr(api_module, "responses", ResponseCache())
+    yield TestClient(api_module.app)
+    store.storage.close()
+
+def test_revalidation_returns_304_per_encoding(client):
+    gzip = client.get("/news", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/news", headers={"Accept-Encoding": "identity"})
+    assert gzip.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in identity.headers
+    assert gzip.headers["etag"] != identity.headers["etag"]
+    assert "Accept-Encoding" in gzip.headers["vary"]
+
+    again = client.get("/news", headers={"Accept-Encoding": "gzip", "If-None-Match": gzip.headers["etag"]})
+    assert again.status_code == 304
+    assert again.headers["etag"] == gzip.headers["etag"]
+
+def test_small_body_sent_uncompressed_gets_identity_etag(client):
+    gzip = client.get("/categories", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/categories", headers={"Accept-Encoding": "identity"})
+    assert len(gzip.content) < 1024
+    assert "content-encoding" not in gzip.headers
+    assert gzip.headers["etag"] == identity.headers["etag"]
+    assert not gzip.headers["etag"].endswith('-gzip"')
+
+    again = client.get("/categories", headers={"Accept-Encoding": "gzip", "If-None-Match": gzip.headers["etag"]})
+    assert again.status_code == 304
+    assert again.headers["etag"] == gzip.headers["etag"]
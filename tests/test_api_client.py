@@ -0,0 +1,100 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from web.api_client import ApiClient
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        state = self.server.state
+        state["requests"] += 1
+        if state["down"]:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        etag = f'"{state["version"]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps({"version": state["version"]}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def api():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.state = {"requests": 0, "down": False, "version": 1}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def client_for(server, **kwargs):
+    host, port = server.server_address[:2]
+    return ApiClient(f"http://{host}:{port}", timeout=2, **kwargs)
+
+def test_fresh_then_stale_while_revalidate(api):
+    client = client_for(api, ttl=60)
+    assert client.get_async("/news").result().data == {"version": 1}
+    assert client.get_async("/news").result().data == {"version": 1}
+    assert api.state["requests"] == 1
+    assert client.stats["fresh"] == 1
+
+    # Hết ttl: dữ liệu cũ được trả ngay, conditional GET chạy ở nền
+    client.ttl = 0
+    api.state["version"] = 2
+    assert client.get_async("/news").result().data == {"version": 1}
+    client._executor.shutdown(wait=True)
+    assert client.stats["stale"] == 1 and client.stats["fetched"] == 2
+    client.session.close()
+
+def test_stale_data_served_while_api_is_down(api):
+    client = client_for(api, ttl=0, max_stale=3600)
+    first = client.get_async("/news").result()
+    api.state["down"] = True
+
+    assert client.get_async("/news").result() is first
+    assert client.get_async("/news").result() is first
+    client._executor.shutdown(wait=True)
+    assert client.stats["errors"] >= 1
+    client.session.close()
+
+def test_too_old_data_still_used_when_api_is_down(api):
+    client = client_for(api, ttl=0, max_stale=0)
+    first = client.get_async("/news").result()
+    api.state["down"] = True
+    # Quá max_stale nên phải chờ API; API lỗi thì vẫn dùng dữ liệu cũ
+    assert client.get_many([("/news", None)]) == [first]
+    assert client.stats["errors"] == 1
+    client.close()
+
+def test_error_without_cache_is_raised(api):
+    api.state["down"] = True
+    client = client_for(api)
+    with pytest.raises(requests.HTTPError):
+        client.get_async("/news").result()
+    client.close()
+
+def test_revalidation_uses_304(api):
+    client = client_for(api, ttl=0, max_stale=0)
+    first = client.get_async("/news").result()
+    again = client.get_async("/news").result()
+    assert again.data == first.data and again.etag == first.etag
+    assert client.stats["not_modified"] == 1
+    client.close()
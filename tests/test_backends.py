@@ -0,0 +1,55 @@
+import os
+import random
+
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from benchmarks.fixtures import random_sentence
+from benchmarks.tiny_model import build_tiny_model
+from models.backends import load_summarization_pipeline
+
+@pytest.fixture(scope="module")
+def tiny_model(tmp_path_factory):
+    return build_tiny_model(str(tmp_path_factory.mktemp("tiny-bart")))
+
+@pytest.fixture(scope="module")
+def inputs(tiny_model):
+    rng = random.Random(1)
+    texts = [" ".join(random_sentence(rng) for _ in range(3)) for _ in range(4)]
+    reference = load_summarization_pipeline(tiny_model, "torch")
+    encoded = reference.tokenizer(texts, return_tensors="pt", padding=True)
+    # Teacher forcing: so sánh logits ở nhiều bước giải mã, không chỉ bước đầu
+    decoder_ids = encoded["input_ids"][:, :12].clone()
+    decoder_ids[:, 0] = reference.model.config.decoder_start_token_id
+    with torch.no_grad():
+        logits = reference.model(**encoded, decoder_input_ids=decoder_ids).logits
+    return encoded, decoder_ids, logits
+
+def backend_logits(model_name, backend, encoded, decoder_ids):
+    pipeline = load_summarization_pipeline(model_name, backend)
+    with torch.no_grad():
+        return pipeline.model(**encoded, decoder_input_ids=decoder_ids).logits
+
+def test_torch_int8_close_to_fp32(tiny_model, inputs):
+    encoded, decoder_ids, expected = inputs
+    logits = backend_logits(tiny_model, "torch-int8", encoded, decoder_ids)
+    assert (logits - expected).abs().max() < 0.05 * expected.abs().max()
+    assert (logits.argmax(-1) == expected.argmax(-1)).float().mean() >= 0.9
+
+def test_onnx_matches_fp32_and_exports_to_data_dir(tiny_model, inputs, tmp_path, monkeypatch):
+    pytest.importorskip("optimum.onnxruntime")
+    monkeypatch.setenv("NEWS_DATA_DIR", str(tmp_path))
+    encoded, decoder_ids, expected = inputs
+    logits = backend_logits(tiny_model, "onnx", encoded, decoder_ids)
+    assert torch.allclose(logits, expected, atol=1e-4)
+
+    exports = os.listdir(tmp_path / "onnx")
+    assert len(exports) == 1
+    # Lần tải sau dùng lại bản đã xuất
+    assert torch.allclose(backend_logits(tiny_model, "onnx", encoded, decoder_ids), expected, atol=1e-4)
+
+def test_unknown_backend(tiny_model):
+    with pytest.raises(ValueError):
+        load_summarization_pipeline(tiny_model, "tensorrt")
@@ -0,0 +1,74 @@
+import asyncio
+import socket
+
+from aiohttp import web
+
+from data.fetcher import AsyncFetcher
+
+async def start_app():
+    state = {"active": 0, "max_active": 0}
+
+    async def slow(request):
+        state["active"] += 1
+        state["max_active"] = max(state["max_active"], state["active"])
+        await asyncio.sleep(0.05)
+        state["active"] -= 1
+        return web.Response(text="Tin tức", charset="utf-8")
+
+    async def error(request):
+        return web.Response(status=503, text="Bảo trì")
+
+    async def hang(request):
+        await asyncio.sleep(1)
+        return web.Response(text="muộn")
+
+    app = web.Application()
+    app.add_routes([web.get("/slow/{i}", slow), web.get("/error", error), web.get("/hang", hang)])
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, port, state
+
+def closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def test_per_host_limit_and_order():
+    async def run():
+        runner, port, state = await start_app()
+        try:
+            async with AsyncFetcher(max_connections=16, max_per_host=2) as fetcher:
+                urls = [f"http://127.0.0.1:{port}/slow/{i}" for i in range(8)]
+                results = await fetcher.fetch_all(urls)
+        finally:
+            await runner.cleanup()
+        return urls, results, state
+
+    urls, results, state = asyncio.run(run())
+    assert [result.url for result in results] == urls
+    assert all(result.ok and result.text == "Tin tức" for result in results)
+    assert state["max_active"] == 2
+
+def test_errors_are_reported_not_raised():
+    async def run():
+        runner, port, _ = await start_app()
+        try:
+            async with AsyncFetcher(timeout=0.3) as fetcher:
+                return await fetcher.fetch_all([
+                    f"http://127.0.0.1:{port}/error",
+                    f"http://127.0.0.1:{port}/hang",
+                    f"http://127.0.0.1:{closed_port()}/",
+                    f"http://127.0.0.1:{port}/slow/1",
+                ])
+        finally:
+            await runner.cleanup()
+
+    error, timeout, refused, ok = asyncio.run(run())
+    assert (error.status, error.error, error.ok) == (503, "HTTP 503", False)
+    assert error.text == "Bảo trì"
+    assert timeout.error.startswith("Timeout") and not timeout.ok
+    assert refused.error and refused.status == 0 and not refused.ok
+    assert ok.ok
@@ -0,0 +1,22 @@
+from data.fetcher import FetchResult
+from data.http_cache import ResponseCache, body_digest
+
+URL = "https://vnexpress.net/thoi-su"
+
+def test_cache_in_data_dir_survives_other_working_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv("NEWS_DATA_DIR", str(tmp_path))
+    cache = ResponseCache()
+    result = FetchResult(URL, 200, b"<html></html>", {"etag": '"v1"', "last-modified": "Sat, 01 Mar 2026 08:00:00 GMT"})
+    cache.store(result, body_digest(result.body), [{"title": "Tin", "link": f"{URL}/1.html"}])
+    cache.close()
+
+    # Chạy từ thư mục khác vẫn dùng cùng file cache
+    monkeypatch.chdir("/")
+    cache = ResponseCache()
+    entry = cache.get(URL)
+    assert cache.path == str(tmp_path / "http_cache.sqlite")
+    assert entry.items == [{"title": "Tin", "link": f"{URL}/1.html"}]
+    assert ResponseCache.conditional_headers(entry) == {
+        "If-None-Match": '"v1"', "If-Modified-Since": "Sat, 01 Mar 2026 08:00:00 GMT"
+    }
+    cache.close()
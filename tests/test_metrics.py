@@ -0,0 +1,54 @@
+import re
+
+import pytest
+
+from pipeline.metrics import Counter, Gauge, Histogram, Metric, Registry, render
+
+# Hậu tố mẫu được phép của từng kiểu ở định dạng text 0.0.4
+SAMPLE_SUFFIXES = {"counter": ("",), "gauge": ("",), "histogram": ("_bucket", "_sum", "_count")}
+
+def parse(text):
+    """(họ -> kiểu, [(tên mẫu, nhãn, giá trị)])"""
+    families, samples = {}, []
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            families[name] = kind
+        elif line and not line.startswith("#"):
+            match = re.fullmatch(r"(\w+)\{(.*)\} (\S+)", line)
+            labels = dict(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', match.group(2)))
+            samples.append((match.group(1), labels, float(match.group(3))))
+    return families, samples
+
+def snapshot():
+    registry = Registry()
+    registry.register(Counter("news_test_items", "Số tin", ("source",))).inc(3, source="A")
+    registry.register(Gauge("news_test_queue", "Hàng đợi")).set(2)
+    histogram = registry.register(Histogram("news_test_seconds", "Thời gian", buckets=(0.1, 1.0)))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    return registry.snapshot()
+
+def test_every_sample_belongs_to_its_declared_family():
+    families, samples = parse(render({"api": snapshot(), "crawler": snapshot()}))
+    assert families == {
+        "news_test_items_total": "counter",
+        "news_test_queue": "gauge",
+        "news_test_seconds": "histogram",
+    }
+    for name, labels, _ in samples:
+        assert any(
+            name == family + suffix for family, kind in families.items() for suffix in SAMPLE_SUFFIXES[kind]
+        ), name
+        assert labels["process"] in ("api", "crawler")
+    values = {(name, labels.get("le")): value for name, labels, value in samples if labels["process"] == "api"}
+    assert values[("news_test_items_total", None)] == 3
+    assert values[("news_test_seconds_bucket", "0.1")] == 1
+    assert values[("news_test_seconds_bucket", "+Inf")] == 2
+    assert values[("news_test_seconds_count", None)] == 2
+
+def test_metric_is_abstract_and_labels_are_checked():
+    with pytest.raises(TypeError):
+        Metric("news_test", "")
+    with pytest.raises(ValueError):
+        Counter("news_test", "", ("source",)).inc()
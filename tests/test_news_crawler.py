@@ -0,0 +1,14 @@
+from data.news_crawler import VnExpressCrawler, parse_body_worker, parse_pool
+from data.parsers import get_parser
+
+def test_parse_pool_does_not_fork():
+    assert parse_pool(0) is None
+    pool = parse_pool(1)
+    try:
+        assert pool._mp_context.get_start_method() in ("forkserver", "spawn")
+        crawler = VnExpressCrawler(get_parser())
+        html = '<html><body><article class="fck_detail"><p class="Normal">Giá vàng tăng.</p></article></body></html>'
+        body = pool.submit(parse_body_worker, VnExpressCrawler, crawler.parser, html.encode("utf-8"), "utf-8").result(timeout=60)
+        assert body == crawler.extract_body(html) == "Giá vàng tăng."
+    finally:
+        pool.shutdown()
@@ -0,0 +1,46 @@
+import os
+
+from api.news_store import NewsStore, category_key
+from benchmarks.fixtures import make_news_items, write_news_storage
+from data.storage import NewsStorage
+
+def test_reloads_only_when_storage_version_changes(tmp_path):
+    items = make_news_items(30)
+    write_news_storage(str(tmp_path), items[:20])
+    store = NewsStore(str(tmp_path), check_interval=0)
+    first = store.snapshot()
+    assert len(first.news) == 20
+    # Không có gì thay đổi: dùng lại đúng snapshot cũ
+    assert store.snapshot() is first
+
+    writer = NewsStorage(os.path.join(str(tmp_path), "news.sqlite"))
+    writer.upsert_articles(items[:20])
+    assert store.snapshot() is first
+
+    writer.import_processed(items[20:])
+    second = store.snapshot()
+    assert second is not first and second.version != first.version
+    assert len(second.news) == 30
+    assert {news["link"] for news in second.news} == {news["link"] for news in items}
+    new = items[25]
+    assert second.by_link[new["link"]][0]["summary"] == new["summary"]
+    assert new in [
+        {key: news[key] for key in new}
+        for news in second.by_category[category_key(new["category"])]
+    ]
+    assert new["link"] in [link for link, _ in second.index.search(new["title"])]
+    writer.close()
+    store.storage.close()
+
+def test_check_interval_limits_version_checks(tmp_path):
+    items = make_news_items(10)
+    write_news_storage(str(tmp_path), items[:5])
+    store = NewsStore(str(tmp_path), check_interval=3600)
+    first = store.snapshot()
+    writer = NewsStorage(os.path.join(str(tmp_path), "news.sqlite"))
+    writer.import_processed(items[5:])
+    assert store.snapshot() is first
+    store.check_interval = 0
+    assert len(store.snapshot().news) == 10
+    writer.close()
+    store.storage.close()
@@ -0,0 +1,59 @@
+import pytest
+
+from api.news_store import sort_key
+from api.pagination import decode_cursor, encode_cursor, paginate, parse_fields, project
+
+def make_news(count):
+    news = [
+        {"title": f"Tin {i}", "link": f"https://a.vn/{i:03d}", "category": "Thời sự",
+         "timestamp": f"2026-10-18T{i % 24:02d}:00:00", "source": "A"}
+        for i in range(count)
+    ]
+    return sorted(news, key=sort_key, reverse=True)
+
+def collect(news_list, limit, keyset=True):
+    pages, cursor = [], None
+    while True:
+        page, cursor = paginate(news_list, limit, cursor, keyset)
+        pages.append(list(page))
+        if cursor is None:
+            return pages
+
+def test_keyset_pages_cover_list_exactly_once():
+    news = make_news(50)
+    pages = collect(news, 7)
+    assert [item for page in pages for item in page] == news
+    assert len(pages) == 8
+
+def test_keyset_cursor_stable_when_news_inserted():
+    news = make_news(20)
+    first, cursor = paginate(news, 5)
+    newer = {"title": "Mới", "link": "https://a.vn/moi", "category": "Thời sự",
+             "timestamp": "2026-10-19T00:00:00", "source": "A"}
+    # Tin mới chen vào đầu danh sách không làm lặp hay bỏ sót tin ở trang sau
+    second, _ = paginate([newer] + news, 5, cursor)
+    assert list(second) == news[5:10]
+
+def test_offset_cursor_for_search_results():
+    news = make_news(12)
+    pages = collect(news, 5, keyset=False)
+    assert [item for page in pages for item in page] == news
+
+def test_cursor_kind_must_match():
+    news = make_news(12)
+    _, offset_cursor = paginate(news, 5, keyset=False)
+    with pytest.raises(ValueError):
+        paginate(news, 5, offset_cursor, keyset=True)
+
+@pytest.mark.parametrize("cursor", ["khong-hop-le", encode_cursor({"key": [1, 2, 3]}), encode_cursor({"offset": "1"})])
+def test_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+def test_parse_fields_and_project():
+    assert parse_fields(None) is None
+    fields = parse_fields("title, link,title")
+    assert fields == ("title", "link")
+    assert project([{"title": "A", "link": "l", "summary": "s"}], fields) == [{"title": "A", "link": "l"}]
+    with pytest.raises(ValueError):
+        parse_fields("title,password")
@@ -0,0 +1,36 @@
+import pytest
+
+from benchmarks.fixtures import load_fixture, render_article
+from data.news_crawler import get_crawlers
+from data.parsers import ParserBackend, SoupBackend, create_parser
+
+CRAWLERS = {type(crawler).__name__: type(crawler) for crawler in get_crawlers()}
+
+def backends():
+    backends = [SoupBackend("html.parser")]
+    for name in ("lxml", "selectolax"):
+        try:
+            backends.append(create_parser(name))
+        except ImportError:
+            pass
+    return backends
+
+def extract(crawler_cls, parser: ParserBackend, html: str):
+    items = crawler_cls(parser).extract_news(html, "Thời sự")
+    return [(item["title"], item["link"], item["description"]) for item in items]
+
+@pytest.mark.parametrize("parser", backends(), ids=lambda parser: parser.name)
+@pytest.mark.parametrize("name", sorted(CRAWLERS))
+def test_backends_match_full_tree_parse(name, parser):
+    # Cách làm cũ: dựng cây BeautifulSoup của cả trang
+    reference = SoupBackend("html.parser", strain=False)
+    html = load_fixture(name)
+    expected = extract(CRAWLERS[name], reference, html)
+    assert len(expected) > 10
+    assert extract(CRAWLERS[name], parser, html) == expected
+
+    article = render_article(name)
+    body = CRAWLERS[name](parser).extract_body(article)
+    assert body == CRAWLERS[name](reference).extract_body(article)
+    if CRAWLERS[name].body_selector:
+        assert body
@@ -0,0 +1,20 @@
+from api.response_cache import choose_encoding, etag_matches, make_etag
+
+def test_etag_differs_between_content_codings():
+    key = ("/news", ())
+    tags = {make_etag("abc.1", key, encoding) for encoding in (None, "gzip", "br")}
+    assert len(tags) == 3
+    assert make_etag("abc.1", key, "br").endswith('-br"')
+
+def test_etag_matches_any_coding_of_same_version():
+    key = ("/news", ())
+    assert etag_matches(make_etag("abc.1", key, "gzip"), make_etag("abc.1", key, "br"))
+    assert etag_matches("W/" + make_etag("abc.1", key), make_etag("abc.1", key, "gzip"))
+    assert etag_matches("*", make_etag("abc.1", key))
+    assert not etag_matches(make_etag("abc.1", key, "br"), make_etag("abc.2", key, "br"))
+    assert not etag_matches(None, make_etag("abc.1", key))
+
+def test_choose_encoding():
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("gzip;q=0, identity") is None
+    assert choose_encoding(None) is None
@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from api.search_index import SearchIndex
+
+def news(link, title, description=""):
+    return {"link": link, "title": title, "description": description}
+
+NEWS = [
+    news("a", "Giá vàng hôm nay tăng mạnh", "Vàng miếng SJC tăng 500.000 đồng."),
+    news("b", "Thời sự: Hà Nội mưa lớn", "Nhiều tuyến phố ngập, giá rau tăng."),
+    news("c", "Chứng khoán giảm điểm", "Cổ phiếu ngân hàng và vàng giảm."),
+    news("d", "Đà Nẵng đón khách du lịch", "Thời tiết đẹp, khách sạn kín phòng."),
+]
+
+@pytest.fixture
+def index():
+    index = SearchIndex()
+    index.update(NEWS)
+    return index
+
+def links(results):
+    return [link for link, _ in results]
+
+def test_title_match_ranks_above_description_match(index):
+    # "vàng" ở tiêu đề và mô tả của a, chỉ ở mô tả của c
+    assert links(index.search("vàng")) == ["a", "c"]
+
+def test_all_query_terms_must_match(index):
+    assert links(index.search("giá tăng")) == ["a", "b"]
+    assert links(index.search("giá mưa")) == ["b"]
+    assert index.search("vàng mưa") == []
+
+def test_folded_and_prefix_queries(index):
+    assert links(index.search("thoi su")) == ["b"]
+    assert links(index.search("DA NANG")) == ["d"]
+    # Chỉ từ cuối cùng khớp theo tiền tố
+    assert links(index.search("chung kho")) == ["c"]
+    assert index.search("kho chung") == []
+
+def test_removed_and_changed_news_are_not_found(index):
+    assert index.update([NEWS[1], NEWS[2], NEWS[3], news("a", "Giá xăng giảm", "")]) == (1, 1)
+    assert links(index.search("vàng")) == ["c"]
+    assert links(index.search("xăng")) == ["a"]
+    assert index.update(NEWS[2:]) == (0, 2)
+    assert index.search("xăng") == []
+    assert links(index.search("thoi tiet")) == ["d"]
+
+def random_news(rng, count, start=0):
+    words = ["giá", "vàng", "xăng", "thời", "sự", "hà", "nội", "mưa", "bão", "điểm", "chứng", "khoán", "du", "lịch"]
+    return [
+        news(f"n{start + i}", " ".join(rng.choices(words, k=4)), " ".join(rng.choices(words, k=8)))
+        for i in range(count)
+    ]
+
+@pytest.mark.parametrize("keep", [900, 20])
+def test_incremental_updates_match_fresh_index(keep):
+    # keep=20: gần hết doc_id bị xóa nên update() đánh số lại từ đầu
+    rng = random.Random(keep)
+    corpus = random_news(rng, 1200)
+    index = SearchIndex()
+    index.update(corpus)
+    current = rng.sample(corpus, keep) + random_news(rng, 30, start=5000)
+    index.update(current)
+    fresh = SearchIndex()
+    fresh.update(current)
+
+    for query in ("giá", "vàng xăng", "ha noi", "chung kh", "mưa bão du"):
+        expected = fresh.search(query)
+        results = index.search(query)
+        assert sorted(links(results)) == sorted(links(expected))
+        assert dict(results) == pytest.approx(dict(expected))
+    top = index.search("giá", limit=5)
+    assert [score for _, score in top] == pytest.approx([score for _, score in index.search("giá")[:5]])
@@ -0,0 +1,34 @@
+import os
+import signal
+
+import pytest
+
+from models.sharded_summarizer import ShardedSummarizer
+from models.summarizer import NewsSummarizer
+from models.summary_cache import SummaryCache
+
+TEXTS = [
+    f"Tin số {i}. Giá vàng ngày {i} biến động {i} lần. Chứng khoán tăng {i} điểm. Người dân quan tâm tới {i} việc."
+    for i in range(12)
+]
+
+@pytest.fixture
+def sharded():
+    # Không có mô hình: worker tóm tắt bằng trích xuất câu, không cần tải gì
+    summarizer = ShardedSummarizer(2, 1, cache=SummaryCache(":memory:"), model_name="/khong-co-mo-hinh", start_timeout=60)
+    yield summarizer
+    summarizer.close()
+
+def test_results_in_input_order(sharded):
+    local = NewsSummarizer(cache=SummaryCache(":memory:"), model_name="/khong-co-mo-hinh")
+    assert sharded.process_batch(TEXTS, batch_size=4) == local.process_batch(TEXTS, batch_size=4)
+
+def test_recovers_after_workers_are_killed(sharded):
+    old_pids = {process.pid for process in sharded.processes}
+    for pid in old_pids:
+        os.kill(pid, signal.SIGKILL)
+    summaries = sharded.process_batch(TEXTS, batch_size=4)
+    assert [f" {i} " in summary for i, summary in enumerate(summaries)] == [True] * len(TEXTS)
+    assert sharded.restarts == 1
+    assert all(process.is_alive() for process in sharded.processes)
+    assert not old_pids & {process.pid for process in sharded.processes}
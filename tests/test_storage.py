@@ -0,0 +1,131 @@
+import pytest
+
+from data.storage import NewsStorage
+
+def article(title, link, description, source="VnExpress", timestamp="2026-03-01T08:00:00"):
+    return {
+        "title": title,
+        "link": link,
+        "description": description,
+        "category": "Kinh doanh",
+        "source": source,
+        "timestamp": timestamp,
+    }
+
+GOLD = "Giá vàng miếng SJC sáng nay {} đồng mỗi lượng so với hôm qua, giá vàng nhẫn cũng biến động theo."
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = NewsStorage(str(tmp_path / "news.sqlite"))
+    yield storage
+    storage.close()
+
+def summarize_pending(storage, summary):
+    pending = storage.pending_summaries()
+    storage.save_summaries([(news, summary) for news in pending])
+    return pending
+
+def summaries(storage):
+    with storage.snapshot() as conn:
+        return dict(conn.execute("SELECT url, summary FROM articles"))
+
+def test_recurring_articles_of_one_source_are_not_clustered(storage):
+    for day, move in ((1, "tăng 200.000"), (2, "giảm 150.000")):
+        storage.upsert_articles([article(
+            f"Giá vàng hôm nay {day}/3", f"https://vnexpress.net/gia-vang-{day}.html", GOLD.format(move),
+            timestamp=f"2026-03-0{day}T08:00:00"
+        )])
+        assert len(summarize_pending(storage, f"Ngày {day}/3: {move}")) == 1
+    assert summaries(storage)["https://vnexpress.net/gia-vang-2.html"] == "Ngày 2/3: giảm 150.000"
+
+def test_same_story_from_another_source_shares_summary(storage):
+    storage.upsert_articles([article("Giá vàng hôm nay 3/3", "https://vnexpress.net/a.html", GOLD.format("tăng 50.000"))])
+    summarize_pending(storage, "Vàng tăng 50.000")
+    storage.upsert_articles([article(
+        "Giá vàng hôm nay 3/3 tăng nhẹ", "https://tuoitre.vn/b.html", GOLD.format("tăng 50.000"),
+        source="Tuổi Trẻ", timestamp="2026-03-01T09:00:00"
+    )])
+    assert storage.pending_summaries() == []
+    assert summaries(storage)["https://tuoitre.vn/b.html"] == "Vàng tăng 50.000"
+
+def test_same_story_outside_window_is_not_clustered(storage):
+    storage.upsert_articles([article("Giá vàng hôm nay 3/3", "https://vnexpress.net/a.html", GOLD.format("tăng 50.000"))])
+    summarize_pending(storage, "Vàng tăng 50.000")
+    storage.upsert_articles([article(
+        "Giá vàng hôm nay 3/3", "https://tuoitre.vn/b.html", GOLD.format("tăng 50.000"),
+        source="Tuổi Trẻ", timestamp="2026-03-05T09:00:00"
+    )])
+    assert len(storage.pending_summaries()) == 1
+
+def test_version_changes_only_when_news_changes(storage):
+    news = article("Giá vàng hôm nay 1/3", "https://vnexpress.net/a.html", GOLD.format("tăng 50.000"))
+    storage.upsert_articles([news])
+    version = storage.version()
+
+    storage.upsert_articles([news])
+    storage.save_summaries([])
+    assert storage.version() == version
+
+    summarize_pending(storage, "Vàng tăng 50.000")
+    assert storage.version() != version
+    version = storage.version()
+
+    storage.upsert_articles([{**news, "category": "Thời sự"}])
+    assert storage.version() != version
+
+# Các cặp tin khác nhau nhưng cùng khuôn: không được dùng chung bản tóm tắt
+TEMPLATE_PAIRS = [
+    (("Giá vàng hôm nay 3/3: Vàng miếng SJC tăng mạnh",
+      "Giá vàng trong nước hôm nay tăng 500.000 đồng mỗi lượng theo đà tăng của thế giới."),
+     ("Giá xăng hôm nay 3/3: Xăng RON 95 giảm mạnh",
+      "Giá xăng trong nước hôm nay giảm 500 đồng mỗi lít theo đà giảm của thế giới.")),
+    (("Dự báo thời tiết ngày 4/3: Hà Nội mưa phùn, trời rét",
+      "Miền Bắc tiếp tục chịu ảnh hưởng của không khí lạnh, nhiệt độ thấp nhất 12 độ."),
+     ("Dự báo thời tiết ngày 5/3: Hà Nội nắng nhẹ, trời ấm",
+      "Miền Bắc không khí lạnh suy yếu, nhiệt độ cao nhất 25 độ.")),
+    (("Tai nạn giao thông nghiêm trọng tại Đồng Nai, 2 người tử vong",
+      "Xe tải va chạm với xe máy trên quốc lộ 1A khiến 2 người tử vong tại chỗ."),
+     ("Tai nạn giao thông nghiêm trọng tại Bình Dương, 3 người tử vong",
+      "Xe tải va chạm với xe máy trên quốc lộ 13 khiến 3 người tử vong tại chỗ.")),
+]
+
+@pytest.mark.parametrize("first, second", TEMPLATE_PAIRS)
+def test_template_stories_from_other_sources_do_not_share_summary(storage, first, second):
+    storage.upsert_articles([article(first[0], "https://vnexpress.net/a.html", first[1])])
+    summarize_pending(storage, "Bản tóm tắt của tin thứ nhất")
+    storage.upsert_articles([article(
+        second[0], "https://tuoitre.vn/b.html", second[1], source="Tuổi Trẻ", timestamp="2026-03-01T09:00:00"
+    )])
+    assert [news["link"] for news in storage.pending_summaries()] == ["https://tuoitre.vn/b.html"]
+    assert summaries(storage)["https://tuoitre.vn/b.html"] is None
+
+def test_rewritten_story_from_another_source_shares_summary(storage):
+    storage.upsert_articles([article(
+        "Tai nạn giao thông nghiêm trọng tại Đồng Nai, 2 người tử vong",
+        "https://vnexpress.net/a.html",
+        "Xe tải va chạm với xe máy trên quốc lộ 1A khiến 2 người tử vong tại chỗ."
+    )])
+    summarize_pending(storage, "Hai người chết khi xe tải tông xe máy ở Đồng Nai")
+    storage.upsert_articles([article(
+        "Đồng Nai: Xe tải va chạm xe máy trên quốc lộ 1A, 2 người tử vong",
+        "https://tuoitre.vn/b.html",
+        "Vụ tai nạn giao thông nghiêm trọng khiến 2 người tử vong tại chỗ.",
+        source="Tuổi Trẻ", timestamp="2026-03-01T09:00:00"
+    )])
+    assert storage.pending_summaries() == []
+
+def test_store_is_reclustered_when_dedup_config_changes(tmp_path):
+    path = str(tmp_path / "news.sqlite")
+    storage = NewsStorage(path)
+    storage.upsert_articles([article("Giá vàng hôm nay 3/3", "https://vnexpress.net/a.html", GOLD.format("tăng 50.000"))])
+    with storage.transaction(bump_version=False) as conn:
+        conn.execute("UPDATE articles SET cluster_id = 'cu'")
+        conn.execute("UPDATE meta SET value = 'cau-hinh-cu' WHERE key = 'dedup'")
+    storage.close()
+
+    storage = NewsStorage(path)
+    with storage.snapshot() as conn:
+        cluster_id, minhash = conn.execute("SELECT cluster_id, minhash FROM articles").fetchone()
+    assert cluster_id not in (None, "cu") and minhash is not None
+    assert storage.get_meta("dedup") != "cau-hinh-cu"
+    storage.close()
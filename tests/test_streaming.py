@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+from data.storage import NewsStorage
+from pipeline.streaming import StreamingPipeline
+
+class FlakySummarizer:
+    """Lỗi ở lần gọi đầu tiên (như dịch vụ tóm tắt vừa khởi động lại), sau đó tóm tắt bình thường"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def process_batch(self, texts, batch_size=8):
+        self.calls += 1
+        if self.calls == 1:
+            raise RuntimeError("database is locked")
+        return [text[:20] for text in texts]
+
+def make_news(i):
+    return {
+        "title": f"Tin số {i} về chủ đề riêng biệt số {i * 7919}",
+        "link": f"https://example.vn/{i}.html",
+        "description": f"Mô tả chi tiết của tin số {i}, mã {i * 104729}.",
+        "category": "Thời sự",
+        "source": "Nguồn",
+    }
+
+def test_consumer_survives_a_failed_batch(tmp_path):
+    storage = NewsStorage(str(tmp_path / "news.sqlite"))
+    pipeline = StreamingPipeline(storage, FlakySummarizer(), batch_size=2, max_wait=0, full_article=False)
+
+    async def run():
+        pipeline.start()
+        await pipeline.sink([make_news(0), make_news(1)])
+        await pipeline.sink([make_news(2), make_news(3)])
+        return await pipeline.finish()
+
+    stats = asyncio.run(run())
+    assert stats["errors"] == 1
+    assert stats["summarized"] == 4
+    assert storage.pending_summaries() == []
+    storage.close()
+
+class SlowStorage(NewsStorage):
+    """Kho mà mỗi lần ghi phải chờ khóa (như khi process khác đang ghi)"""
+
+    def upsert_articles(self, news_list):
+        time.sleep(0.2)
+        return super().upsert_articles(news_list)
+
+    def save_summaries(self, items):
+        time.sleep(0.2)
+        return super().save_summaries(items)
+
+def test_storage_writes_do_not_block_event_loop(tmp_path):
+    storage = SlowStorage(str(tmp_path / "news.sqlite"))
+    pipeline = StreamingPipeline(storage, FlakySummarizer(), batch_size=2, max_wait=0, full_article=False)
+    pipeline.summarizer.calls = 1
+    gaps = []
+
+    async def ticker(stop):
+        last = time.perf_counter()
+        while not stop.is_set():
+            await asyncio.sleep(0.01)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    async def run():
+        stop = asyncio.Event()
+        task = asyncio.create_task(ticker(stop))
+        pipeline.start()
+        for i in range(0, 6, 2):
+            await pipeline.sink([make_news(i), make_news(i + 1)])
+        stats = await pipeline.finish()
+        stop.set()
+        await task
+        return stats
+
+    stats = asyncio.run(run())
+    assert stats["summarized"] == 6
+    assert max(gaps) < 0.15
+    storage.close()
@@ -0,0 +1,38 @@
+from models.summarizer import NewsSummarizer
+from models.summary_cache import SummaryCache
+
+class FakePipeline:
+    """Mô hình giả: lấy 5 từ đầu, lỗi với văn bản có chữ "LỖI" """
+
+    def __call__(self, texts, **kwargs):
+        batch = [texts] if isinstance(texts, str) else texts
+        if any("LỖI" in text for text in batch):
+            raise RuntimeError("mô hình lỗi")
+        return [{"summary_text": " ".join(text.split()[:5])} for text in batch]
+
+def make_summarizer():
+    summarizer = NewsSummarizer(cache=SummaryCache(":memory:"), model_name="/khong-co-mo-hinh", max_input_tokens=20)
+    summarizer.summarizer = FakePipeline()
+    return summarizer
+
+def long_text(marker=""):
+    return " ".join(f"Câu thứ {i} nói về giá vàng tăng mạnh{marker if i == 3 else ''}." for i in range(6))
+
+def test_long_text_cached_under_original_key():
+    summarizer = make_summarizer()
+    text = long_text()
+    summary = summarizer.process_batch([text])[0]
+    assert summarizer.cache.get(summarizer.cache_key(summarizer.preprocess_text(text))) == summary
+
+def test_degraded_long_text_not_cached_under_original_key():
+    summarizer = make_summarizer()
+    text = long_text(" LỖI")
+    summarizer.process_batch([text])
+    assert summarizer.cache.get(summarizer.cache_key(summarizer.preprocess_text(text))) is None
+
+def test_text_still_too_long_after_reduce_is_degraded():
+    summarizer = make_summarizer()
+    summarizer.max_input_tokens = 4
+    texts, degraded = summarizer.reduce_long_texts([long_text(), "Tin ngắn."])
+    assert degraded == [True, False]
+    assert texts[1] == "Tin ngắn."
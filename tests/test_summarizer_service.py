@@ -0,0 +1,39 @@
+import os
+import stat
+import threading
+from multiprocessing.connection import Listener
+
+import pytest
+
+from models.summarizer_service import SummarizerClient, SummarizerService, default_authkey
+
+def test_generated_authkey_is_private_and_stable(tmp_path, monkeypatch):
+    monkeypatch.delenv("SUMMARIZER_AUTHKEY", raising=False)
+    path = str(tmp_path / "authkey")
+    key = default_authkey(path)
+    assert len(key) == 64
+    assert default_authkey(path) == key
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+def test_authkey_from_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv("SUMMARIZER_AUTHKEY", "bí mật")
+    assert default_authkey(str(tmp_path / "authkey")) == "bí mật".encode("utf-8")
+    assert not (tmp_path / "authkey").exists()
+
+def test_refuses_public_address_without_explicit_key(monkeypatch):
+    monkeypatch.delenv("SUMMARIZER_AUTHKEY", raising=False)
+    with pytest.raises(ValueError):
+        SummarizerService(address=("0.0.0.0", 6001))
+
+def test_ping_with_wrong_key_is_false():
+    with Listener(("127.0.0.1", 0), authkey=b"dung") as listener:
+        def accept():
+            try:
+                listener.accept()
+            except Exception:
+                pass
+
+        thread = threading.Thread(target=accept, daemon=True)
+        thread.start()
+        assert not SummarizerClient(listener.address, authkey=b"sai").ping()
+        thread.join(timeout=5)
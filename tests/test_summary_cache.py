@@ -0,0 +1,30 @@
+from models.summary_cache import SummaryCache, summary_key
+
+def test_summary_key_depends_on_text_model_and_params():
+    key = summary_key("Giá vàng tăng.", "vit5@torch", {"max_length": 64, "num_beams": 2})
+    assert key == summary_key("Giá vàng tăng.", "vit5@torch", {"num_beams": 2, "max_length": 64})
+    assert key != summary_key("Giá vàng giảm.", "vit5@torch", {"max_length": 64, "num_beams": 2})
+    assert key != summary_key("Giá vàng tăng.", "vit5@onnx", {"max_length": 64, "num_beams": 2})
+    assert key != summary_key("Giá vàng tăng.", "vit5@torch", {"max_length": 128, "num_beams": 2})
+
+def test_cache_two_tiers(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = SummaryCache(path, memory_size=1)
+    cache.put("a", "tóm tắt a")
+    cache.put("b", "tóm tắt b")
+    # "a" đã bị đẩy khỏi bộ nhớ nhưng vẫn còn trên đĩa
+    assert cache.get("a") == "tóm tắt a"
+    assert cache.get("khong-co") is None
+    assert cache.stats == {"memory_hits": 0, "disk_hits": 1, "misses": 1}
+    cache.close()
+
+    reopened = SummaryCache(path)
+    assert reopened.get("b") == "tóm tắt b"
+    reopened.close()
+
+def test_default_path_is_in_data_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("NEWS_DATA_DIR", str(tmp_path))
+    monkeypatch.chdir("/")
+    cache = SummaryCache()
+    assert cache.path == str(tmp_path / "summary_cache.sqlite")
+    cache.close()
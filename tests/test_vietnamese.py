@@ -0,0 +1,30 @@
+import unicodedata
+
+import pytest
+
+from data.vietnamese import clean_text, clean_texts, fold_diacritics, split_sentences, tokenize
+
+@pytest.mark.parametrize("text, expected", [
+    ("Giá vàng tăng. Chứng khoán giảm!", ["Giá vàng tăng.", "Chứng khoán giảm!"]),
+    ("Ông ở TP. HCM. Bà ở Q. 1 Hà Nội.", ["Ông ở TP. HCM.", "Bà ở Q. 1 Hà Nội."]),
+    ("PGS.TS. Nguyễn Văn A phát biểu.", ["PGS.TS. Nguyễn Văn A phát biểu."]),
+    ("Dân số 1.200 người, tăng 3.5 lần. Xem vnexpress.net nhé.", ["Dân số 1.200 người, tăng 3.5 lần.", "Xem vnexpress.net nhé."]),
+    ("Mưa ở các tỉnh... nhưng Hà Nội nắng.", ["Mưa ở các tỉnh... nhưng Hà Nội nắng."]),
+    ("“Tôi đi. Anh về.” Ông nói vậy.", ["“Tôi đi. Anh về.”", "Ông nói vậy."]),
+    ('Ông nói: "Tôi đi. Anh về." Rồi im lặng.', ['Ông nói: "Tôi đi. Anh về."', "Rồi im lặng."]),
+    ("Thật sao? (Không.) Đúng vậy…  Hết", ["Thật sao?", "(Không.)", "Đúng vậy…", "Hết"]),
+    ("", []),
+])
+def test_split_sentences(text, expected):
+    assert split_sentences(text) == expected
+
+def test_clean_text():
+    assert clean_text("  Giá vàng   tăng★★ mạnh!\n\tHôm nay ") == "Giá vàng tăng mạnh! Hôm nay"
+    # Dạng tổ hợp (NFD) được chuẩn hóa về NFKC
+    assert clean_text("Việt Nam") == "Việt Nam"
+    texts = ["  a  b ", "Việt", "x@y"]
+    assert clean_texts(texts) == [clean_text(text) for text in texts]
+
+def test_fold_and_tokenize():
+    assert fold_diacritics("Đà Nẵng thời sự") == "Da Nang thoi su"
+    assert tokenize("Đà Nẵng, THỜI SỰ!") == ["da", "nang", "thoi", "su"]
@@ -0,0 +1,26 @@
+import web.app as web_app
+from data.storage import open_storage
+from pipeline.scheduler import NEXT_POLL_KEY
+
+def test_status_reads_scheduler_storage(tmp_path, monkeypatch):
+    data_dir = str(tmp_path / "data")
+    (tmp_path / "data").mkdir()
+    monkeypatch.setenv("NEWS_DATA_DIR", data_dir)
+    monkeypatch.setattr(web_app, "_storage", None)
+    # Chạy từ thư mục khác vẫn đọc đúng kho
+    monkeypatch.chdir("/")
+
+    writer = open_storage()
+    writer.set_meta("updated_at", "2026-10-18T08:00:00")
+    writer.set_meta(NEXT_POLL_KEY, "2026-10-18T08:05:00")
+
+    client = web_app.app.test_client()
+    first = client.get("/status").get_json()
+    assert first["last_update"] == "2026-10-18T08:00:00"
+    assert first["next_update"] == "2026-10-18T08:05:00"
+    storage = web_app._storage
+    client.get("/status")
+    assert web_app._storage is storage
+    assert storage.path == writer.path
+    writer.close()
+    storage.close()
@@ -0,0 +1,126 @@
+"""Client API dùng chung cho web app: connection pool, tải song song, cache theo ETag
+
+Mỗi endpoint được giữ trong cache kèm ETag của API. Trong ttl giây đầu dữ
+liệu được dùng thẳng, không gửi request; sau đó request đầu tiên vẫn nhận
+ngay dữ liệu cũ trong khi một thread nền gửi conditional GET
+(If-None-Match) để làm mới (stale-while-revalidate), nên độ trễ của trang
+gần như không phụ thuộc độ trễ của API. Chỉ lần đầu (cache rỗng) hoặc khi
+dữ liệu quá cũ (max_stale giây) mới phải chờ API. Khi API lỗi mà vẫn có dữ
+liệu cũ, dữ liệu cũ được dùng tiếp.
+"""
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from pipeline.metrics import counter, histogram
+
+DEFAULT_API_URL = os.environ.get("NEWS_API_URL", "http://127.0.0.1:8000")
+
+API_REQUEST_SECONDS = histogram("news_api_client_request_seconds", "Thời gian request tới API theo đường dẫn", ("path",))
+# result: fresh, stale (dùng cache), not_modified (304), fetched, errors
+API_CLIENT_RESULTS = counter("news_api_client_results", "Số lần lấy dữ liệu endpoint theo kết quả", ("result",))
+
+@dataclass
+class CachedResponse:
+    data: Any
+    etag: Optional[str]
+    fetched_at: float
+
+class ApiClient:
+    """Client API có connection pool keep-alive và cache theo ETag"""
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_API_URL,
+        ttl: float = 5.0,
+        max_stale: float = 300.0,
+        timeout: float = 10.0,
+        pool_size: int = 16
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="api-client")
+        self._cache: Dict[Tuple, CachedResponse] = {}
+        self._refreshing: Dict[Tuple, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {"fresh": 0, "stale": 0, "not_modified": 0, "fetched": 0, "errors": 0}
+
+    def _count(self, result: str) -> None:
+        self.stats[result] += 1
+        API_CLIENT_RESULTS.inc(result=result)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+    def _fetch(self, key: Tuple, path: str, params: Optional[Dict]) -> CachedResponse:
+        """Gửi (conditional) GET và cập nhật cache"""
+        cached = self._cache.get(key)
+        headers = {"If-None-Match": cached.etag} if cached is not None and cached.etag else {}
+        try:
+            with API_REQUEST_SECONDS.time(path=path):
+                response = self.session.get(
+                    f"{self.base_url}{path}", params=params, headers=headers, timeout=self.timeout
+                )
+            if response.status_code == 304 and cached is not None:
+                entry = CachedResponse(cached.data, cached.etag, time.monotonic())
+                self._count("not_modified")
+            else:
+                response.raise_for_status()
+                entry = CachedResponse(response.json(), response.headers.get("ETag"), time.monotonic())
+                self._count("fetched")
+            self._cache[key] = entry
+            return entry
+        except (requests.RequestException, ValueError):
+            self._count("errors")
+            if cached is None:
+                raise
+            # API lỗi: dùng tiếp dữ liệu cũ, thử lại ở lần sau
+            return cached
+        finally:
+            with self._lock:
+                self._refreshing.pop(key, None)
+
+    def _submit(self, key: Tuple, path: str, params: Optional[Dict]) -> Future:
+        """Một lần tải cho mỗi key tại một thời điểm, dù có nhiều request cùng cần"""
+        with self._lock:
+            future = self._refreshing.get(key)
+            if future is None:
+                future = self._executor.submit(self._fetch, key, path, params)
+                self._refreshing[key] = future
+            return future
+
+    def get_async(self, path: str, params: Optional[Dict] = None) -> "Future[CachedResponse]":
+        """Future của dữ liệu endpoint; hoàn tất ngay nếu dùng được cache"""
+        key = (path, tuple(sorted((params or {}).items())))
+        cached = self._cache.get(key)
+        if cached is not None:
+            age = time.monotonic() - cached.fetched_at
+            if age < self.max_stale:
+                if age < self.ttl:
+                    self._count("fresh")
+                else:
+                    # Trả dữ liệu cũ ngay, làm mới ở nền
+                    self._count("stale")
+                    self._submit(key, path, params)
+                done: Future = Future()
+                done.set_result(cached)
+                return done
+        return self._submit(key, path, params)
+
+    def get_many(self, endpoints: List[Tuple[str, Optional[Dict]]]) -> List[CachedResponse]:
+        """Tải song song nhiều endpoint, giữ nguyên thứ tự"""
+        futures = [self.get_async(path, params) for path, params in endpoints]
+        return [future.result() for future in futures]
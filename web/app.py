@@ -1,66 +1,73 @@
-from flask import Flask, render_template, jsonify
+from flask import Flask, Response, g, render_template, jsonify, request
 import requests
-from datetime import datetime, timedelta
-import threading
 import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
 import sys
 import os
+import threading
 
 # Thêm thư mục gốc vào PYTHONPATH để import các module
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from data.news_crawler import crawl_all_news
-from models.summarizer import summarize_news
+from data.storage import NewsStorage, open_storage
+from pipeline.metrics import CONTENT_TYPE, counter, histogram, render_process
+from web.api_client import ApiClient
 
 app = Flask(__name__)
 
-# Biến global để lưu trữ thời gian cập nhật cuối cùng
-last_update = None
-update_interval = 30 * 60  # 30 phút
-
-def update_news_periodically():
-    """Hàm cập nhật tin tức định kỳ"""
-    global last_update
-    while True:
-        try:
-            print("Bắt đầu cập nhật tin tức...")
-            # Crawl tin tức mới từ các nguồn
-            crawl_all_news()
-            # Tóm tắt tin tức
-            summarize_news()
-            last_update = datetime.now()
-            print(f"Đã cập nhật tin tức lúc: {last_update}")
-        except Exception as e:
-            print(f"Lỗi khi cập nhật tin tức: {str(e)}")
-        
-        # Đợi đến lần cập nhật tiếp theo
-        time.sleep(update_interval)
+# endpoint là mẫu đường dẫn của route (không phải URL thật) để số chuỗi chỉ số không tăng theo truy vấn
+REQUEST_SECONDS = histogram("news_http_request_seconds", "Thời gian xử lý request theo endpoint", ("endpoint",))
+REQUESTS = counter("news_http_requests", "Số request theo endpoint và mã trạng thái", ("endpoint", "status"))
+
+@app.before_request
+def start_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_metrics(response):
+    started = g.get("request_started")
+    if started is not None:
+        endpoint = request.url_rule.rule if request.url_rule is not None else "other"
+        REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=endpoint)
+        REQUESTS.inc(endpoint=endpoint, status=response.status_code)
+    return response
+
+# Tin tức được cập nhật bởi scheduler chạy riêng (pipeline/scheduler.py);
+# web app chỉ đọc tin qua API và trạng thái cập nhật từ kho
+api = ApiClient()
+
+# Trang chủ lọc tin phía trình duyệt nên lấy trang lớn nhất API cho phép
+HOME_ENDPOINTS = [("/categories", None), ("/sources", None), ("/news", {"limit": 1000, "collapse": "true"})]
+
+# Trang chủ đã render, theo ETag của các response API tạo nên nó
+_rendered_home: Dict[Tuple, str] = {}
+
+def render_home() -> str:
+    categories, sources, news = api.get_many(HOME_ENDPOINTS)
+    key = (categories.etag, sources.etag, news.etag)
+    html = _rendered_home.get(key) if all(key) else None
+    if html is None:
+        data = news.data
+        last_update = datetime.fromisoformat(data["last_updated"]) if data.get("last_updated") else None
+        html = render_template(
+            "index.html",
+            news_list=data["news"],
+            categories=categories.data["categories"],
+            sources=sources.data["sources"],
+            last_update=last_update
+        )
+        # Chỉ giữ bản render của dữ liệu mới nhất
+        _rendered_home.clear()
+        _rendered_home[key] = html
+    return html
 
 @app.route("/")
 def home():
     try:
-        # Lấy danh sách categories
-        categories_response = requests.get("http://127.0.0.1:8000/categories")
-        categories = categories_response.json()["categories"]
-        
-        # Lấy danh sách sources
-        sources_response = requests.get("http://127.0.0.1:8000/sources")
-        sources = sources_response.json()["sources"]
-        
-        # Lấy tin tức từ API
-        response = requests.get("http://127.0.0.1:8000/news")
-        if response.status_code == 200:
-            data = response.json()
-            return render_template(
-                "index.html",
-                news_list=data["news"],
-                categories=categories,
-                sources=sources,
-                last_update=last_update
-            )
-        else:
-            error_msg = f"Lỗi khi lấy tin tức: {response.status_code}"
-            return render_template("error.html", error=error_msg)
-            
+        return render_home()
+    except requests.HTTPError as e:
+        error_msg = f"Lỗi khi lấy tin tức: {e.response.status_code}"
+        return render_template("error.html", error=error_msg)
     except requests.RequestException as e:
         error_msg = f"Không thể kết nối đến API: {str(e)}"
         return render_template("error.html", error=error_msg)
@@ -68,19 +75,38 @@ def home():
         error_msg = f"Lỗi không xác định: {str(e)}"
         return render_template("error.html", error=error_msg)
 
+# Kho tin do scheduler ghi (data/ của dự án hoặc NEWS_DATA_DIR), mở một lần
+# và dùng chung cho mọi request; NewsStorage an toàn khi dùng từ nhiều luồng
+_storage: Optional[NewsStorage] = None
+_storage_lock = threading.Lock()
+
+def get_storage() -> NewsStorage:
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            _storage = open_storage()
+        return _storage
+
 @app.route("/status")
 def status():
     """API endpoint để kiểm tra trạng thái cập nhật"""
+    from pipeline.scheduler import NEXT_POLL_KEY
+
+    storage = get_storage()
+    last_update = storage.get_meta("updated_at")
+    next_update = storage.get_meta(NEXT_POLL_KEY)
     return jsonify({
         "status": "running",
-        "last_update": last_update.isoformat() if last_update else None,
-        "next_update": (last_update + timedelta(seconds=update_interval)).isoformat() if last_update else None
+        "last_update": last_update,
+        "next_update": next_update
     })
 
+@app.route("/metrics")
+def metrics():
+    """Chỉ số của web app (độ trễ trang, request tới API, cache của ApiClient)"""
+    return Response(render_process("web"), content_type=CONTENT_TYPE)
+
 if __name__ == "__main__":
-    # Khởi động thread cập nhật tin tức
-    update_thread = threading.Thread(target=update_news_periodically, daemon=True)
-    update_thread.start()
-    
-    # Khởi động web server
+    # Khởi động web server; mở kho ngay để lỗi đường dẫn hiện ra lúc khởi động
+    get_storage()
     app.run(debug=True, use_reloader=False)